@@ -0,0 +1,9 @@
+// Copyright (c) 2025, Daycare Admin and contributors
+// For license information, please see license.txt
+
+frappe.provide("frappe.dashboards.chart_sources");
+
+frappe.dashboards.chart_sources["Compliance Scorecard"] = {
+	method: "daycare.daycare.dashboard_chart_source.compliance_scorecard.compliance_scorecard.get",
+	filters: [],
+};
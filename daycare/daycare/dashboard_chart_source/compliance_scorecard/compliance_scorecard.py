@@ -0,0 +1,36 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+
+from daycare.daycare.doctype.gnb_rule.compliance_scorecard import OPEN_COMPLIANCE_STATUSES, get_scorecard
+
+
+@frappe.whitelist()
+def get(
+	chart_name=None,
+	chart=None,
+	no_cache=None,
+	filters=None,
+	from_date=None,
+	to_date=None,
+	timespan=None,
+	time_interval=None,
+	heatmap_year=None,
+):
+	"""GNB Rules not met per category, from the compliance scorecard snapshot"""
+	frappe.has_permission("GNB Rule", "read", throw=True)
+	rows = [
+		row
+		for row in get_scorecard()["gnb_by_category"]
+		if row["non_compliant"] or row["partially_compliant"]
+	]
+
+	return {
+		"labels": [_(row["category"] or "Other") for row in rows],
+		"datasets": [
+			{"name": _(status), "values": [row[key] for row in rows]}
+			for status, key in OPEN_COMPLIANCE_STATUSES.items()
+		],
+	}
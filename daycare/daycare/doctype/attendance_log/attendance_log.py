@@ -0,0 +1,299 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Append-only attendance log with a Redis-backed check-in/check-out path.
+
+A check-in or check-out is two indexed reads and three Redis round trips (four
+for a late check-out): the child's presence and the room headcount for the day
+are updated atomically in Redis and the log row is queued in a Redis list. The
+queue is written to the database in bulk by flush_attendance_buffer, every minute
+and whenever it grows past FLUSH_SIZE, so no Document is saved on the hot path.
+
+A day whose keys Redis lost is rebuilt from the log before it is updated, and a
+child checked in the day before can still be checked out after midnight.
+"""
+
+import json
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import add_days, getdate, now_datetime
+
+from daycare.daycare.doctype.room.room import OCCUPYING_STATUS
+from daycare.daycare.doctype.room.room_status import publish_room_status
+
+CHECK_IN = "Check In"
+CHECK_OUT = "Check Out"
+
+KEY_PREFIX = "daycare:attendance"
+FLUSH_JOB_ID = "daycare:flush_attendance_buffer"
+# Buffered rows that trigger an immediate flush, and rows written per transaction
+FLUSH_SIZE = 200
+FLUSH_BATCH_SIZE = 2000
+# Presence and headcounts of a day are kept for the day after, for late check-outs
+DAY_TTL = 2 * 24 * 60 * 60
+
+LOG_FIELDS = (
+	"name",
+	"child",
+	"child_name",
+	"log_type",
+	"timestamp",
+	"room",
+	"group",
+	"guardian",
+	"guardian_name",
+	"recorded_by",
+)
+
+
+class AttendanceLog(Document):
+	def validate(self):
+		if not self.is_new():
+			frappe.throw(_("Attendance Log entries cannot be changed"))
+
+	def on_trash(self):
+		frappe.throw(_("Attendance Log entries cannot be deleted"))
+
+
+@frappe.whitelist(methods=["POST"])
+def check_in(child, guardian=None):
+	"""Record a child's arrival; `guardian` is the Child Guardian row dropping off"""
+	return record_attendance(child, CHECK_IN, guardian)
+
+
+@frappe.whitelist(methods=["POST"])
+def check_out(child, guardian):
+	"""Record a child's departure with a guardian allowed to pick up"""
+	return record_attendance(child, CHECK_OUT, guardian)
+
+
+def record_attendance(child, log_type, guardian=None):
+	frappe.has_permission("Attendance Log", "create", throw=True)
+
+	info = frappe.db.get_value(
+		"Child", child, ["full_name", "room", "group", "enrollment_status"], as_dict=True
+	)
+	if not info:
+		frappe.throw(_("Child {0} not found").format(child), frappe.DoesNotExistError)
+	if info.enrollment_status != OCCUPYING_STATUS:
+		frappe.throw(_("{0} is not actively enrolled").format(info.full_name))
+
+	guardian_name = get_guardian_name(child, guardian, log_type) if guardian else None
+	timestamp = now_datetime()
+	today = timestamp.date()
+
+	if log_type == CHECK_IN:
+		ensure_days_cached([today])
+		# HSETNX makes a concurrent second check-in of the same child lose
+		if not frappe.cache.hsetnx(get_present_key(today), child, info.room or ""):
+			frappe.throw(_("{0} is already checked in").format(info.full_name))
+		room, date = info.room, today
+	else:
+		ensure_days_cached([today, add_days(today, -1)])
+		room, date = pop_presence(child, today)
+		if not date:
+			frappe.throw(_("{0} is not checked in").format(info.full_name))
+
+	present_key, headcount_key = get_present_key(date), get_headcount_key(date)
+
+	row = {
+		"name": frappe.generate_hash(length=10),
+		"child": child,
+		"child_name": info.full_name,
+		"log_type": log_type,
+		"timestamp": str(timestamp),
+		"room": room,
+		"group": info.group,
+		"guardian": guardian,
+		"guardian_name": guardian_name,
+		"recorded_by": frappe.session.user,
+	}
+
+	pipeline = frappe.cache.pipeline()
+	pipeline.rpush(get_buffer_key(), json.dumps(row))
+	pipeline.expire(present_key, DAY_TTL)
+	pipeline.expire(headcount_key, DAY_TTL)
+	if room:
+		pipeline.hincrby(headcount_key, room, 1 if log_type == CHECK_IN else -1)
+	results = pipeline.execute()
+	if date == today:
+		# Redis already holds the new count, whatever happens to this transaction
+		publish_room_status(room, after_commit=False, headcount=results[-1])
+
+	if results[0] >= FLUSH_SIZE:
+		frappe.enqueue(flush_attendance_buffer, queue="short", job_id=FLUSH_JOB_ID, deduplicate=True)
+
+	return {**row, "headcount": results[-1] if room else None}
+
+
+def ensure_days_cached(dates):
+	"""Rebuild the presence and headcounts of the days whose keys Redis lost"""
+	pipeline = frappe.cache.pipeline()
+	for date in dates:
+		pipeline.exists(get_headcount_key(date))
+
+	for date, exists in zip(dates, pipeline.execute(), strict=True):
+		if not exists:
+			rebuild_headcount(date)
+
+
+def pop_presence(child, today):
+	"""(room, date) of the child's check-in today or, for a late check-out, the day before"""
+	for date in (today, getdate(add_days(today, -1))):
+		pipeline = frappe.cache.pipeline()
+		pipeline.hget(get_present_key(date), child)
+		pipeline.hdel(get_present_key(date), child)
+		room, removed = pipeline.execute()
+		if removed:
+			return room.decode() or None, date
+
+	return None, None
+
+
+def get_guardian_name(child, guardian, log_type):
+	"""Name of the child's guardian row `guardian`, which must be allowed to pick up for a check-out"""
+	row = frappe.db.get_value(
+		"Child Guardian",
+		{"name": guardian, "parent": child, "parenttype": "Child"},
+		["guardian_name", "can_pickup"],
+		as_dict=True,
+	)
+	if not row:
+		frappe.throw(_("{0} is not a guardian of this child").format(guardian))
+	if log_type == CHECK_OUT and not row.can_pickup:
+		frappe.throw(
+			_("{0} is not authorized to pick up this child").format(row.guardian_name),
+			frappe.PermissionError,
+		)
+
+	return row.guardian_name
+
+
+@frappe.whitelist()
+def get_headcount(room=None, date=None):
+	"""Children checked in per room on `date` (default: today), or in one `room`"""
+	frappe.has_permission("Attendance Log", "read", throw=True)
+	date = getdate(date)
+	headcount = get_cached_headcount(date)
+	if headcount is None:
+		rebuild_headcount(date)
+		headcount = get_cached_headcount(date) or {}
+
+	return headcount.get(room, 0) if room else headcount
+
+
+def get_cached_headcount(date):
+	"""{room: children checked in} from Redis, or None when the day is not cached"""
+	pipeline = frappe.cache.pipeline()
+	pipeline.exists(get_headcount_key(date))
+	pipeline.hgetall(get_headcount_key(date))
+	exists, counts = pipeline.execute()
+	if not exists:
+		return
+
+	return {room.decode(): int(count) for room, count in counts.items() if room and int(count)}
+
+
+def rebuild_headcount(date):
+	"""Recompute a day's presence and headcounts from the log, after a Redis restart"""
+	flush_attendance_buffer()
+	date = getdate(date)
+	present = frappe.db.sql(*get_presence_query(date))
+
+	headcount = {}
+	for _child, room in present:
+		if room:
+			headcount[room] = headcount.get(room, 0) + 1
+
+	present_key, headcount_key = get_present_key(date), get_headcount_key(date)
+	pipeline = frappe.cache.pipeline()
+	pipeline.delete(present_key, headcount_key)
+	if present:
+		pipeline.hset(present_key, mapping=dict(present))
+	# An empty day still gets a key, so it is not rebuilt on every read
+	pipeline.hset(headcount_key, mapping=headcount or {"": 0})
+	pipeline.expire(present_key, DAY_TTL)
+	pipeline.expire(headcount_key, DAY_TTL)
+	pipeline.execute()
+
+
+def get_presence_query(date):
+	"""(query, values) of the (child, room) pairs checked in at the end of `date`"""
+	return (
+		"""
+		SELECT a.child, IFNULL(a.room, '')
+		FROM `tabAttendance Log` a
+		INNER JOIN (
+			SELECT child, MAX(timestamp) as timestamp
+			FROM `tabAttendance Log`
+			WHERE timestamp >= %(start)s AND timestamp < %(end)s
+			GROUP BY child
+		) latest ON latest.child = a.child AND latest.timestamp = a.timestamp
+		WHERE a.log_type = %(check_in)s
+		""",
+		{"start": date, "end": add_days(date, 1), "check_in": CHECK_IN},
+	)
+
+
+def flush_attendance_buffer():
+	"""Write the buffered log rows with one bulk insert per batch (scheduled every minute)"""
+	key = get_buffer_key()
+	while True:
+		# Take a batch atomically, so concurrent flushes never write a row twice
+		pipeline = frappe.cache.pipeline()
+		pipeline.lrange(key, 0, FLUSH_BATCH_SIZE - 1)
+		pipeline.ltrim(key, FLUSH_BATCH_SIZE, -1)
+		batch = pipeline.execute()[0]
+		if not batch:
+			break
+
+		rows = [json.loads(row) for row in batch]
+		try:
+			write_rows(rows)
+			frappe.db.commit()
+		except Exception:
+			frappe.db.rollback()
+			# Put the batch back in front of anything buffered since
+			pipeline = frappe.cache.pipeline()
+			pipeline.lpush(key, *reversed(batch))
+			pipeline.execute()
+			raise
+
+		if len(batch) < FLUSH_BATCH_SIZE:
+			break
+
+
+def write_rows(rows):
+	timestamp = now_datetime()
+	fields = [*LOG_FIELDS, "owner", "modified_by", "creation", "modified", "docstatus"]
+	frappe.db.bulk_insert(
+		"Attendance Log",
+		fields,
+		[
+			(
+				*(row.get(field) for field in LOG_FIELDS),
+				row["recorded_by"],
+				row["recorded_by"],
+				row["timestamp"],
+				timestamp,
+				0,
+			)
+			for row in rows
+		],
+		ignore_duplicates=True,
+	)
+
+
+def get_buffer_key():
+	return frappe.cache.make_key(f"{KEY_PREFIX}:buffer")
+
+
+def get_present_key(date):
+	return frappe.cache.make_key(f"{KEY_PREFIX}:present:{date}")
+
+
+def get_headcount_key(date):
+	return frappe.cache.make_key(f"{KEY_PREFIX}:headcount:{date}")
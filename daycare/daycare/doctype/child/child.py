@@ -6,15 +6,30 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import getdate, nowdate
 
+from daycare.daycare.doctype.guardian.guardian import match_guardians
+from daycare.daycare.doctype.room.room import OCCUPYING_STATUS, adjust_occupancy
+from daycare.daycare.report.report_cache import bump_versions, get_dependent_reports
+
+# Children whose age is kept current by the nightly recomputation
+AGE_TRACKED_STATUSES = ("Active", "Waitlisted")
+AGE_UPDATE_BATCH_SIZE = 5000
+
 
 class Child(Document):
 	def before_save(self):
 		self.compute_full_name()
 		self.compute_age_months()
+		self.link_guardians()
 
 	def validate(self):
 		self.validate_guardians()
 
+	def on_update(self):
+		self.update_room_occupancy()
+
+	def on_trash(self):
+		adjust_occupancy(self.get_occupied_room(), -1)
+
 	def compute_full_name(self):
 		"""Compute full name from first and last name"""
 		self.full_name = f"{self.first_name} {self.last_name}".strip()
@@ -37,6 +52,25 @@ class Child(Document):
 
 		self.age_months = max(0, months)
 
+	def link_guardians(self):
+		"""Link each guardian row to its shared Guardian, matched or created from its contact details"""
+		match_guardians(self.child_guardians)
+
+	def get_occupied_room(self):
+		"""Room this child counts towards, if any"""
+		if self.enrollment_status == OCCUPYING_STATUS:
+			return self.room
+
+	def update_room_occupancy(self):
+		"""Move this child's occupancy count when its room or enrollment status changes"""
+		doc_before_save = self.get_doc_before_save()
+		old_room = doc_before_save.get_occupied_room() if doc_before_save else None
+		new_room = self.get_occupied_room()
+
+		if old_room != new_room:
+			adjust_occupancy(old_room, -1)
+			adjust_occupancy(new_room, 1)
+
 	def validate_guardians(self):
 		"""Validate that at least one guardian exists and one is primary"""
 		if not self.child_guardians:
@@ -49,3 +83,40 @@ class Child(Document):
 
 		if primary_count > 1:
 			frappe.throw(_("Only one guardian can be marked as primary contact"))
+
+
+def update_age_months():
+	"""Recompute age_months for every active child (scheduled daily).
+
+	Works in keyset-ordered chunks with a set-based UPDATE, so no Child is loaded
+	or saved and no Version rows are written. The SQL expression matches
+	Child.compute_age_months: whole months elapsed since date of birth.
+	"""
+	after = ""
+	while True:
+		names = frappe.db.sql_list(
+			"""
+			SELECT name FROM `tabChild`
+			WHERE enrollment_status IN %(statuses)s AND name > %(after)s
+			ORDER BY name
+			LIMIT %(limit)s
+			""",
+			{"statuses": AGE_TRACKED_STATUSES, "after": after, "limit": AGE_UPDATE_BATCH_SIZE},
+		)
+		if not names:
+			break
+
+		frappe.db.sql(
+			"""
+			UPDATE `tabChild`
+			SET age_months = GREATEST(0, TIMESTAMPDIFF(MONTH, date_of_birth, CURDATE()))
+			WHERE name IN %(names)s
+				AND date_of_birth IS NOT NULL
+				AND age_months != GREATEST(0, TIMESTAMPDIFF(MONTH, date_of_birth, CURDATE()))
+			""",
+			{"names": names},
+		)
+		frappe.db.commit()
+		after = names[-1]
+
+	bump_versions(get_dependent_reports(["Child"]))
@@ -4,7 +4,16 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import getdate, today
+from frappe.rate_limiter import rate_limit
+from frappe.utils import getdate, now_datetime, today
+from frappe.website.doctype.web_form.web_form import accept
+
+# Public web form whose submissions are checked in the background
+INTAKE_WEB_FORM = "child-intake-form"
+
+# Submissions accepted per client IP within the window
+INTAKE_RATE_LIMIT = 5
+INTAKE_RATE_LIMIT_SECONDS = 10 * 60
 
 
 class ChildIntakeRequest(Document):
@@ -13,25 +22,97 @@ class ChildIntakeRequest(Document):
 			self.submitted_on = today()
 
 	def validate(self):
-		self.validate_child_age()
+		if self.guardian_email:
+			self.guardian_email = self.guardian_email.strip().lower()
+
+		# Web form submissions get these checks from process_intake_request
+		if not frappe.flags.in_web_form:
+			self.validate_child_age()
+
+	def after_insert(self):
+		if frappe.flags.in_web_form:
+			frappe.enqueue(
+				process_intake_request,
+				queue="short",
+				name=self.name,
+				enqueue_after_commit=True,
+			)
 
 	def validate_child_age(self):
 		"""Validate that child's date of birth is reasonable"""
-		if self.child_date_of_birth:
-			dob = getdate(self.child_date_of_birth)
-			today_date = getdate(today())
-
-			# Child should not be born in the future
-			if dob > today_date:
-				frappe.throw(_("Child's date of birth cannot be in the future"))
-
-			# Child should be under 6 years old (typical daycare age limit)
-			age_months = (today_date.year - dob.year) * 12 + (today_date.month - dob.month)
-			if age_months > 72:  # 6 years
-				frappe.msgprint(
-					_("Note: Child appears to be over 6 years old. Please verify the date of birth."),
-					indicator="orange"
-				)
+		for message, is_error in self.get_child_age_issues():
+			if is_error:
+				frappe.throw(message)
+			frappe.msgprint(message, indicator="orange")
+
+	def get_child_age_issues(self):
+		"""(message, is_error) for each problem with the child's date of birth"""
+		if not self.child_date_of_birth:
+			return []
+
+		dob = getdate(self.child_date_of_birth)
+		today_date = getdate(today())
+
+		# Child should not be born in the future
+		if dob > today_date:
+			return [(_("Child's date of birth cannot be in the future"), True)]
+
+		# Child should be under 6 years old (typical daycare age limit)
+		age_months = (today_date.year - dob.year) * 12 + (today_date.month - dob.month)
+		if age_months > 72:  # 6 years
+			return [(_("Note: Child appears to be over 6 years old. Please verify the date of birth."), False)]
+
+		return []
+
+	def find_duplicate(self):
+		"""Earliest earlier request for the same child from the same guardian email"""
+		if not (self.guardian_email and self.child_date_of_birth):
+			return
+
+		names = frappe.db.sql_list(*self.get_duplicate_query())
+		return names[0] if names else None
+
+	def get_duplicate_query(self):
+		"""(query, values) of the originals this request may duplicate, earliest first.
+
+		Only requests created before this one count (the name breaks ties), so an
+		original is never marked a duplicate of its resubmission, and two requests
+		checked at the same time cannot point at each other.
+		"""
+		return (
+			"""
+			SELECT name FROM `tabChild Intake Request`
+			WHERE guardian_email = %(guardian_email)s
+				AND child_date_of_birth = %(child_date_of_birth)s
+				AND child_first_name = %(child_first_name)s
+				AND child_last_name = %(child_last_name)s
+				AND IFNULL(duplicate_of, '') = ''
+				AND (creation < %(creation)s OR (creation = %(creation)s AND name < %(name)s))
+			ORDER BY creation, name
+			LIMIT 1
+			""",
+			{
+				"guardian_email": self.guardian_email,
+				"child_date_of_birth": self.child_date_of_birth,
+				"child_first_name": self.child_first_name,
+				"child_last_name": self.child_last_name,
+				"creation": self.creation,
+				"name": self.name,
+			},
+		)
+
+	def send_acknowledgement(self):
+		"""Queue the "we received your inquiry" email to the guardian"""
+		frappe.sendmail(
+			recipients=[self.guardian_email],
+			subject=_("We received your enrollment inquiry for {0}").format(self.child_first_name),
+			message=_(
+				"Thank you for your interest in our daycare. We have received your enrollment inquiry "
+				"for {0} {1} (reference {2}) and will contact you within 2-3 business days."
+			).format(self.child_first_name, self.child_last_name, self.name),
+			reference_doctype=self.doctype,
+			reference_name=self.name,
+		)
 
 	def on_update(self):
 		"""Track who reviewed the intake request"""
@@ -40,3 +121,42 @@ class ChildIntakeRequest(Document):
 				self.db_set("reviewed_by", frappe.session.user, update_modified=False)
 			if not self.reviewed_on:
 				self.db_set("reviewed_on", today(), update_modified=False)
+
+
+@frappe.whitelist(allow_guest=True)
+def accept_web_form(web_form, data):
+	"""Web form submissions; the intake form is rate limited per client as well.
+
+	Frappe's accept saves the request (login, allow_multiple and attachment
+	handling included); its after_insert queues process_intake_request.
+	"""
+	if web_form != INTAKE_WEB_FORM:
+		return accept(web_form, data)
+
+	return submit_intake_request(web_form, data)
+
+
+@rate_limit(limit=INTAKE_RATE_LIMIT, seconds=INTAKE_RATE_LIMIT_SECONDS)
+def submit_intake_request(web_form, data):
+	if not frappe.db.get_value("Web Form", web_form, "published"):
+		frappe.throw(_("This form is not accepting submissions"), frappe.PermissionError)
+
+	return accept(web_form, data)
+
+
+def process_intake_request(name):
+	"""Background checks of a web form submission: date of birth, duplicates, acknowledgement"""
+	doc = frappe.get_doc("Child Intake Request", name)
+	notes = [message for message, _is_error in doc.get_child_age_issues()]
+
+	duplicate_of = doc.find_duplicate()
+	if duplicate_of:
+		notes.append(_("Possible duplicate of {0}").format(duplicate_of))
+
+	values = {"checked_on": now_datetime(), "duplicate_of": duplicate_of}
+	if notes:
+		values["admin_notes"] = "\n".join(filter(None, [doc.admin_notes, *notes]))
+	doc.db_set(values, update_modified=False)
+
+	if not duplicate_of:
+		doc.send_acknowledgement()
@@ -0,0 +1,39 @@
+// Copyright (c) 2025, Daycare and contributors
+// For license information, please see license.txt
+
+frappe.listview_settings["Child Intake Request"] = {
+    onload: function(listview) {
+        listview.page.add_inner_button(__("Enrol Approved Requests"), function() {
+            const selected = listview.get_checked_items(true);
+            const message = selected.length
+                ? __("Enrol the {0} selected requests that are approved?", [selected.length])
+                : __("Enrol every approved request?");
+
+            frappe.confirm(message, function() {
+                frappe.call({
+                    method: "daycare.daycare.doctype.child_intake_request.enrolment.enrol_approved_requests",
+                    args: { names: selected.length ? selected : null },
+                }).then(() => {
+                    frappe.show_alert({ message: __("Enrolment queued"), indicator: "blue" });
+                });
+            });
+        });
+
+        frappe.realtime.off("intake_enrolment_progress");
+        frappe.realtime.on("intake_enrolment_progress", function(data) {
+            frappe.show_progress(__("Enrolling Requests"), data.done, data.total,
+                __("{0} enrolled, {1} placed in a group", [data.enrolled, data.placed]), true);
+
+            if (data.done >= data.total) {
+                const failed = Object.keys(data.failed || {}).length;
+                frappe.show_alert({
+                    message: failed
+                        ? __("{0} requests enrolled, {1} failed", [data.enrolled, failed])
+                        : __("{0} requests enrolled", [data.enrolled]),
+                    indicator: failed ? "orange" : "green",
+                });
+                listview.refresh();
+            }
+        });
+    },
+};
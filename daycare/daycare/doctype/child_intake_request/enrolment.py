@@ -0,0 +1,177 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Bulk enrolment of approved Child Intake Requests.
+
+Requests are converted in chunks by a background job: the Child documents and
+their guardian rows of a chunk are written with the bulk loader, the new children
+are placed into groups by age at their start date, and the requests are linked to
+their child and marked Enrolled. Each chunk is one transaction, and progress is
+published to the user who started the job.
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import create_batch, getdate
+
+from daycare.daycare.doctype.guardian.guardian import match_guardians
+from daycare.daycare.doctype.guardian.pickup import invalidate_pickup_map
+from daycare.daycare.doctype.search_entry.search_entry import index_documents
+from daycare.daycare.planning.placement import place_children
+from daycare.daycare.report.report_cache import invalidate_report_cache
+from daycare.daycare.setup.bulk_import import make_doc, set_names, write_docs
+
+ENROLMENT_CHUNK_SIZE = 200
+ENROLMENT_JOB_ID = "daycare:enrol_intake_requests"
+ENROLMENT_PROGRESS_EVENT = "intake_enrolment_progress"
+
+APPROVED_STATUS = "Approved"
+ENROLLED_STATUS = "Enrolled"
+
+# Enrollment status of new children with and without a place in a group
+PLACED_STATUS = "Active"
+UNPLACED_STATUS = "Waitlisted"
+
+INTAKE_FIELDS = (
+	"name",
+	"child_first_name",
+	"child_last_name",
+	"child_date_of_birth",
+	"child_gender",
+	"guardian_name",
+	"guardian_relationship",
+	"guardian_email",
+	"guardian_phone",
+	"guardian_address",
+	"preferred_start_date",
+	"medical_notes",
+	"allergies",
+)
+
+
+@frappe.whitelist()
+def enrol_approved_requests(names=None):
+	"""Queue the enrolment of the given approved requests, or of every approved request"""
+	frappe.has_permission("Child Intake Request", "write", throw=True)
+	frappe.has_permission("Child", "create", throw=True)
+
+	frappe.enqueue(
+		enrol_intake_requests,
+		queue="long",
+		job_id=ENROLMENT_JOB_ID,
+		deduplicate=True,
+		names=frappe.parse_json(names) if isinstance(names, str) else names,
+	)
+
+
+def enrol_intake_requests(names=None, chunk_size=ENROLMENT_CHUNK_SIZE, commit=True):
+	"""Turn approved requests not enrolled yet into children, one chunk per transaction.
+
+	Returns {"enrolled": count, "placed": count, "failed": {request: error}}.
+	"""
+	filters = {"status": APPROVED_STATUS, "child": ("is", "not set")}
+	if names:
+		filters["name"] = ("in", names)
+
+	intakes = frappe.get_all(
+		"Child Intake Request",
+		filters=filters,
+		fields=list(INTAKE_FIELDS),
+		order_by="creation asc",
+	)
+
+	result = {"enrolled": 0, "placed": 0, "failed": {}}
+	publish_progress(result, len(intakes))
+
+	for batch in create_batch(intakes, chunk_size):
+		try:
+			enrol_batch(batch, result)
+		except Exception:
+			if not commit:
+				raise
+			frappe.db.rollback()
+			frappe.log_error(_("Intake enrolment failed"), reference_doctype="Child Intake Request")
+			result["failed"].update({intake.name: _("Enrolment of this chunk failed") for intake in batch})
+		else:
+			if commit:
+				frappe.db.commit()
+
+		publish_progress(result, len(intakes))
+
+	return result
+
+
+def enrol_batch(intakes, result):
+	docs = {}
+	for intake in intakes:
+		try:
+			docs[intake.name] = make_doc("Child", get_child_record(intake))
+		except frappe.ValidationError as e:
+			result["failed"][intake.name] = str(e)
+
+	if not docs:
+		return
+
+	match_guardians([row for doc in docs.values() for row in doc.child_guardians])
+	set_names(list(docs.values()))
+	write_docs(list(docs.values()))
+
+	by_start_date = {}
+	for intake in intakes:
+		if intake.name in docs:
+			by_start_date.setdefault(getdate(intake.preferred_start_date), []).append(docs[intake.name].name)
+
+	unplaced = []
+	for on_date, children in by_start_date.items():
+		placements = place_children(children, on_date=on_date)
+		unplaced += [child for child, group in placements.items() if not group]
+
+	if unplaced:
+		frappe.db.sql(
+			"UPDATE `tabChild` SET enrollment_status = %(status)s WHERE name IN %(names)s",
+			{"status": UNPLACED_STATUS, "names": unplaced},
+		)
+
+	for intake, doc in docs.items():
+		frappe.db.set_value("Child Intake Request", intake, {"child": doc.name, "status": ENROLLED_STATUS})
+
+	index_documents("Child", [doc.name for doc in docs.values()])
+	invalidate_report_cache(["Child"])
+	# Siblings' guardians may now collect one more child
+	invalidate_pickup_map({row.guardian for doc in docs.values() for row in doc.child_guardians})
+	result["enrolled"] += len(docs)
+	result["placed"] += len(docs) - len(unplaced)
+
+
+def get_child_record(intake):
+	"""Child, with the requesting guardian as primary contact, for an intake request"""
+	return {
+		"first_name": intake.child_first_name,
+		"last_name": intake.child_last_name,
+		"date_of_birth": intake.child_date_of_birth,
+		"gender": intake.child_gender,
+		"enrollment_date": intake.preferred_start_date,
+		"enrollment_status": PLACED_STATUS,
+		"medical_notes": intake.medical_notes,
+		"allergies": intake.allergies,
+		"child_guardians": [
+			{
+				"guardian_name": intake.guardian_name,
+				"relationship": intake.guardian_relationship,
+				"email": intake.guardian_email,
+				"phone": intake.guardian_phone,
+				"address": intake.guardian_address,
+				"is_primary": 1,
+				"can_pickup": 1,
+			}
+		],
+	}
+
+
+def publish_progress(result, total):
+	frappe.publish_realtime(
+		ENROLMENT_PROGRESS_EVENT,
+		{**result, "total": total, "done": result["enrolled"] + len(result["failed"])},
+		user=frappe.session.user,
+	)
@@ -0,0 +1,110 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# See license.txt
+
+import json
+from unittest.mock import patch
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_to_date, now_datetime
+
+from daycare.daycare.doctype.child_intake_request.child_intake_request import (
+	INTAKE_WEB_FORM,
+	ChildIntakeRequest,
+	accept_web_form,
+	process_intake_request,
+)
+
+
+class IntegrationTestChildIntakeRequest(IntegrationTestCase):
+	def setUp(self):
+		# Requests of other tests must not count as originals
+		self.child_last_name = f"Intake Test {frappe.generate_hash(length=8)}"
+
+	def make_request(self, minutes_ago=0, **values):
+		doc = frappe.get_doc(
+			{
+				"doctype": "Child Intake Request",
+				"child_first_name": "Ada",
+				"child_last_name": self.child_last_name,
+				"child_date_of_birth": "2024-03-01",
+				"guardian_name": "Grace Intake Test",
+				"guardian_relationship": "Mother",
+				"guardian_email": "intake.test@daycare.localhost",
+				"guardian_phone": "506-555-0100",
+				**values,
+			}
+		).insert()
+		if minutes_ago:
+			doc.db_set("creation", add_to_date(now_datetime(), minutes=-minutes_ago), update_modified=False)
+		return doc
+
+	def process(self, doc):
+		with patch.object(ChildIntakeRequest, "send_acknowledgement", autospec=True) as send_acknowledgement:
+			process_intake_request(doc.name)
+
+		doc.reload()
+		return [call.args[0].name for call in send_acknowledgement.call_args_list]
+
+	def test_resubmission_is_linked_to_original(self):
+		original = self.make_request(minutes_ago=10)
+		resubmission = self.make_request(guardian_email=" Intake.Test@daycare.localhost ")
+
+		self.assertEqual(self.process(original), [original.name])
+		self.assertEqual(self.process(resubmission), [])
+		self.assertEqual(resubmission.duplicate_of, original.name)
+		self.assertIn(original.name, resubmission.admin_notes)
+		self.assertTrue(resubmission.checked_on)
+
+	def test_original_is_never_a_duplicate_of_a_later_request(self):
+		original = self.make_request(minutes_ago=10)
+		resubmission = self.make_request()
+
+		# The resubmission's job may run first, or both at once
+		self.assertEqual(self.process(resubmission), [])
+		self.assertEqual(self.process(original), [original.name])
+		self.assertFalse(original.duplicate_of)
+		self.assertEqual(resubmission.duplicate_of, original.name)
+
+	def test_same_creation_is_broken_by_name(self):
+		first = self.make_request()
+		second = self.make_request()
+		frappe.db.set_value(
+			"Child Intake Request", second.name, "creation", first.creation, update_modified=False
+		)
+		first.reload()
+		second.reload()
+		earlier, later = sorted([first, second], key=lambda doc: doc.name)
+
+		self.assertIsNone(earlier.find_duplicate())
+		self.assertEqual(later.find_duplicate(), earlier.name)
+
+	def test_acknowledgement_for_different_children(self):
+		first = self.make_request(minutes_ago=10)
+		sibling = self.make_request(child_first_name="Alan")
+
+		self.assertEqual(self.process(first), [first.name])
+		self.assertEqual(self.process(sibling), [sibling.name])
+		self.assertFalse(sibling.duplicate_of)
+
+	def test_web_form_submission_queues_checks(self):
+		data = {
+			"doctype": "Child Intake Request",
+			"child_first_name": "Ada",
+			"child_last_name": self.child_last_name,
+			"child_date_of_birth": "2024-03-01",
+			"guardian_name": "Grace Web Form Test",
+			"guardian_relationship": "Mother",
+			"guardian_email": "web.form.test@daycare.localhost",
+			"guardian_phone": "506-555-0101",
+		}
+		self.addCleanup(setattr, frappe.flags, "in_web_form", False)
+		with patch.object(frappe, "enqueue") as enqueue:
+			doc = accept_web_form(INTAKE_WEB_FORM, json.dumps(data))
+
+		self.assertEqual(doc.guardian_email, "web.form.test@daycare.localhost")
+		self.assertFalse(doc.checked_on)
+		calls = [call for call in enqueue.call_args_list if call.args[:1] == (process_intake_request,)]
+		self.assertEqual(len(calls), 1)
+		self.assertEqual(calls[0].kwargs["name"], doc.name)
+		self.assertTrue(calls[0].kwargs["enqueue_after_commit"])
@@ -1,9 +1,16 @@
 # Copyright (c) 2025, Daycare Admin and contributors
 # For license information, please see license.txt
 
+from bisect import bisect_right
+from datetime import date
+
 import frappe
 from frappe import _
 from frappe.model.document import Document
+from frappe.utils import getdate, to_timedelta
+
+# Availability weekday options, indexed like date.weekday()
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
 
 
 class Employee(Document):
@@ -13,64 +20,146 @@ class Employee(Document):
 	def validate(self):
 		self.validate_availability()
 		self.validate_termination_date()
+		self.validate_reports_to()
+
+	def on_trash(self):
+		frappe.db.delete("Employee Qualification Summary", {"employee": self.name})
 
 	def compute_full_name(self):
 		"""Compute full name from first and last name"""
 		self.full_name = f"{self.first_name} {self.last_name}".strip()
 
 	def validate_availability(self):
-		"""Check for overlapping availability entries"""
-		if not self.employee_availability:
-			return
-
-		for i, row1 in enumerate(self.employee_availability):
-			for j, row2 in enumerate(self.employee_availability):
-				if i >= j:
-					continue
-
-				if row1.weekday != row2.weekday:
-					continue
-
-				# Check if time ranges overlap
-				if self._times_overlap(row1, row2):
-					# Check if date ranges overlap (if specified)
-					if self._dates_overlap(row1, row2):
+		"""Check for overlapping availability entries.
+
+		Rows are grouped by weekday and swept in order of their date range, so each
+		row is only compared with the rows whose dates are still open.
+		"""
+		rows_by_weekday = {}
+		for idx, row in enumerate(self.employee_availability or [], 1):
+			rows_by_weekday.setdefault(row.weekday, []).append((*get_date_range(row), idx, row))
+
+		for weekday, rows in rows_by_weekday.items():
+			rows.sort(key=lambda r: (r[0], r[2]))
+			open_rows = []
+			for date_from, date_to, idx, row in rows:
+				open_rows = [r for r in open_rows if r[1] >= date_from]
+				for _from, _to, other_idx, other in open_rows:
+					if times_overlap(row, other):
 						frappe.throw(
 							_("Row {0} and Row {1}: Overlapping availability for {2}").format(
-								i + 1, j + 1, row1.weekday
+								min(idx, other_idx), max(idx, other_idx), weekday
 							)
 						)
-
-	def _times_overlap(self, row1, row2):
-		"""Check if two time ranges overlap"""
-		# Convert times to comparable format
-		start1 = row1.start_time
-		end1 = row1.end_time
-		start2 = row2.start_time
-		end2 = row2.end_time
-
-		# Check for overlap: ranges overlap if one starts before the other ends
-		return start1 < end2 and start2 < end1
-
-	def _dates_overlap(self, row1, row2):
-		"""Check if two date ranges overlap (if dates are specified)"""
-		# If no dates specified, assume always applicable (overlap)
-		if not row1.effective_from and not row2.effective_from:
-			return True
-
-		# If one has dates and other doesn't, they could overlap
-		if not row1.effective_from or not row2.effective_from:
-			return True
-
-		# Both have start dates - check for overlap
-		start1 = row1.effective_from
-		end1 = row1.effective_to or frappe.utils.getdate("2099-12-31")
-		start2 = row2.effective_from
-		end2 = row2.effective_to or frappe.utils.getdate("2099-12-31")
-
-		return start1 <= end2 and start2 <= end1
+				open_rows.append((date_from, date_to, idx, row))
 
 	def validate_termination_date(self):
 		"""Validate termination date if status is Terminated"""
 		if self.status == "Terminated" and not self.termination_date:
 			frappe.throw(_("Termination Date is required when status is Terminated"))
+
+	def validate_reports_to(self):
+		if self.reports_to and self.reports_to == self.name:
+			frappe.throw(_("An employee cannot report to themselves"))
+
+
+def get_date_range(row):
+	"""(from, to) dates an availability row applies to; a row without a start applies always"""
+	if not row.effective_from:
+		return date.min, date.max
+
+	return getdate(row.effective_from), getdate(row.effective_to) if row.effective_to else date.max
+
+
+def times_overlap(row1, row2):
+	"""Check if the time ranges of two availability rows overlap"""
+	return to_timedelta(row1.start_time) < to_timedelta(row2.end_time) and to_timedelta(
+		row2.start_time
+	) < to_timedelta(row1.end_time)
+
+
+def get_available_employees(for_date, start_time, end_time):
+	"""Active employees whose availability covers [start_time, end_time] on for_date, in one query"""
+	return frappe.db.sql(*get_available_employees_query(for_date, start_time, end_time), as_dict=True)
+
+
+def get_available_employees_query(for_date, start_time, end_time):
+	"""(query, values) of get_available_employees"""
+	for_date = getdate(for_date)
+	return (
+		"""
+		SELECT DISTINCT e.name, e.full_name, e.role
+		FROM `tabEmployee Availability` ea
+		INNER JOIN `tabEmployee` e ON e.name = ea.parent
+		WHERE ea.parenttype = 'Employee'
+			AND ea.weekday = %(weekday)s
+			AND ea.start_time <= %(start_time)s
+			AND ea.end_time >= %(end_time)s
+			AND (ea.effective_from IS NULL OR (
+				ea.effective_from <= %(date)s AND (ea.effective_to IS NULL OR ea.effective_to >= %(date)s)
+			))
+			AND e.status = 'Active'
+		ORDER BY e.full_name
+		""",
+		{
+			"weekday": WEEKDAYS[for_date.weekday()],
+			"start_time": start_time,
+			"end_time": end_time,
+			"date": for_date,
+		},
+	)
+
+
+class AvailabilityIndex:
+	"""Availability of all active employees, loaded with one query.
+
+	Rows are kept per weekday sorted by start time, so the rows that start early
+	enough for a slot are found by bisection. Use it when many slots are looked up
+	at once (ratio checks, rostering) instead of one get_available_employees call
+	per slot.
+	"""
+
+	def __init__(self, employees=None):
+		self.rows_by_weekday = {}
+		for row in get_availability_rows(employees):
+			self.rows_by_weekday.setdefault(row.weekday, []).append(
+				(to_timedelta(row.start_time), to_timedelta(row.end_time), *get_date_range(row), row.employee)
+			)
+
+		self.starts_by_weekday = {}
+		for weekday, rows in self.rows_by_weekday.items():
+			rows.sort()
+			self.starts_by_weekday[weekday] = [r[0] for r in rows]
+
+	def get_available(self, for_date, start_time, end_time):
+		"""Employees available for the whole of [start_time, end_time] on for_date"""
+		for_date = getdate(for_date)
+		weekday = WEEKDAYS[for_date.weekday()]
+		start_time, end_time = to_timedelta(start_time), to_timedelta(end_time)
+
+		rows = self.rows_by_weekday.get(weekday, [])
+		last = bisect_right(self.starts_by_weekday.get(weekday, []), start_time)
+		return {
+			employee
+			for _start, row_end, date_from, date_to, employee in rows[:last]
+			if row_end >= end_time and date_from <= for_date <= date_to
+		}
+
+	def is_available(self, employee, for_date, start_time, end_time):
+		return employee in self.get_available(for_date, start_time, end_time)
+
+
+def get_availability_rows(employees=None):
+	"""Availability rows of active employees (optionally only `employees`)"""
+	condition = "AND e.name IN %(employees)s" if employees else ""
+	return frappe.db.sql(
+		f"""
+		SELECT ea.parent as employee, ea.weekday, ea.start_time, ea.end_time,
+			ea.effective_from, ea.effective_to
+		FROM `tabEmployee Availability` ea
+		INNER JOIN `tabEmployee` e ON e.name = ea.parent
+		WHERE ea.parenttype = 'Employee' AND e.status = 'Active' {condition}
+		""",
+		{"employees": list(employees or [])},
+		as_dict=True,
+	)
@@ -0,0 +1,140 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# See license.txt
+
+import random
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import frappe
+from frappe.tests import UnitTestCase
+
+from daycare.daycare.doctype.employee import employee
+from daycare.daycare.doctype.employee.employee import WEEKDAYS, AvailabilityIndex
+
+MONDAY = date(2026, 10, 12)
+
+
+def make_row(weekday, start, end, effective_from=None, effective_to=None, name="EMP-TEST"):
+	return frappe._dict(
+		employee=name,
+		weekday=weekday,
+		start_time=f"{start}:00",
+		end_time=f"{end}:00",
+		effective_from=effective_from,
+		effective_to=effective_to,
+	)
+
+
+def has_overlap(rows):
+	"""Pairwise reference of Employee.validate_availability"""
+
+	def dates(row):
+		if not row.effective_from:
+			return date.min, date.max
+		return row.effective_from, row.effective_to or date.max
+
+	for i, row in enumerate(rows):
+		for other in rows[i + 1 :]:
+			(from1, to1), (from2, to2) = dates(row), dates(other)
+			if (
+				row.weekday == other.weekday
+				and from1 <= to2
+				and from2 <= to1
+				and row.start_time < other.end_time
+				and other.start_time < row.end_time
+			):
+				return True
+	return False
+
+
+def make_random_rows(rng, count):
+	rows = []
+	for _i in range(count):
+		start = rng.randrange(7, 17)
+		effective_from = MONDAY + timedelta(days=rng.randrange(60)) if rng.random() < 0.6 else None
+		effective_to = (
+			effective_from + timedelta(days=rng.randrange(30))
+			if effective_from and rng.random() < 0.7
+			else None
+		)
+		rows.append(
+			make_row(
+				rng.choice(WEEKDAYS[:2]),
+				f"{start:02d}:00",
+				f"{rng.randrange(start + 1, 19):02d}:00",
+				effective_from,
+				effective_to,
+				name=f"EMP-{rng.randrange(5)}",
+			)
+		)
+	return rows
+
+
+class UnitTestEmployee(UnitTestCase):
+	def validate(self, rows):
+		doc = frappe.new_doc("Employee")
+		for row in rows:
+			doc.append("employee_availability", {k: v for k, v in row.items() if k != "employee"})
+		doc.validate_availability()
+
+	def test_overlapping_times_on_the_same_weekday(self):
+		rows = [make_row("Monday", "08:00", "12:00"), make_row("Monday", "11:00", "15:00")]
+		with self.assertRaisesRegex(frappe.ValidationError, "Row 1 and Row 2"):
+			self.validate(rows)
+
+	def test_adjacent_or_other_weekday_rows_do_not_overlap(self):
+		self.validate(
+			[
+				make_row("Monday", "08:00", "12:00"),
+				make_row("Monday", "12:00", "15:00"),
+				make_row("Tuesday", "09:00", "13:00"),
+			]
+		)
+
+	def test_date_ranges(self):
+		june, july = (date(2026, 6, 1), date(2026, 6, 30)), (date(2026, 7, 1), date(2026, 7, 31))
+		self.validate(
+			[make_row("Monday", "08:00", "12:00", *june), make_row("Monday", "08:00", "12:00", *july)]
+		)
+
+		# A row without dates applies always, an open-ended row from its start on
+		for rows in (
+			[make_row("Monday", "08:00", "12:00", *july), make_row("Monday", "09:00", "10:00")],
+			[make_row("Monday", "08:00", "12:00", june[0]), make_row("Monday", "09:00", "10:00", *july)],
+		):
+			with self.assertRaises(frappe.ValidationError):
+				self.validate(rows)
+
+	def test_sweep_matches_pairwise_check(self):
+		rng = random.Random(11)
+		for _i in range(300):
+			rows = make_random_rows(rng, rng.randrange(2, 8))
+			with self.subTest(rows=rows):
+				if has_overlap(rows):
+					with self.assertRaises(frappe.ValidationError):
+						self.validate(rows)
+				else:
+					self.validate(rows)
+
+	def test_availability_index_matches_row_scan(self):
+		rng = random.Random(12)
+		rows = make_random_rows(rng, 40)
+		with patch.object(employee, "get_availability_rows", return_value=rows):
+			index = AvailabilityIndex()
+
+		for _i in range(500):
+			for_date = MONDAY + timedelta(days=rng.randrange(70))
+			start = rng.randrange(7, 18)
+			start_time, end_time = f"{start:02d}:00:00", f"{rng.randrange(start + 1, 19):02d}:00:00"
+			expected = {
+				row.employee
+				for row in rows
+				if row.weekday == WEEKDAYS[for_date.weekday()]
+				and row.start_time <= start_time
+				and row.end_time >= end_time
+				and (
+					not row.effective_from or row.effective_from <= for_date <= (row.effective_to or date.max)
+				)
+			}
+			with self.subTest(date=for_date, start=start_time, end=end_time):
+				self.assertEqual(index.get_available(for_date, start_time, end_time), expected)
@@ -6,12 +6,39 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import getdate, add_days
 
+from daycare.daycare.doctype.employee_qualification_summary.employee_qualification_summary import (
+	EXPIRING_WINDOW_DAYS,
+	update_summary,
+)
+
+# status -> condition on expiry_date selecting the rows that belong in it
+STATUS_BY_EXPIRY = (
+	("Expired", "expiry_date < %(today)s"),
+	("Expiring Soon", "expiry_date >= %(today)s AND expiry_date <= %(expiring_until)s"),
+	("Valid", "(expiry_date > %(expiring_until)s OR expiry_date IS NULL)"),
+)
+
 
 class EmployeeQualification(Document):
 	def validate(self):
 		self.validate_expiry_required()
 		self.update_status()
 
+	def on_update(self):
+		self.update_employee_summary()
+
+	def after_delete(self):
+		update_summary([self.employee])
+
+	def update_employee_summary(self):
+		"""Refresh the qualification summary of the affected employee(s)"""
+		employees = [self.employee]
+		doc_before_save = self.get_doc_before_save()
+		if doc_before_save and doc_before_save.employee != self.employee:
+			employees.append(doc_before_save.employee)
+
+		update_summary(employees)
+
 	def validate_expiry_required(self):
 		"""Require expiry date for Certification and License types"""
 		if self.qualification_type in ("Certification", "License") and not self.expiry_date:
@@ -33,7 +60,45 @@ class EmployeeQualification(Document):
 
 		if days_until_expiry < 0:
 			self.status = "Expired"
-		elif days_until_expiry <= 30:
+		elif days_until_expiry <= EXPIRING_WINDOW_DAYS:
 			self.status = "Expiring Soon"
 		else:
 			self.status = "Valid"
+
+
+def refresh_qualification_status():
+	"""Move qualifications between Valid, Expiring Soon and Expired (scheduled daily).
+
+	One bulk UPDATE per target status, keyed on expiry_date; Revoked rows are left
+	alone. Returns the changed rows (name, employee, qualification_name,
+	expiry_date, old_status, status) so alerts can work from the delta.
+	"""
+	today = getdate()
+	values = {"today": today, "expiring_until": add_days(today, EXPIRING_WINDOW_DAYS)}
+	changed = []
+
+	for status, condition in STATUS_BY_EXPIRY:
+		where = f"{condition} AND status NOT IN (%(status)s, 'Revoked')"
+		rows = frappe.db.sql(
+			f"""
+			SELECT name, employee, qualification_name, expiry_date, status as old_status
+			FROM `tabEmployee Qualification`
+			WHERE {where}
+			FOR UPDATE
+			""",
+			{**values, "status": status},
+			as_dict=True,
+		)
+		if not rows:
+			continue
+
+		frappe.db.sql(
+			f"UPDATE `tabEmployee Qualification` SET status = %(status)s WHERE {where}",
+			{**values, "status": status},
+		)
+		for row in rows:
+			row.status = status
+		changed.extend(rows)
+
+	frappe.db.commit()
+	return changed
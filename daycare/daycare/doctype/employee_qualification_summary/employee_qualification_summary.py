@@ -0,0 +1,80 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+from daycare.daycare.report.report_cache import bump_versions, get_dependent_reports, invalidate_report_cache
+
+# Days ahead of expiry that a qualification counts as "Expiring Soon"
+EXPIRING_WINDOW_DAYS = 30
+
+
+class EmployeeQualificationSummary(Document):
+	# Maintained by update_summary / rebuild_summary - not edited by hand
+	pass
+
+
+def update_summary(employees):
+	"""Recompute the summary rows of the given employees from their qualifications"""
+	employees = list({e for e in employees if e})
+	if not employees:
+		return
+
+	_upsert_summary("e.name IN %(employees)s", {"employees": employees})
+
+
+def rebuild_summary(commit=True):
+	"""Rebuild the summary for every employee in one set-based pass.
+
+	Run daily (the expiring/expired windows move with the date) or on demand:
+	bench --site <site> execute daycare.daycare.doctype.employee_qualification_summary.employee_qualification_summary.rebuild_summary
+	"""
+	_upsert_summary("1=1", {})
+	frappe.db.sql(
+		"""
+		DELETE s FROM `tabEmployee Qualification Summary` s
+		LEFT JOIN `tabEmployee` e ON e.name = s.employee
+		WHERE e.name IS NULL
+		"""
+	)
+	if commit:
+		frappe.db.commit()
+		bump_versions(get_dependent_reports(["Employee Qualification Summary"]))
+	else:
+		invalidate_report_cache(["Employee Qualification Summary"])
+
+
+def _upsert_summary(condition, values):
+	frappe.db.sql(
+		f"""
+		INSERT INTO `tabEmployee Qualification Summary`
+			(name, employee, employee_name, total_qualifications, expiring_qualifications,
+			expired_qualifications, next_expiry_date, creation, modified, owner, modified_by)
+		SELECT
+			e.name,
+			e.name,
+			e.full_name,
+			COUNT(eq.name),
+			COUNT(CASE WHEN eq.expiry_date >= CURDATE()
+				AND eq.expiry_date <= DATE_ADD(CURDATE(), INTERVAL %(window)s DAY) THEN 1 END),
+			COUNT(CASE WHEN eq.expiry_date < CURDATE() THEN 1 END),
+			MIN(CASE WHEN eq.expiry_date >= CURDATE() THEN eq.expiry_date END),
+			NOW(),
+			NOW(),
+			'Administrator',
+			'Administrator'
+		FROM `tabEmployee` e
+		LEFT JOIN `tabEmployee Qualification` eq ON eq.employee = e.name
+		WHERE {condition}
+		GROUP BY e.name
+		ON DUPLICATE KEY UPDATE
+			employee_name = VALUES(employee_name),
+			total_qualifications = VALUES(total_qualifications),
+			expiring_qualifications = VALUES(expiring_qualifications),
+			expired_qualifications = VALUES(expired_qualifications),
+			next_expiry_date = VALUES(next_expiry_date),
+			modified = VALUES(modified)
+		""",
+		{"window": EXPIRING_WINDOW_DAYS, **values},
+	)
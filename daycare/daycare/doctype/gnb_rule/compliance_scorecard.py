@@ -0,0 +1,129 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Compliance scorecard over GNB Rules and Internal Rules.
+
+Overdue audits, non-compliant rules by category and Internal Rules past their
+review date are computed with two grouped queries and kept in Redis as a
+snapshot. Saving or deleting a rule recomputes it once committed, and the daily
+job moves it to the new date, so the workspace number cards and chart read the
+snapshot without querying.
+"""
+
+import frappe
+from frappe.utils import getdate, now_datetime
+
+SCORECARD_KEY = "daycare:compliance_scorecard"
+
+# GNB Rule statuses that are not met -> scorecard count, in the order they are charted
+OPEN_COMPLIANCE_STATUSES = {"Non-Compliant": "non_compliant", "Partially Compliant": "partially_compliant"}
+# Internal Rules whose review date is enforced
+REVIEWED_RULE_STATUSES = ("Active", "Under Review")
+
+
+def get_scorecard():
+	"""The snapshot of today, computed when missing or from an earlier day"""
+	scorecard = frappe.cache.get_value(SCORECARD_KEY)
+	if not scorecard or scorecard["date"] != str(getdate()):
+		scorecard = refresh_scorecard()
+
+	return scorecard
+
+
+def refresh_scorecard():
+	"""Recompute and store the snapshot (scheduled daily)"""
+	scorecard = compute_scorecard()
+	frappe.cache.set_value(SCORECARD_KEY, scorecard)
+	return scorecard
+
+
+def compute_scorecard():
+	today = getdate()
+	gnb_by_category = frappe.db.sql(
+		"""
+		SELECT category,
+			COUNT(*) as total,
+			SUM(compliance_status = 'Non-Compliant') as non_compliant,
+			SUM(compliance_status = 'Partially Compliant') as partially_compliant,
+			SUM(next_audit_date < %(today)s) as overdue_audits
+		FROM `tabGNB Rule`
+		WHERE compliance_status != 'Not Applicable'
+		GROUP BY category
+		ORDER BY category
+		""",
+		{"today": today},
+		as_dict=True,
+	)
+	internal_by_category = frappe.db.sql(
+		"""
+		SELECT IFNULL(category, '') as category,
+			COUNT(*) as total,
+			SUM(review_date < %(today)s) as past_review
+		FROM `tabInternal Rule`
+		WHERE status IN %(statuses)s
+		GROUP BY IFNULL(category, '')
+		ORDER BY category
+		""",
+		{"today": today, "statuses": REVIEWED_RULE_STATUSES},
+		as_dict=True,
+	)
+
+	for row in gnb_by_category + internal_by_category:
+		for key, value in row.items():
+			if key != "category":
+				row[key] = int(value or 0)
+
+	return {
+		"date": str(today),
+		"computed_on": str(now_datetime()),
+		"overdue_audits": sum(row.overdue_audits for row in gnb_by_category),
+		"non_compliant": sum(row.non_compliant for row in gnb_by_category),
+		"partially_compliant": sum(row.partially_compliant for row in gnb_by_category),
+		"internal_rules_past_review": sum(row.past_review for row in internal_by_category),
+		"gnb_by_category": [dict(row) for row in gnb_by_category],
+		"internal_by_category": [dict(row) for row in internal_by_category],
+	}
+
+
+def on_change(doc, method=None):
+	"""doc_events handler for GNB Rule and Internal Rule"""
+	frappe.db.after_commit.add(refresh_scorecard)
+
+
+@frappe.whitelist()
+def get_overdue_audits(filters=None):
+	"""Number card: GNB Rules past their next audit date"""
+	frappe.has_permission("GNB Rule", "read", throw=True)
+	return get_card(
+		"overdue_audits",
+		"GNB Rule",
+		{"next_audit_date": ["<", str(getdate())], "compliance_status": ["!=", "Not Applicable"]},
+	)
+
+
+@frappe.whitelist()
+def get_non_compliant_rules(filters=None):
+	"""Number card: GNB Rules marked Non-Compliant"""
+	frappe.has_permission("GNB Rule", "read", throw=True)
+	return get_card("non_compliant", "GNB Rule", {"compliance_status": "Non-Compliant"})
+
+
+@frappe.whitelist()
+def get_internal_rules_past_review(filters=None):
+	"""Number card: active Internal Rules past their review date"""
+	frappe.has_permission("Internal Rule", "read", throw=True)
+	return get_card(
+		"internal_rules_past_review",
+		"Internal Rule",
+		{"review_date": ["<", str(getdate())], "status": ["in", list(REVIEWED_RULE_STATUSES)]},
+	)
+
+
+def get_card(key, doctype, route_options):
+	return {
+		"value": get_scorecard()[key],
+		"fieldtype": "Int",
+		"route": ["List", doctype],
+		"route_options": route_options,
+	}
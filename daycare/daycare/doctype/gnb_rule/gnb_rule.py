@@ -4,13 +4,13 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import getdate, add_months
+from frappe.utils import add_months, cint, getdate
 
 
 class GNBRule(Document):
 	def validate(self):
 		self.validate_audit_dates()
-		self.update_compliance_status_color()
+		self.validate_ratio()
 
 	def validate_audit_dates(self):
 		"""Validate that next audit date is after last audit date"""
@@ -20,15 +20,13 @@ class GNBRule(Document):
 					_("Next Audit Date must be after Last Audit Date")
 				)
 
-	def update_compliance_status_color(self):
-		"""Set indicator color based on compliance status"""
-		status_colors = {
-			"Compliant": "green",
-			"Non-Compliant": "red",
-			"Pending Review": "orange",
-			"Not Applicable": "grey"
-		}
-		# This will be used by the frontend indicator
+	def validate_ratio(self):
+		"""Validate the age band of a staffing ratio rule"""
+		if not self.max_children_per_staff:
+			return
+
+		if cint(self.max_age_months) <= cint(self.min_age_months):
+			frappe.throw(_("Max Age must be greater than Min Age"))
 
 	def is_audit_overdue(self):
 		"""Check if audit is overdue"""
@@ -0,0 +1,19 @@
+// Copyright (c) 2025, Daycare and contributors
+// For license information, please see license.txt
+
+// Indicator color of each compliance status
+const COMPLIANCE_STATUS_COLORS = {
+    "Compliant": "green",
+    "Non-Compliant": "red",
+    "Partially Compliant": "orange",
+    "Pending Review": "orange",
+    "Not Applicable": "gray",
+};
+
+frappe.listview_settings["GNB Rule"] = {
+    add_fields: ["compliance_status"],
+    get_indicator: function(doc) {
+        const color = COMPLIANCE_STATUS_COLORS[doc.compliance_status] || "gray";
+        return [__(doc.compliance_status), color, "compliance_status,=," + doc.compliance_status];
+    },
+};
@@ -5,12 +5,20 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 
+from daycare.daycare.planning.placement import invalidate_placement_index
+
 
 class Group(Document):
 	def validate(self):
 		self.validate_age_range()
 		self.validate_max_children()
 
+	def on_update(self):
+		invalidate_placement_index()
+
+	def on_trash(self):
+		invalidate_placement_index()
+
 	def validate_age_range(self):
 		"""Ensure min age is less than max age"""
 		if self.age_range_min_months >= self.age_range_max_months:
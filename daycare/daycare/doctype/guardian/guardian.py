@@ -0,0 +1,189 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Guardian masters shared by siblings.
+
+A Child Guardian row links a child to its Guardian and keeps what is specific
+to that child (relationship, primary contact, pickup rights). The contact
+details on the row are a copy of the master's, kept for the roster and the
+other readers of `tabChild Guardian`, and are rewritten whenever the master
+changes.
+
+Rows saved without a Guardian are matched to one by email or phone, each together
+with the name (a shared family email or landline is not a shared guardian), and
+masters are created in bulk for the rest.
+"""
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now
+
+from daycare.daycare.doctype.guardian.pickup import invalidate_pickup_map
+from daycare.daycare.doctype.search_entry.search_entry import get_digits, index_documents, normalize
+from daycare.daycare.report.report_cache import invalidate_report_cache
+from daycare.daycare.setup.bulk_import import make_doc, set_names, write_docs
+
+# Fields copied from the master to its Child Guardian rows
+CONTACT_FIELDS = ("guardian_name", "phone", "email", "address")
+LINK_BATCH_SIZE = 2000
+
+
+class Guardian(Document):
+	def validate(self):
+		self.normalize_contact()
+
+	def on_update(self):
+		if self.has_contact_changed():
+			self.update_child_rows()
+			# Phone, email and name are keys or values of the pickup map
+			invalidate_pickup_map()
+
+	def normalize_contact(self):
+		self.email = (self.email or "").strip().lower() or None
+		self.phone_digits = get_digits(self.phone)
+
+	def has_contact_changed(self):
+		doc_before_save = self.get_doc_before_save()
+		return bool(doc_before_save) and any(doc_before_save.get(f) != self.get(f) for f in CONTACT_FIELDS)
+
+	def update_child_rows(self):
+		"""Copy the contact details to every Child Guardian row of this guardian"""
+		children = frappe.db.sql_list(
+			"""
+			SELECT DISTINCT parent FROM `tabChild Guardian`
+			WHERE guardian = %(guardian)s AND parenttype = 'Child'
+			""",
+			{"guardian": self.name},
+		)
+		if not children:
+			return
+
+		frappe.db.sql(
+			"""
+			UPDATE `tabChild Guardian`
+			SET guardian_name = %(guardian_name)s, phone = %(phone)s, email = %(email)s,
+				address = %(address)s, modified = %(modified)s
+			WHERE guardian = %(guardian)s AND parenttype = 'Child'
+			""",
+			{**{f: self.get(f) for f in CONTACT_FIELDS}, "guardian": self.name, "modified": now()},
+		)
+		index_documents("Child", children)
+		invalidate_report_cache(["Child"])
+
+
+def match_guardians(rows):
+	"""Set `guardian` on the rows without one, creating the missing masters in bulk"""
+	pending = [row for row in rows if not row.get("guardian")]
+	if not pending:
+		return
+
+	existing = find_guardians(pending)
+	created = {}
+	new_rows = []
+	for row in pending:
+		keys = get_match_keys(row)
+		row.guardian = next((existing[key] for key in keys if key in existing), None)
+		if row.guardian:
+			continue
+
+		doc = next((created[key] for key in keys if key in created), None) or make_doc(
+			"Guardian", {f: row.get(f) for f in CONTACT_FIELDS}
+		)
+		for key in keys:
+			created.setdefault(key, doc)
+		new_rows.append((row, doc))
+
+	docs = list({id(doc): doc for _row, doc in new_rows}.values())
+	if docs:
+		set_names(docs)
+		write_docs(docs)
+
+	for row, doc in new_rows:
+		row.guardian = doc.name
+
+
+def find_guardians(rows):
+	"""{match key: existing Guardian} for the emails and phones of `rows`"""
+	emails = {key[1] for row in rows for key in get_match_keys(row) if key[0] == "email"}
+	phones = {key[1] for row in rows for key in get_match_keys(row) if key[0] == "phone"}
+	if not emails and not phones:
+		return {}
+
+	guardians = frappe.db.sql(
+		"""
+		SELECT name, guardian_name, email, phone_digits as phone
+		FROM `tabGuardian`
+		WHERE email IN %(emails)s OR phone_digits IN %(phones)s
+		ORDER BY creation
+		""",
+		{"emails": list(emails) or [""], "phones": list(phones) or [""]},
+		as_dict=True,
+	)
+
+	found = {}
+	for guardian in guardians:
+		for key in get_match_keys(guardian):
+			found.setdefault(key, guardian.name)
+	return found
+
+
+def get_match_keys(row):
+	"""Keys under which two guardian records are the same person"""
+	keys = []
+	name = normalize(row.get("guardian_name")).strip()
+	email = (row.get("email") or "").strip().lower()
+	if email:
+		keys.append(("email", email, name))
+
+	digits = get_digits(row.get("phone"))
+	if digits:
+		keys.append(("phone", digits, name))
+	return keys
+
+
+def link_guardian_rows(commit=True):
+	"""Link every Child Guardian row without a Guardian to a master, in keyset batches.
+
+	Used by the migration of existing rows and after bulk loads. Returns the
+	number of rows linked.
+	"""
+	after = ""
+	linked = 0
+	while True:
+		rows = frappe.db.sql(
+			"""
+			SELECT name, parent, guardian_name, phone, email, address
+			FROM `tabChild Guardian`
+			WHERE parenttype = 'Child' AND IFNULL(guardian, '') = '' AND name > %(after)s
+			ORDER BY name
+			LIMIT %(limit)s
+			""",
+			{"after": after, "limit": LINK_BATCH_SIZE},
+			as_dict=True,
+		)
+		if not rows:
+			break
+
+		match_guardians(rows)
+		values = {"names": [row.name for row in rows]}
+		cases = []
+		for i, row in enumerate(rows):
+			values[f"row_{i}"], values[f"guardian_{i}"] = row.name, row.guardian
+			cases.append(f"WHEN %(row_{i})s THEN %(guardian_{i})s")
+
+		frappe.db.sql(
+			f"""
+			UPDATE `tabChild Guardian`
+			SET guardian = CASE name {" ".join(cases)} END
+			WHERE name IN %(names)s
+			""",
+			values,
+		)
+		linked += len(rows)
+		if commit:
+			frappe.db.commit()
+
+		after = rows[-1].name
+
+	return linked
@@ -0,0 +1,186 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Pickup authorization map.
+
+For every Guardian, the active children it may collect (with photo, room and
+group) are kept in Redis under its ID, and the Guardians of every phone number
+and email under those, so the pickup desk answers "who may this person collect?"
+with a few key reads and no query.
+
+Entries live under a version token. Saving or deleting a Child drops the entries
+of its guardians, and the Guardians of their phone numbers and emails (the save
+may have created a master), once committed; bulk changes (placements, enrolment,
+imports, room renames, guardian contact changes) replace the token and queue a
+rebuild.
+The whole map is also rebuilt every afternoon, ahead of the pickup window.
+Entries missing from the map are computed on read with indexed queries.
+"""
+
+import pickle
+
+import frappe
+from frappe import _
+
+from daycare.daycare.doctype.room.room import OCCUPYING_STATUS
+from daycare.daycare.doctype.search_entry.search_entry import get_digits
+
+ENTRY_TTL = 24 * 60 * 60
+BUILD_JOB_ID = "daycare:build_pickup_map"
+
+
+@frappe.whitelist()
+def get_pickup_authorization(guardian=None, phone=None, email=None):
+	"""Guardians matching a Guardian ID, phone or email, each with the children it may pick up"""
+	frappe.has_permission("Child", "read", throw=True)
+	if not (guardian or phone or email):
+		frappe.throw(_("Enter a guardian, phone number or email"))
+
+	version = get_version()
+	if guardian:
+		guardians = [guardian]
+	elif phone:
+		guardians = get_guardians(version, "phone_digits", get_digits(phone))
+	else:
+		guardians = get_guardians(version, "email", email.strip().lower())
+
+	return [entry for entry in (get_entry(version, name) for name in guardians) if entry]
+
+
+def get_guardians(version, field, value):
+	"""Guardians with `field` (phone_digits or email) equal to `value`"""
+	if not value:
+		return []
+
+	key = get_alias_key(version, field, value)
+	guardians = frappe.cache.get_value(key)
+	if guardians is None:
+		guardians = frappe.get_all("Guardian", filters={field: value}, pluck="name", order_by="creation")
+		frappe.cache.set_value(key, guardians, expires_in_sec=ENTRY_TTL)
+
+	return guardians
+
+
+def get_entry(version, guardian):
+	"""{"guardian", "guardian_name", "children"} of a Guardian, or None when it does not exist"""
+	key = get_entry_key(version, guardian)
+	entry = frappe.cache.get_value(key)
+	if entry is None:
+		# Unknown IDs are cached too, as False
+		entry = get_entries([guardian]).get(guardian, False)
+		frappe.cache.set_value(key, entry, expires_in_sec=ENTRY_TTL)
+
+	return entry or None
+
+
+def get_entries(guardians=None):
+	"""{guardian: entry} for `guardians`, or for every Guardian"""
+	entries = {
+		row.name: {"guardian": row.name, "guardian_name": row.guardian_name, "children": []}
+		for row in frappe.get_all(
+			"Guardian",
+			filters={"name": ("in", guardians)} if guardians else None,
+			fields=["name", "guardian_name"],
+		)
+	}
+
+	for row in frappe.db.sql(*get_authorization_query(guardians), as_dict=True):
+		guardian = row.pop("guardian")
+		if guardian in entries:
+			entries[guardian]["children"].append(row)
+
+	return entries
+
+
+def get_authorization_query(guardians=None):
+	"""(query, values) of the active children `guardians` (default: all) may pick up"""
+	condition = "cg.guardian IN %(guardians)s" if guardians else "IFNULL(cg.guardian, '') != ''"
+	return (
+		f"""
+		SELECT cg.guardian, cg.name as child_guardian, cg.relationship,
+			c.name as child, c.full_name as child_name, c.photo, c.room, r.room_name, c.`group`
+		FROM `tabChild Guardian` cg
+		INNER JOIN `tabChild` c ON c.name = cg.parent
+		LEFT JOIN `tabRoom` r ON r.name = c.room
+		WHERE {condition}
+			AND cg.parenttype = 'Child'
+			AND cg.can_pickup = 1
+			AND c.enrollment_status = %(enrollment_status)s
+		ORDER BY c.full_name
+		""",
+		{"guardians": guardians, "enrollment_status": OCCUPYING_STATUS},
+	)
+
+
+def build_pickup_map():
+	"""Write the entry of every Guardian, and the Guardians of every phone and email (scheduled daily)"""
+	version = get_version()
+	aliases = {}
+	for row in frappe.get_all("Guardian", fields=["name", "email", "phone_digits"], order_by="creation"):
+		for field in ("email", "phone_digits"):
+			if row.get(field):
+				aliases.setdefault((field, row.get(field)), []).append(row.name)
+
+	pipeline = frappe.cache.pipeline()
+	for guardian, entry in get_entries().items():
+		pipeline.set(
+			frappe.cache.make_key(get_entry_key(version, guardian)), pickle.dumps(entry), ex=ENTRY_TTL
+		)
+	for (field, value), guardians in aliases.items():
+		pipeline.set(
+			frappe.cache.make_key(get_alias_key(version, field, value)), pickle.dumps(guardians), ex=ENTRY_TTL
+		)
+	pipeline.execute()
+
+
+def invalidate_pickup_map(guardians=None, aliases=None):
+	"""Drop the entries of `guardians` and the (field, value) `aliases`, or the whole map, once committed"""
+	if guardians or aliases:
+		frappe.db.after_commit.add(lambda: delete_entries(guardians or (), aliases or ()))
+	else:
+		frappe.db.after_commit.add(bump_version)
+
+
+def delete_entries(guardians, aliases):
+	version = get_version()
+	frappe.cache.delete_value(
+		[get_entry_key(version, guardian) for guardian in guardians]
+		+ [get_alias_key(version, field, value) for field, value in aliases]
+	)
+
+
+def on_child_change(doc, method=None):
+	"""doc_events handler for Child: its guardians before and after the change are stale"""
+	rows = list(doc.child_guardians)
+	doc_before_save = doc.get_doc_before_save()
+	if doc_before_save:
+		rows += doc_before_save.child_guardians
+
+	guardians = {row.guardian for row in rows if row.guardian}
+	aliases = {("email", (row.email or "").strip().lower()) for row in rows}
+	aliases |= {("phone_digits", get_digits(row.phone)) for row in rows}
+	aliases = {(field, value) for field, value in aliases if value}
+	if guardians or aliases:
+		invalidate_pickup_map(guardians, aliases)
+
+
+def bump_version():
+	frappe.cache.set_value(get_version_key(), frappe.generate_hash(length=12))
+	frappe.enqueue(build_pickup_map, queue="long", job_id=BUILD_JOB_ID, deduplicate=True)
+
+
+def get_version():
+	return frappe.cache.get_value(get_version_key()) or "0"
+
+
+def get_version_key():
+	return "daycare:pickup:version"
+
+
+def get_entry_key(version, guardian):
+	return f"daycare:pickup:{version}:guardian:{guardian}"
+
+
+def get_alias_key(version, field, value):
+	return f"daycare:pickup:{version}:{field}:{value}"
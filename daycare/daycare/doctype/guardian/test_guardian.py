@@ -0,0 +1,91 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from daycare.daycare.doctype.guardian.guardian import link_guardian_rows
+
+
+class IntegrationTestGuardian(IntegrationTestCase):
+	def setUp(self):
+		# Guardians of other tests must not match
+		self.suffix = frappe.generate_hash(length=8)
+
+	def make_guardian_row(self, guardian_name, email=None, phone="506-555-0100", **values):
+		return {
+			"guardian_name": f"{guardian_name} {self.suffix}",
+			"relationship": "Mother",
+			"email": email and f"{self.suffix}.{email}",
+			"phone": phone,
+			"is_primary": 0,
+			"can_pickup": 1,
+			**values,
+		}
+
+	def make_child(self, first_name, guardians):
+		guardians[0]["is_primary"] = 1
+		return frappe.get_doc(
+			{
+				"doctype": "Child",
+				"first_name": first_name,
+				"last_name": f"Guardian Test {self.suffix}",
+				"date_of_birth": "2023-05-01",
+				"enrollment_status": "Waitlisted",
+				"child_guardians": guardians,
+			}
+		).insert()
+
+	def test_siblings_share_a_guardian(self):
+		first = self.make_child("Ada", [self.make_guardian_row("Grace", "family@daycare.localhost")])
+		second = self.make_child("Alan", [self.make_guardian_row("Grace", "Family@daycare.localhost ")])
+
+		guardian = first.child_guardians[0].guardian
+		self.assertTrue(guardian)
+		self.assertEqual(second.child_guardians[0].guardian, guardian)
+		self.assertEqual(frappe.db.count("Guardian", {"email": f"{self.suffix}.family@daycare.localhost"}), 1)
+
+	def test_shared_family_email_with_different_names(self):
+		child = self.make_child(
+			"Ada",
+			[
+				self.make_guardian_row("Grace", "family@daycare.localhost"),
+				self.make_guardian_row("Charles", "family@daycare.localhost", relationship="Father"),
+			],
+		)
+		mother, father = (row.guardian for row in child.child_guardians)
+
+		self.assertTrue(mother and father)
+		self.assertNotEqual(mother, father)
+		self.assertEqual(frappe.db.count("Guardian", {"email": f"{self.suffix}.family@daycare.localhost"}), 2)
+
+	def test_contact_change_rewrites_child_rows(self):
+		first = self.make_child("Ada", [self.make_guardian_row("Grace", "grace@daycare.localhost")])
+		second = self.make_child("Alan", [self.make_guardian_row("Grace", "grace@daycare.localhost")])
+
+		guardian = frappe.get_doc("Guardian", first.child_guardians[0].guardian)
+		guardian.phone = "506-555-0199"
+		guardian.address = "1 Main Street"
+		guardian.save()
+
+		for child in (first, second):
+			row = frappe.db.get_value(
+				"Child Guardian",
+				child.child_guardians[0].name,
+				["guardian", "phone", "address"],
+				as_dict=True,
+			)
+			self.assertEqual(row.guardian, guardian.name)
+			self.assertEqual(row.phone, "506-555-0199")
+			self.assertEqual(row.address, "1 Main Street")
+
+	def test_unlinked_rows_are_linked_to_existing_masters(self):
+		first = self.make_child("Ada", [self.make_guardian_row("Grace", phone="(506) 555-0142")])
+		second = self.make_child("Alan", [self.make_guardian_row("Grace", phone="506.555.0142")])
+		guardian = first.child_guardians[0].guardian
+		frappe.db.set_value("Child Guardian", second.child_guardians[0].name, "guardian", None)
+
+		self.assertGreaterEqual(link_guardian_rows(commit=False), 1)
+		self.assertEqual(
+			frappe.db.get_value("Child Guardian", second.child_guardians[0].name, "guardian"), guardian
+		)
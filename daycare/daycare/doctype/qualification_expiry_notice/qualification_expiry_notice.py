@@ -0,0 +1,176 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Qualification expiry digests.
+
+Every day the qualifications expiring within EXPIRING_WINDOW_DAYS or expired in
+the last EXPIRED_LOOKBACK_DAYS are read with one indexed query, and each
+recipient gets a single email through the email queue: employees about their
+own qualifications, supervisors (Employee.reports_to) about their team's.
+
+A Qualification Expiry Notice row is written per qualification, recipient,
+status and expiry date in the transaction that queues the email, so a re-run
+sends nothing twice, and a renewed qualification is announced again when its
+new expiry date comes up.
+"""
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import add_days, getdate, now_datetime
+
+from daycare.daycare.doctype.employee_qualification_summary.employee_qualification_summary import (
+	EXPIRING_WINDOW_DAYS,
+)
+
+DIGEST_TEMPLATE = "qualification_expiry_digest"
+# Expired qualifications older than this were announced already or are history
+EXPIRED_LOOKBACK_DAYS = 90
+
+EMPLOYEE = "Employee"
+SUPERVISOR = "Supervisor"
+
+
+class QualificationExpiryNotice(Document):
+	# Written by send_expiry_digests - not edited by hand
+	pass
+
+
+def send_expiry_digests():
+	"""Queue one digest per recipient of the expiring and expired qualifications not announced yet (scheduled daily).
+
+	Each recipient's email and notices are committed together; a failed recipient
+	is logged and retried on the next run. Returns the number of digests queued.
+	"""
+	rows = frappe.db.sql(*get_expiring_query(), as_dict=True)
+	sent = get_sent_notices([row.name for row in rows])
+
+	digests = {}
+	for row in rows:
+		for recipient, role, recipient_name in get_recipients(row):
+			if (row.name, recipient, row.status, getdate(row.expiry_date)) in sent:
+				continue
+
+			digest = digests.setdefault(
+				recipient, {"recipient_name": recipient_name, EMPLOYEE: [], SUPERVISOR: []}
+			)
+			digest[role].append(row)
+
+	queued = 0
+	for recipient, digest in digests.items():
+		try:
+			send_digest(recipient, digest)
+			frappe.db.commit()
+			queued += 1
+		except Exception:
+			frappe.db.rollback()
+			frappe.log_error(_("Qualification expiry digest to {0} failed").format(recipient))
+
+	return queued
+
+
+def get_expiring_query():
+	"""(query, values) of the qualifications to announce, with their holder and supervisor"""
+	today = getdate()
+	return (
+		"""
+		SELECT q.name, q.employee, q.qualification_name, q.qualification_type, q.expiry_date,
+			IF(q.expiry_date < %(today)s, 'Expired', 'Expiring Soon') as status,
+			e.full_name as employee_name, e.email,
+			s.full_name as supervisor_name, s.email as supervisor_email
+		FROM `tabEmployee Qualification` q
+		INNER JOIN `tabEmployee` e ON e.name = q.employee
+		LEFT JOIN `tabEmployee` s ON s.name = e.reports_to AND s.status != 'Terminated'
+		WHERE q.expiry_date >= %(expired_since)s
+			AND q.expiry_date <= %(expiring_until)s
+			AND q.status != 'Revoked'
+			AND e.status != 'Terminated'
+		ORDER BY q.expiry_date, e.full_name
+		""",
+		{
+			"today": today,
+			"expired_since": add_days(today, -EXPIRED_LOOKBACK_DAYS),
+			"expiring_until": add_days(today, EXPIRING_WINDOW_DAYS),
+		},
+	)
+
+
+def get_sent_notices(qualifications):
+	"""{(qualification, recipient, status, expiry_date)} already announced"""
+	if not qualifications:
+		return set()
+
+	return {
+		(row.qualification, row.recipient, row.status, getdate(row.expiry_date))
+		for row in frappe.get_all(
+			"Qualification Expiry Notice",
+			filters={"qualification": ("in", qualifications)},
+			fields=["qualification", "recipient", "status", "expiry_date"],
+		)
+	}
+
+
+def get_recipients(row):
+	"""(email, role, name) of everyone to tell about a qualification"""
+	if row.email:
+		yield row.email.strip().lower(), EMPLOYEE, row.employee_name
+	if row.supervisor_email:
+		yield row.supervisor_email.strip().lower(), SUPERVISOR, row.supervisor_name
+
+
+def send_digest(recipient, digest):
+	own, team = digest[EMPLOYEE], digest[SUPERVISOR]
+	frappe.sendmail(
+		recipients=[recipient],
+		subject=_("{0} qualification(s) expiring or expired").format(len(own) + len(team)),
+		template=DIGEST_TEMPLATE,
+		args={
+			"recipient_name": digest["recipient_name"],
+			"own": own,
+			"team": team,
+			"expiring_window_days": EXPIRING_WINDOW_DAYS,
+		},
+	)
+
+	timestamp = now_datetime()
+	fields = [
+		"name",
+		"qualification",
+		"qualification_name",
+		"employee",
+		"status",
+		"expiry_date",
+		"recipient",
+		"recipient_role",
+		"sent_on",
+		"owner",
+		"modified_by",
+		"creation",
+		"modified",
+		"docstatus",
+	]
+	frappe.db.bulk_insert(
+		"Qualification Expiry Notice",
+		fields,
+		[
+			(
+				frappe.generate_hash(length=10),
+				row.name,
+				row.qualification_name,
+				row.employee,
+				row.status,
+				row.expiry_date,
+				recipient,
+				role,
+				timestamp,
+				"Administrator",
+				"Administrator",
+				timestamp,
+				timestamp,
+				0,
+			)
+			for role, rows in ((EMPLOYEE, own), (SUPERVISOR, team))
+			for row in rows
+		],
+	)
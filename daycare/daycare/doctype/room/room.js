@@ -2,6 +2,27 @@
 // For license information, please see license.txt
 
 frappe.ui.form.on("Room", {
+    onload: function(frm) {
+        // Apply this room's realtime deltas instead of reloading the form
+        frm.room_status_handler = function(data) {
+            if (!frm.room_status || data.room !== frm.doc.name) {
+                return;
+            }
+
+            daycare.room_status.apply(frm.room_status, data);
+            if (frm.doc.current_occupancy !== frm.room_status.current_occupancy) {
+                frm.doc.current_occupancy = frm.room_status.current_occupancy;
+                frm.refresh_field("current_occupancy");
+            }
+            render_room_status(frm);
+        };
+        frappe.realtime.on(daycare.room_status.EVENT, frm.room_status_handler);
+    },
+
+    onunload: function(frm) {
+        frappe.realtime.off(daycare.room_status.EVENT, frm.room_status_handler);
+    },
+
     refresh: function(frm) {
         if (!frm.is_new()) {
             // Add button to view Room Activity Calendar
@@ -18,6 +39,32 @@ frappe.ui.form.on("Room", {
                     room: frm.doc.name
                 });
             }, __("Actions"));
+
+            frm.add_custom_button(__("Room Status Board"), function() {
+                frappe.set_route("room-status-board");
+            }, __("Actions"));
+
+            daycare.room_status.load([frm.doc.name]).then((status) => {
+                frm.room_status = status[0];
+                render_room_status(frm);
+            });
         }
     }
 });
+
+function render_room_status(frm) {
+    const status = frm.room_status;
+    if (!status) {
+        return;
+    }
+
+    const activity = daycare.room_status.get_current_activity(status);
+    const parts = [
+        __("Checked in: {0}", [status.headcount || 0]),
+        __("Enrolled: {0} / {1}", [status.current_occupancy || 0, status.capacity || 0]),
+        activity
+            ? __("Now: {0}", [frappe.utils.escape_html(activity.title || activity.activity_type)])
+            : __("No activity in progress"),
+    ];
+    frm.dashboard.set_headline(parts.join(" &middot; "));
+}
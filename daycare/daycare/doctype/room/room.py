@@ -5,12 +5,39 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 
+from daycare.daycare.doctype.room.room_status import publish_room_status, publish_staff
+
+# Enrollment status of the children counted in a room's occupancy
+OCCUPYING_STATUS = "Active"
+
 
 class Room(Document):
 	def validate(self):
 		self.validate_age_range()
 		self.validate_capacity()
 
+	def on_update(self):
+		self.invalidate_placement_index()
+		self.invalidate_pickup_map()
+		publish_staff(self)
+
+	def on_trash(self):
+		self.invalidate_placement_index()
+
+	def invalidate_placement_index(self):
+		"""Capacity and age range feed the group placement index"""
+		from daycare.daycare.planning.placement import invalidate_placement_index
+
+		invalidate_placement_index()
+
+	def invalidate_pickup_map(self):
+		"""The pickup map shows each child's room name"""
+		from daycare.daycare.doctype.guardian.pickup import invalidate_pickup_map
+
+		doc_before_save = self.get_doc_before_save()
+		if doc_before_save and doc_before_save.room_name != self.room_name:
+			invalidate_pickup_map()
+
 	def validate_age_range(self):
 		"""Ensure min age is less than max age"""
 		if self.age_range_min_months >= self.age_range_max_months:
@@ -23,8 +50,65 @@ class Room(Document):
 
 	def update_occupancy(self):
 		"""Update current occupancy based on enrolled children"""
-		count = frappe.db.count("Child", {
-			"room": self.name,
-			"enrollment_status": "Enrolled"
-		})
+		count = get_occupancy(self.name)
 		self.db_set("current_occupancy", count, update_modified=False)
+		publish_room_status(self.name, occupancy=count)
+
+
+def get_occupancy(room):
+	"""Children counted towards a room's occupancy"""
+	return frappe.db.count("Child", get_occupancy_filters(room))
+
+
+def get_occupancy_filters(room):
+	"""Filters selecting the children counted towards a room's occupancy"""
+	return {
+		"room": room,
+		"enrollment_status": OCCUPYING_STATUS
+	}
+
+
+def adjust_occupancy(room, delta):
+	"""Atomically apply a delta to a room's current_occupancy"""
+	if not room or not delta:
+		return
+
+	frappe.db.sql(
+		"""
+		UPDATE `tabRoom`
+		SET current_occupancy = GREATEST(0, current_occupancy + %(delta)s)
+		WHERE name = %(room)s
+		""",
+		{"room": room, "delta": delta},
+	)
+	publish_room_status(room, occupancy_delta=delta)
+
+
+def reconcile_occupancy(commit=True):
+	"""Recount every room with one GROUP BY and fix any drift (scheduled hourly).
+
+	Returns {room: (stored, actual)} for the rooms that had drifted.
+	"""
+	drifted = frappe.db.sql(
+		"""
+		SELECT r.name, r.current_occupancy, IFNULL(c.occupancy, 0) as occupancy
+		FROM `tabRoom` r
+		LEFT JOIN (
+			SELECT room, COUNT(*) as occupancy
+			FROM `tabChild`
+			WHERE enrollment_status = %(status)s AND room IS NOT NULL
+			GROUP BY room
+		) c ON c.room = r.name
+		WHERE r.current_occupancy != IFNULL(c.occupancy, 0)
+		""",
+		{"status": OCCUPYING_STATUS},
+		as_dict=True,
+	)
+
+	for row in drifted:
+		frappe.db.set_value("Room", row.name, "current_occupancy", row.occupancy, update_modified=False)
+		publish_room_status(row.name, occupancy=row.occupancy)
+
+	if commit:
+		frappe.db.commit()
+	return {row.name: (row.current_occupancy, row.occupancy) for row in drifted}
@@ -0,0 +1,181 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Realtime room status: the Room form and the Room Status Board load a room's
+status once with get_room_status and then apply the deltas published here on
+the ROOM_STATUS_EVENT socket.io event, instead of reloading or polling.
+Deltas go to the room's document subscribers only (the open Room form, and the
+board subscribes to every room it shows), so users who may not read the Room
+do not receive them.
+
+Every message carries the room and one kind of change:
+- occupancy_delta (or occupancy, after a recount): enrolled children
+- headcount: children checked in today
+- activity / removed_activity: one of today's activities was saved or removed
+- staff: the employees assigned to the room
+"""
+
+import frappe
+from frappe.utils import getdate, today
+
+ROOM_STATUS_EVENT = "room_status"
+
+
+def publish_room_status(room, after_commit=True, **changes):
+	"""Publish a delta of `room` to the users who may read it; by default only once committed"""
+	if not room:
+		return
+
+	frappe.publish_realtime(
+		ROOM_STATUS_EVENT,
+		{"room": room, **changes},
+		doctype="Room",
+		docname=room,
+		after_commit=after_commit,
+	)
+
+
+def publish_activity(doc):
+	"""Publish a saved Room Activity of today, and its removal from where it was before"""
+	doc_before_save = doc.get_doc_before_save()
+	if (
+		doc_before_save
+		and is_today(doc_before_save.date)
+		and (doc_before_save.room != doc.room or not is_today(doc.date))
+	):
+		publish_room_status(doc_before_save.room, removed_activity=doc.name)
+
+	if not is_today(doc.date):
+		return
+
+	activity = get_activity(doc)
+	if doc.schedule:
+		# An override takes the place of the schedule's occurrence on the board
+		activity["replaces"] = f"{doc.schedule}:{getdate(doc.schedule_date)}"
+	publish_room_status(doc.room, activity=activity)
+
+
+def publish_activity_removed(doc):
+	if is_today(doc.date):
+		publish_room_status(doc.room, removed_activity=doc.name)
+
+
+def publish_staff(doc):
+	"""Publish the assigned staff of a Room when they changed"""
+	doc_before_save = doc.get_doc_before_save()
+	staff = get_staff_list(doc)
+	if doc_before_save and get_staff_list(doc_before_save) == staff:
+		return
+
+	publish_room_status(doc.name, staff=get_staff_names(staff))
+
+
+def is_today(date):
+	return bool(date) and getdate(date) == getdate(today())
+
+
+def get_activity(event):
+	return {
+		"name": event.name,
+		"title": event.title,
+		"activity_type": event.activity_type,
+		"status": event.status,
+		"color": event.color,
+		"all_day": event.all_day,
+		"start_time": str(event.start_time) if event.start_time else None,
+		"end_time": str(event.end_time) if event.end_time else None,
+		"assigned_staff": event.assigned_staff,
+	}
+
+
+def get_staff_list(doc):
+	return [row.employee for row in doc.assigned_staff or []]
+
+
+def get_staff_names(employees):
+	"""[{employee, employee_name}] in the given order"""
+	if not employees:
+		return []
+
+	names = dict(
+		frappe.get_all(
+			"Employee",
+			filters={"name": ("in", employees)},
+			fields=["name", "full_name"],
+			as_list=True,
+		)
+	)
+	return [{"employee": employee, "employee_name": names.get(employee)} for employee in employees]
+
+
+@frappe.whitelist()
+def get_room_status(rooms=None):
+	"""Status of the active rooms (or of `rooms`) that the deltas are applied to"""
+	from daycare.daycare.doctype.attendance_log.attendance_log import get_headcount
+
+	frappe.has_permission("Room", "read", throw=True)
+	rooms = frappe.parse_json(rooms) if isinstance(rooms, str) else rooms
+	filters = {"name": ("in", rooms)} if rooms else {"status": "Active"}
+
+	status = {
+		room.name: {**room, "staff": [], "activities": [], "headcount": 0}
+		for room in frappe.get_all(
+			"Room",
+			filters=filters,
+			fields=["name", "room_name", "status", "capacity", "current_occupancy"],
+			order_by="room_name",
+		)
+	}
+	if not status:
+		return []
+
+	rows = frappe.get_all(
+		"Room Staff",
+		filters={"parenttype": "Room", "parent": ("in", list(status))},
+		fields=["parent", "employee"],
+		order_by="idx",
+	)
+	for row, staff in zip(rows, get_staff_names([row.employee for row in rows]), strict=True):
+		status[row.parent]["staff"].append(staff)
+
+	date = getdate(today())
+	if frappe.has_permission("Room Activity", "read"):
+		for event in get_activities(date, list(status)):
+			status[event.room]["activities"].append(get_activity(event))
+
+	if frappe.has_permission("Attendance Log", "read"):
+		for room, headcount in get_headcount(date=date).items():
+			if room in status:
+				status[room]["headcount"] = headcount
+
+	return list(status.values())
+
+
+def get_activities(date, rooms):
+	"""Room Activities and schedule occurrences of `rooms` on `date` that the user may read"""
+	from daycare.daycare.doctype.room_activity_schedule.room_activity_schedule import expand_schedules
+
+	activities = frappe.get_list(
+		"Room Activity",
+		filters={"date": date, "room": ("in", rooms)},
+		fields=[
+			"name",
+			"room",
+			"title",
+			"activity_type",
+			"status",
+			"color",
+			"all_day",
+			"start_time",
+			"end_time",
+			"assigned_staff",
+		],
+		limit_page_length=0,
+	)
+	if frappe.has_permission("Room Activity Schedule", "read"):
+		activities += [
+			event for event in expand_schedules(date, date).get(getdate(date), []) if event.room in rooms
+		]
+
+	return activities
@@ -0,0 +1,124 @@
+# Copyright (c) 2025, Daycare and contributors
+# For license information, please see license.txt
+
+"""
+Redis cache for the Room Activity calendar feed.
+
+Events are cached per (room, week, filter hash). Every (room, week) pair has a
+version token that Room Activity writes replace, so a write invalidates only the
+weeks it touches. Recurring schedules span many weeks, so each room also has a
+schedule token that is part of every week's version.
+"""
+
+import hashlib
+from datetime import timedelta
+
+import frappe
+from frappe.utils import getdate
+
+# Version bucket shared by every calendar request that is not filtered by room
+ALL_ROOMS = "*"
+EVENTS_CACHE_TTL = 24 * 60 * 60
+
+
+def get_week_starts(start, end):
+	"""Mondays of every week overlapping [start, end]"""
+	week = get_week_start(start)
+	end = getdate(end)
+	weeks = []
+	while week <= end:
+		weeks.append(week)
+		week += timedelta(days=7)
+	return weeks
+
+
+def get_week_start(date):
+	date = getdate(date)
+	return date - timedelta(days=date.weekday())
+
+
+def get_room_filter(filters):
+	"""Room the calendar is filtered on, or ALL_ROOMS"""
+	return get_equality_filters(filters).get("room") or ALL_ROOMS
+
+
+def get_equality_filters(filters):
+	"""{fieldname: value} for the plain `=` filters of a calendar request"""
+	filters = frappe.parse_json(filters) if isinstance(filters, str) else filters
+
+	if isinstance(filters, dict):
+		return {
+			fieldname: value
+			for fieldname, value in filters.items()
+			if isinstance(value, str | int) and value != ""
+		}
+
+	values = {}
+	for f in filters or []:
+		if not isinstance(f, list | tuple) or len(f) < 3:
+			continue
+		fieldname, operator, value = f[-3:]
+		if operator in ("=", "equals") and isinstance(value, str | int) and value != "":
+			values[fieldname] = value
+
+	return values
+
+
+def get_versions(room, weeks):
+	"""Version of every week: its own token combined with the room's schedule token"""
+	keys = [_schedule_version_key(room)] + [_version_key(room, week) for week in weeks]
+	schedule_version, *week_versions = (
+		(version.decode() if version else "0") for version in frappe.cache.mget(keys)
+	)
+	return [f"{version}.{schedule_version}" for version in week_versions]
+
+
+def get_filter_hash(conditions):
+	return hashlib.md5((conditions or "").encode()).hexdigest()
+
+
+def get_cached_week(room, week, filter_hash, version):
+	return frappe.cache.get_value(_events_key(room, week, filter_hash, version))
+
+
+def set_cached_week(room, week, filter_hash, version, events_by_date):
+	frappe.cache.set_value(
+		_events_key(room, week, filter_hash, version),
+		events_by_date,
+		expires_in_sec=EVENTS_CACHE_TTL,
+	)
+
+
+def invalidate(room, dates):
+	"""Replace the version token of every week touched by `dates` in `room`"""
+	weeks = {get_week_start(date) for date in dates if date}
+	if not weeks:
+		return
+
+	token = frappe.generate_hash(length=12)
+	pipeline = frappe.cache.pipeline()
+	for week in weeks:
+		for bucket in {room or ALL_ROOMS, ALL_ROOMS}:
+			pipeline.set(_version_key(bucket, week), token)
+	pipeline.execute()
+
+
+def invalidate_schedules(room):
+	"""Replace the schedule token of `room`, invalidating all of its weeks at once"""
+	token = frappe.generate_hash(length=12)
+	pipeline = frappe.cache.pipeline()
+	for bucket in {room or ALL_ROOMS, ALL_ROOMS}:
+		pipeline.set(_schedule_version_key(bucket), token)
+	pipeline.execute()
+
+
+def _schedule_version_key(room):
+	return frappe.cache.make_key(f"daycare:room_activity:schedule_version:{room}")
+
+
+def _version_key(room, week):
+	return frappe.cache.make_key(f"daycare:room_activity:version:{room}:{week}")
+
+
+def _events_key(room, week, filter_hash, version):
+	return f"daycare:room_activity:events:{room}:{week}:{filter_hash}:{version}"
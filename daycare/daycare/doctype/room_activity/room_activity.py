@@ -1,8 +1,33 @@
 # Copyright (c) 2025, Daycare and contributors
 # For license information, please see license.txt
 
+from datetime import timedelta
+
 import frappe
 from frappe.model.document import Document
+from frappe.utils import getdate
+
+from daycare.daycare.doctype.room.room_status import publish_activity, publish_activity_removed
+from daycare.daycare.doctype.room_activity import calendar_cache
+
+ACTIVITY_COLORS = {
+    "Learning Activity": "#4CAF50",  # Green
+    "Outdoor Play": "#8BC34A",       # Light Green
+    "Indoor Play": "#CDDC39",        # Lime
+    "Nap Time": "#9C27B0",           # Purple
+    "Meal - Breakfast": "#FF9800",   # Orange
+    "Meal - Lunch": "#FF5722",       # Deep Orange
+    "Meal - Snack": "#FFC107",       # Amber
+    "Circle Time": "#2196F3",        # Blue
+    "Art & Crafts": "#E91E63",       # Pink
+    "Music & Movement": "#00BCD4",   # Cyan
+    "Story Time": "#3F51B5",         # Indigo
+    "Free Play": "#009688",          # Teal
+    "Special Event": "#F44336",      # Red
+    "Field Trip": "#795548",         # Brown
+    "Parent Visit": "#607D8B",       # Blue Grey
+    "Other": "#9E9E9E",              # Grey
+}
 
 
 class RoomActivity(Document):
@@ -10,6 +35,29 @@ class RoomActivity(Document):
         self.validate_times()
         self.set_title_if_empty()
         self.set_color_by_activity()
+        self.set_schedule_date()
+
+    def on_update(self):
+        self.invalidate_calendar_cache()
+        publish_activity(self)
+
+    def on_trash(self):
+        self.invalidate_calendar_cache()
+        publish_activity_removed(self)
+
+    def invalidate_calendar_cache(self):
+        """Drop the cached calendar weeks this activity appears in, once committed."""
+        touched = [(self.room, self.date), (self.room, self.schedule_date)]
+        doc_before_save = self.get_doc_before_save()
+        if doc_before_save:
+            touched.append((doc_before_save.room, doc_before_save.date))
+            touched.append((doc_before_save.room, doc_before_save.schedule_date))
+
+        def invalidate():
+            for room, date in set(touched):
+                calendar_cache.invalidate(room, [date])
+
+        frappe.db.after_commit.add(invalidate)
 
     def validate_times(self):
         """Ensure end time is after start time."""
@@ -25,36 +73,85 @@ class RoomActivity(Document):
     def set_color_by_activity(self):
         """Set default calendar color based on activity type."""
         if not self.color:
-            color_map = {
-                "Learning Activity": "#4CAF50",  # Green
-                "Outdoor Play": "#8BC34A",       # Light Green
-                "Indoor Play": "#CDDC39",        # Lime
-                "Nap Time": "#9C27B0",           # Purple
-                "Meal - Breakfast": "#FF9800",   # Orange
-                "Meal - Lunch": "#FF5722",       # Deep Orange
-                "Meal - Snack": "#FFC107",       # Amber
-                "Circle Time": "#2196F3",        # Blue
-                "Art & Crafts": "#E91E63",       # Pink
-                "Music & Movement": "#00BCD4",   # Cyan
-                "Story Time": "#3F51B5",         # Indigo
-                "Free Play": "#009688",          # Teal
-                "Special Event": "#F44336",      # Red
-                "Field Trip": "#795548",         # Brown
-                "Parent Visit": "#607D8B",       # Blue Grey
-                "Other": "#9E9E9E",              # Grey
-            }
-            self.color = color_map.get(self.activity_type, "#9E9E9E")
+            self.color = ACTIVITY_COLORS.get(self.activity_type, "#9E9E9E")
+
+    def set_schedule_date(self):
+        """An override replaces the occurrence on its own date unless told otherwise."""
+        if self.schedule and not self.schedule_date:
+            self.schedule_date = self.date
 
 
 @frappe.whitelist()
 def get_events(start, end, filters=None):
-    """Get Room Activity events for calendar view."""
+    """Get Room Activity events for calendar view.
+
+    Weeks are served from the calendar cache; only the weeks whose version
+    changed are read from the database.
+    """
     from frappe.desk.calendar import get_event_conditions
 
     conditions = get_event_conditions("Room Activity", filters)
+    room = calendar_cache.get_room_filter(filters)
+    filter_hash = calendar_cache.get_filter_hash(conditions)
+    weeks = calendar_cache.get_week_starts(start, end)
+    versions = calendar_cache.get_versions(room, weeks)
+
+    events_by_week = {}
+    missing = []
+    for week, version in zip(weeks, versions, strict=True):
+        cached = calendar_cache.get_cached_week(room, week, filter_hash, version)
+        if cached is None:
+            missing.append((week, version))
+        else:
+            events_by_week[week] = cached
+
+    if missing:
+        fetched = get_events_by_date(
+            missing[0][0], missing[-1][0] + timedelta(days=6), conditions, filters
+        )
+        for week, version in missing:
+            week_dates = {week + timedelta(days=i) for i in range(7)}
+            week_events = {date: fetched[date] for date in week_dates if date in fetched}
+            calendar_cache.set_cached_week(room, week, filter_hash, version, week_events)
+            events_by_week[week] = week_events
+
+    start, end = getdate(start), getdate(end)
+    return [
+        event
+        for week in weeks
+        for date, day_events in sorted(events_by_week[week].items())
+        if start <= date <= end
+        for event in day_events
+    ]
+
+
+def get_events_by_date(start, end, conditions="", filters=None):
+    """Stored events and expanded schedule occurrences between start and end, by date."""
+    from daycare.daycare.doctype.room_activity_schedule.room_activity_schedule import (
+        expand_schedules,
+    )
 
-    events = frappe.db.sql(
-        """
+    query, values = get_events_query(start, end, conditions)
+    events_by_date = {}
+
+    for event in frappe.db.sql(query, values, as_dict=True):
+        date = getdate(event.start)
+        # Combine date and time for proper calendar display
+        if not event.all_day and event.start_time:
+            event["start"] = f"{event['start']} {event['start_time']}"
+        if not event.all_day and event.end_time:
+            event["end"] = f"{event['end']} {event['end_time']}"
+        events_by_date.setdefault(date, []).append(event)
+
+    occurrences = expand_schedules(start, end, calendar_cache.get_equality_filters(filters))
+    for date, day_events in occurrences.items():
+        events_by_date.setdefault(date, []).extend(day_events)
+
+    return events_by_date
+
+
+def get_events_query(start, end, conditions=""):
+    query = """
         SELECT
             name,
             title,
@@ -71,16 +168,6 @@ def get_events(start, end, filters=None):
         FROM `tabRoom Activity`
         WHERE date BETWEEN %(start)s AND %(end)s
         {conditions}
-        """.format(conditions=conditions),
-        {"start": start, "end": end},
-        as_dict=True,
-    )
-
-    # Combine date and time for proper calendar display
-    for event in events:
-        if not event.all_day and event.start_time:
-            event["start"] = f"{event['start']} {event['start_time']}"
-        if not event.all_day and event.end_time:
-            event["end"] = f"{event['end']} {event['end_time']}"
+        """.format(conditions=conditions)
 
-    return events
+    return query, {"start": start, "end": end}
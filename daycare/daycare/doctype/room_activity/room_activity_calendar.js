@@ -28,5 +28,26 @@ frappe.views.calendar["Room Activity"] = {
             label: __("Status")
         }
     ],
+    options: {
+        eventClick: function(info) {
+            const props = info.event.extendedProps || {};
+            if (!props.is_recurring) {
+                frappe.set_route("Form", "Room Activity", info.event.id);
+                return;
+            }
+
+            // Occurrences of a recurring schedule are not stored until edited
+            frappe.confirm(
+                __("Edit only this occurrence? Choose No to open the recurring schedule."),
+                () => {
+                    frappe.call({
+                        method: "daycare.daycare.doctype.room_activity_schedule.room_activity_schedule.make_override",
+                        args: { schedule: props.schedule, date: props.schedule_date }
+                    }).then(r => frappe.set_route("Form", "Room Activity", r.message));
+                },
+                () => frappe.set_route("Form", "Room Activity Schedule", props.schedule)
+            );
+        }
+    },
     get_events_method: "daycare.daycare.doctype.room_activity.room_activity.get_events"
 };
@@ -0,0 +1,194 @@
+# Copyright (c) 2025, Daycare and contributors
+# For license information, please see license.txt
+
+from datetime import timedelta
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import getdate
+
+from daycare.daycare.doctype.room_activity import calendar_cache
+from daycare.daycare.doctype.room_activity.room_activity import ACTIVITY_COLORS
+
+# Check fields of the weekly pattern, indexed like date.weekday()
+WEEKDAY_FIELDS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Calendar filters that apply to a schedule as well as to its occurrences
+SCHEDULE_FILTER_FIELDS = ("room", "activity_type", "assigned_staff", "title", "color")
+
+
+class RoomActivitySchedule(Document):
+	def validate(self):
+		self.validate_times()
+		self.validate_dates()
+		self.validate_weekdays()
+		self.set_title_if_empty()
+		self.set_color_by_activity()
+
+	def on_update(self):
+		self.invalidate_calendar_cache()
+
+	def on_trash(self):
+		self.invalidate_calendar_cache()
+
+	def invalidate_calendar_cache(self):
+		"""Drop every cached calendar week of the room(s) this schedule belongs to"""
+		rooms = {self.room}
+		doc_before_save = self.get_doc_before_save()
+		if doc_before_save:
+			rooms.add(doc_before_save.room)
+
+		def invalidate():
+			for room in rooms:
+				calendar_cache.invalidate_schedules(room)
+
+		frappe.db.after_commit.add(invalidate)
+
+	def validate_times(self):
+		"""Ensure end time is after start time"""
+		if self.start_time and self.end_time and self.end_time <= self.start_time:
+			frappe.throw(_("End Time must be after Start Time"))
+
+	def validate_dates(self):
+		"""Ensure the schedule does not end before it starts"""
+		if self.valid_to and getdate(self.valid_to) < getdate(self.valid_from):
+			frappe.throw(_("Valid To cannot be before Valid From"))
+
+	def validate_weekdays(self):
+		"""Require at least one weekday in the pattern"""
+		if not any(self.get(fieldname) for fieldname in WEEKDAY_FIELDS):
+			frappe.throw(_("Select at least one weekday to repeat on"))
+
+	def set_title_if_empty(self):
+		"""Auto-generate title if not provided"""
+		if not self.title:
+			self.title = f"{self.activity_type} - {self.room}"
+
+	def set_color_by_activity(self):
+		"""Set default calendar color based on activity type"""
+		if not self.color:
+			self.color = ACTIVITY_COLORS.get(self.activity_type, "#9E9E9E")
+
+
+def expand_schedules(start, end, filters=None):
+	"""Occurrences of the active schedules between start and end, grouped by date.
+
+	Exception dates and occurrences already replaced by a stored Room Activity
+	(an override) are skipped. `filters` is a {fieldname: value} dict from the
+	calendar; occurrences are always "Scheduled".
+	"""
+	start, end = getdate(start), getdate(end)
+	filters = filters or {}
+	if filters.get("status") not in (None, "Scheduled"):
+		return {}
+
+	schedule_filters = [["status", "=", "Active"], ["valid_from", "<=", end]]
+	schedule_filters += [[f, "=", filters[f]] for f in SCHEDULE_FILTER_FIELDS if filters.get(f)]
+	schedules = frappe.get_list(
+		"Room Activity Schedule",
+		filters=schedule_filters,
+		or_filters=[["valid_to", "is", "not set"], ["valid_to", ">=", start]],
+		fields=[
+			"name",
+			"room",
+			"title",
+			"activity_type",
+			"color",
+			"assigned_staff",
+			"start_time",
+			"end_time",
+			"valid_from",
+			"valid_to",
+			*WEEKDAY_FIELDS,
+		],
+	)
+	if not schedules:
+		return {}
+
+	names = [schedule.name for schedule in schedules]
+	skipped = {
+		(row.parent, getdate(row.date))
+		for row in frappe.get_all(
+			"Room Activity Schedule Exception",
+			filters={
+				"parent": ("in", names),
+				"parenttype": "Room Activity Schedule",
+				"date": ("between", [start, end]),
+			},
+			fields=["parent", "date"],
+		)
+	}
+	skipped.update(
+		(row.schedule, getdate(row.schedule_date))
+		for row in frappe.get_all(
+			"Room Activity",
+			filters={"schedule": ("in", names), "schedule_date": ("between", [start, end])},
+			fields=["schedule", "schedule_date"],
+		)
+	)
+
+	occurrences = {}
+	for schedule in schedules:
+		weekdays = {i for i, fieldname in enumerate(WEEKDAY_FIELDS) if schedule.get(fieldname)}
+		date = max(start, getdate(schedule.valid_from))
+		last = min(end, getdate(schedule.valid_to)) if schedule.valid_to else end
+
+		while date <= last:
+			if date.weekday() in weekdays and (schedule.name, date) not in skipped:
+				occurrences.setdefault(date, []).append(get_occurrence(schedule, date))
+			date += timedelta(days=1)
+
+	return occurrences
+
+
+def get_occurrence(schedule, date):
+	"""Calendar event for one occurrence of a schedule"""
+	return frappe._dict(
+		name=f"{schedule.name}:{date}",
+		title=schedule.title,
+		start=f"{date} {schedule.start_time}",
+		end=f"{date} {schedule.end_time}",
+		room=schedule.room,
+		activity_type=schedule.activity_type,
+		status="Scheduled",
+		color=schedule.color,
+		all_day=0,
+		start_time=schedule.start_time,
+		end_time=schedule.end_time,
+		assigned_staff=schedule.assigned_staff,
+		schedule=schedule.name,
+		schedule_date=date,
+		is_recurring=1,
+	)
+
+
+@frappe.whitelist()
+def make_override(schedule, date):
+	"""Store one occurrence of a schedule as a Room Activity so it can be edited"""
+	date = getdate(date)
+	existing = frappe.db.get_value("Room Activity", {"schedule": schedule, "schedule_date": date})
+	if existing:
+		return existing
+
+	source = frappe.get_doc("Room Activity Schedule", schedule)
+	doc = frappe.get_doc(
+		{
+			"doctype": "Room Activity",
+			"room": source.room,
+			"activity_type": source.activity_type,
+			"title": source.title,
+			"color": source.color,
+			"date": date,
+			"start_time": source.start_time,
+			"end_time": source.end_time,
+			"assigned_staff": source.assigned_staff,
+			"description": source.description,
+			"status": "Scheduled",
+			"all_day": 0,
+			"schedule": source.name,
+			"schedule_date": date,
+		}
+	)
+	doc.insert()
+	return doc.name
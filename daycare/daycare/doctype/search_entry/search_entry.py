@@ -0,0 +1,460 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Front-desk search over children, their guardians and staff.
+
+Every Child, each of its guardians and every Employee has a Search Entry that
+points at the document to open (a guardian's entry opens the child). An entry
+holds its prefix tokens (name words, phone digits and emails) and the trigrams
+of its name and phone, in two indexed child tables. A query is answered from the
+token index with one range scan per word, falling back to trigram similarity
+for misspelt or partial input, so it never scans the documents themselves.
+
+Entries are rewritten in the saving transaction by the Child and Employee doc
+events; rebuild_search_index rebuilds them all.
+"""
+
+import re
+import unicodedata
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.utils import cint, create_batch, now
+
+SEARCH_DOCTYPES = ("Child", "Employee")
+REBUILD_BATCH_SIZE = 1000
+
+# Candidates read from the index before permissions and ranking
+CANDIDATE_LIMIT = 200
+# Shorter query words match whole tokens, and tokens of a prefix read before ranking
+MIN_PREFIX_LENGTH = 3
+PREFIX_SCAN_LIMIT = 2000
+# Share of the query's trigrams an entry must have to be a fuzzy match
+TRIGRAM_THRESHOLD = 0.5
+MIN_TRIGRAM_QUERY = 3
+# Trailing phone digits indexed as tokens, so numbers match with or without a prefix
+PHONE_SUFFIXES = (10, 7, 4)
+MAX_TOKEN_LENGTH = 140
+
+PHONE_QUERY = re.compile(r"^[\d\s()+./-]+$")
+
+
+class SearchEntry(Document):
+	# Maintained by index_documents / rebuild_search_index - not edited by hand
+	pass
+
+
+@frappe.whitelist()
+def search(txt, doctypes=None, limit=10):
+	"""Typeahead: [{result_doctype, result_name, title, description}] best first"""
+	doctypes = frappe.parse_json(doctypes) if isinstance(doctypes, str) else doctypes
+	doctypes = [
+		doctype
+		for doctype in doctypes or SEARCH_DOCTYPES
+		if doctype in SEARCH_DOCTYPES and frappe.has_permission(doctype, "read")
+	]
+	if not doctypes:
+		return []
+
+	entries = find_entries(txt, doctypes)
+	permitted = get_permitted_names(entries)
+	return [
+		{key: entry[key] for key in ("result_doctype", "result_name", "title", "description")}
+		for entry in entries
+		if entry.result_name in permitted.get(entry.result_doctype, ())
+	][: cint(limit)]
+
+
+def find_entries(txt, doctypes, limit=CANDIDATE_LIMIT):
+	"""Best matching entries: prefix matches, closest titles first, then trigram matches"""
+	words = get_query_words(txt)
+	if not words:
+		return []
+
+	query = " ".join(words)
+	entries = get_entries(find_by_prefix(words, doctypes, limit))
+	entries.sort(key=lambda entry: get_rank(normalize(entry.title).strip(), query))
+
+	if len(entries) < limit and len(query) >= MIN_TRIGRAM_QUERY:
+		found = {entry.name for entry in entries}
+		entries += [
+			entry for entry in get_entries(find_by_trigram(query, doctypes, limit)) if entry.name not in found
+		]
+
+	return entries[:limit]
+
+
+def get_rank(title, query):
+	"""Exact titles, then titles starting with the query, then shorter titles"""
+	return (title != query, not title.startswith(query), len(title), title)
+
+
+def find_by_prefix(words, doctypes, limit):
+	"""Entries with a token starting with every word"""
+	return frappe.db.sql_list(*get_prefix_query(words, doctypes, limit))
+
+
+def get_prefix_query(words, doctypes, limit):
+	"""(query, values) of find_by_prefix; the longest word drives the scan.
+
+	Words shorter than MIN_PREFIX_LENGTH match whole tokens only, and at most
+	PREFIX_SCAN_LIMIT tokens of the driving range are read, in index order (a
+	token equal to the word comes first). The candidates are then ranked like
+	get_rank before the limit, so that on a common prefix an exact or leading
+	title match is not cut before it is scored.
+	"""
+	query = " ".join(words)
+	words = sorted(words, key=len, reverse=True)
+	values = {
+		"doctypes": doctypes,
+		"limit": limit,
+		"scan_limit": PREFIX_SCAN_LIMIT,
+		"query": query,
+		"query_prefix": escape_like(query) + "%",
+	}
+	operators = []
+	for i, word in enumerate(words):
+		values[f"word_{i}"] = word if len(word) < MIN_PREFIX_LENGTH else escape_like(word) + "%"
+		operators.append("=" if len(word) < MIN_PREFIX_LENGTH else "LIKE")
+
+	exists = [
+		f"""AND EXISTS (
+			SELECT 1 FROM `tabSearch Entry Token` t{i}
+			WHERE t{i}.parent = t.parent AND t{i}.token {operator} %(word_{i})s
+		)"""
+		for i, operator in enumerate(operators[1:], 1)
+	]
+
+	return (
+		f"""
+		SELECT t.parent
+		FROM (
+			SELECT parent
+			FROM `tabSearch Entry Token`
+			WHERE token {operators[0]} %(word_0)s
+			ORDER BY token
+			LIMIT %(scan_limit)s
+		) t
+		INNER JOIN `tabSearch Entry` e ON e.name = t.parent
+		WHERE e.result_doctype IN %(doctypes)s
+			{" ".join(exists)}
+		GROUP BY t.parent
+		ORDER BY MAX(e.title = %(query)s) DESC, MAX(e.title LIKE %(query_prefix)s) DESC, MIN(LENGTH(e.title))
+		LIMIT %(limit)s
+		""",
+		values,
+	)
+
+
+def find_by_trigram(query, doctypes, limit):
+	"""Entries sharing at least TRIGRAM_THRESHOLD of the query's trigrams, most shared first"""
+	trigrams = get_trigrams(query)
+	if not trigrams:
+		return []
+
+	return frappe.db.sql_list(
+		"""
+		SELECT t.parent
+		FROM `tabSearch Entry Trigram` t
+		INNER JOIN `tabSearch Entry` e ON e.name = t.parent
+		WHERE t.trigram IN %(trigrams)s AND e.result_doctype IN %(doctypes)s
+		GROUP BY t.parent
+		HAVING COUNT(*) >= %(min_count)s
+		ORDER BY COUNT(*) DESC
+		LIMIT %(limit)s
+		""",
+		{
+			"trigrams": list(trigrams),
+			"doctypes": doctypes,
+			"min_count": max(1, round(len(trigrams) * TRIGRAM_THRESHOLD)),
+			"limit": limit,
+		},
+	)
+
+
+def get_entries(names):
+	"""Entries in the order of `names`"""
+	if not names:
+		return []
+
+	entries = {
+		entry.name: entry
+		for entry in frappe.get_all(
+			"Search Entry",
+			filters={"name": ("in", names)},
+			fields=["name", "result_doctype", "result_name", "title", "description"],
+		)
+	}
+	return [entries[name] for name in names if name in entries]
+
+
+def get_permitted_names(entries):
+	"""{doctype: names} of the entries' results the user may read"""
+	by_doctype = {}
+	for entry in entries:
+		by_doctype.setdefault(entry.result_doctype, set()).add(entry.result_name)
+
+	return {
+		doctype: set(frappe.get_list(doctype, filters={"name": ("in", list(names))}, pluck="name"))
+		for doctype, names in by_doctype.items()
+	}
+
+
+@frappe.whitelist()
+@frappe.validate_and_sanitize_search_inputs
+def link_query(doctype, txt, searchfield, start, page_len, filters):
+	"""standard_queries for Child and Employee Link fields, served from the search index"""
+	fields = ["name", "full_name", get_description_field(doctype)]
+	if not get_query_words(txt):
+		return frappe.get_list(
+			doctype,
+			filters=filters,
+			fields=fields,
+			order_by="full_name",
+			limit_start=start,
+			limit_page_length=page_len,
+			as_list=True,
+		)
+
+	names = list(dict.fromkeys(entry.result_name for entry in find_entries(txt, [doctype])))
+	if not names:
+		return []
+
+	rows = {
+		row[0]: row
+		for row in frappe.get_list(
+			doctype,
+			filters=[*get_filter_list(doctype, filters), [doctype, "name", "in", names]],
+			fields=fields,
+			limit_page_length=0,
+			as_list=True,
+		)
+	}
+	return [rows[name] for name in names if name in rows][cint(start) : cint(start) + cint(page_len)]
+
+
+def get_filter_list(doctype, filters):
+	"""Link query filters (a dict or a list) as a list of [doctype, field, operator, value]"""
+	if not filters:
+		return []
+	if not isinstance(filters, dict):
+		return list(filters)
+
+	return [
+		[doctype, fieldname, *value] if isinstance(value, list | tuple) else [doctype, fieldname, "=", value]
+		for fieldname, value in filters.items()
+	]
+
+
+def get_description_field(doctype):
+	return "group" if doctype == "Child" else "role"
+
+
+def on_update(doc, method=None):
+	"""doc_events handler: rewrite the entries of a saved Child or Employee"""
+	index_documents(doc.doctype, [doc.name])
+
+
+def on_trash(doc, method=None):
+	remove_entries(doc.doctype, [doc.name])
+
+
+def index_documents(doctype, names):
+	"""Rewrite the search entries of the given Child or Employee documents"""
+	if not names:
+		return
+
+	remove_entries(doctype, names)
+	entries = get_child_entries(names) if doctype == "Child" else get_employee_entries(names)
+	write_entries(entries)
+
+
+def rebuild_search_index(commit=True):
+	"""Rebuild every search entry in batches:
+
+	bench --site <site> execute daycare.daycare.doctype.search_entry.search_entry.rebuild_search_index
+	"""
+	for doctype in SEARCH_DOCTYPES:
+		for names in create_batch(frappe.get_all(doctype, pluck="name", order_by="name"), REBUILD_BATCH_SIZE):
+			index_documents(doctype, names)
+			if commit:
+				frappe.db.commit()
+
+
+def remove_entries(doctype, names):
+	entries = frappe.get_all(
+		"Search Entry",
+		filters={"result_doctype": doctype, "result_name": ("in", names)},
+		pluck="name",
+	)
+	if not entries:
+		return
+
+	for table in ("Search Entry Token", "Search Entry Trigram"):
+		frappe.db.sql(f"DELETE FROM `tab{table}` WHERE parent IN %(entries)s", {"entries": entries})
+	frappe.db.sql("DELETE FROM `tabSearch Entry` WHERE name IN %(entries)s", {"entries": entries})
+
+
+def get_child_entries(names):
+	"""An entry per child, and one per guardian that opens the child"""
+	children = frappe.get_all(
+		"Child",
+		filters={"name": ("in", names)},
+		fields=["name", "full_name", "enrollment_status", "group"],
+	)
+	guardians = frappe.get_all(
+		"Child Guardian",
+		filters={"parent": ("in", names), "parenttype": "Child"},
+		fields=["parent", "guardian_name", "relationship", "phone", "email"],
+	)
+	child_names = {child.name: child.full_name for child in children}
+
+	entries = [
+		make_entry(
+			"Child",
+			child.name,
+			child.full_name,
+			", ".join(filter(None, [child.enrollment_status, child.group])),
+		)
+		for child in children
+	]
+	entries += [
+		make_entry(
+			"Child",
+			guardian.parent,
+			guardian.guardian_name,
+			_("{0} of {1}").format(guardian.relationship or _("Guardian"), child_names.get(guardian.parent)),
+			phones=[guardian.phone],
+			emails=[guardian.email],
+		)
+		for guardian in guardians
+		if guardian.parent in child_names
+	]
+	return entries
+
+
+def get_employee_entries(names):
+	return [
+		make_entry(
+			"Employee",
+			employee.name,
+			employee.full_name,
+			", ".join(filter(None, [employee.role, employee.status])),
+			phones=[employee.phone],
+			emails=[employee.email],
+		)
+		for employee in frappe.get_all(
+			"Employee",
+			filters={"name": ("in", names)},
+			fields=["name", "full_name", "role", "status", "phone", "email"],
+		)
+	]
+
+
+def make_entry(result_doctype, result_name, title, description, phones=(), emails=()):
+	"""Entry with its prefix tokens and trigrams"""
+	words = normalize(title).split()
+	phones = [digits for digits in (get_digits(phone) for phone in phones) if digits]
+	emails = [email.strip().lower() for email in emails if email and email.strip()]
+
+	tokens = set(words)
+	for digits in phones:
+		tokens.update(digits[-length:] for length in (len(digits), *PHONE_SUFFIXES))
+	for email in emails:
+		tokens.add(email)
+		tokens.update(normalize(email.split("@")[0]).split())
+
+	return frappe._dict(
+		name=frappe.generate_hash(length=10),
+		result_doctype=result_doctype,
+		result_name=result_name,
+		title=title,
+		description=description,
+		tokens=sorted(token[:MAX_TOKEN_LENGTH] for token in tokens if token),
+		trigrams=sorted(get_trigrams(" ".join(words + phones))),
+	)
+
+
+def write_entries(entries):
+	"""Bulk insert entries and their index rows"""
+	if not entries:
+		return
+
+	timestamp, user = now(), frappe.session.user
+	audit = (timestamp, timestamp, user, user)
+	frappe.db.bulk_insert(
+		"Search Entry",
+		[
+			"name",
+			"result_doctype",
+			"result_name",
+			"title",
+			"description",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+		],
+		[(e.name, e.result_doctype, e.result_name, e.title, e.description, *audit) for e in entries],
+	)
+
+	for table, parentfield in (("Search Entry Token", "tokens"), ("Search Entry Trigram", "trigrams")):
+		fieldname = "token" if parentfield == "tokens" else "trigram"
+		frappe.db.bulk_insert(
+			table,
+			[
+				"name",
+				"parent",
+				"parenttype",
+				"parentfield",
+				"idx",
+				fieldname,
+				"creation",
+				"modified",
+				"owner",
+				"modified_by",
+			],
+			[
+				(frappe.generate_hash(length=10), e.name, "Search Entry", parentfield, idx, value, *audit)
+				for e in entries
+				for idx, value in enumerate(e[parentfield], 1)
+			],
+		)
+
+
+def get_query_words(txt):
+	"""Words of a query; a phone number is one word of digits and an email stays whole"""
+	txt = (txt or "").strip()
+	if not txt:
+		return []
+	if "@" in txt:
+		return [txt.lower()]
+	if PHONE_QUERY.match(txt):
+		return [get_digits(txt)]
+	return normalize(txt).split()
+
+
+def get_trigrams(text):
+	"""Trigrams of each word, padded so that word starts and ends count"""
+	trigrams = set()
+	for word in text.split():
+		padded = f"  {word} "
+		trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+	return trigrams
+
+
+def normalize(text):
+	"""Lowercase words without accents or punctuation"""
+	text = unicodedata.normalize("NFKD", text or "")
+	text = "".join(char for char in text if not unicodedata.combining(char)).lower()
+	return re.sub(r"[^\w]+", " ", text)
+
+
+def get_digits(text):
+	return re.sub(r"\D", "", text or "")
+
+
+def escape_like(value):
+	return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
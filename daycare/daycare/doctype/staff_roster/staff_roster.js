@@ -0,0 +1,46 @@
+// Copyright (c) 2025, Daycare and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on("Staff Roster", {
+    refresh: function(frm) {
+        if (frm.is_new() || frm.doc.status !== "Draft") {
+            return;
+        }
+
+        frm.add_custom_button(__("Solve Roster"), function() {
+            frm.call({
+                doc: frm.doc,
+                method: "solve",
+                freeze: true,
+                freeze_message: __("Solving roster..."),
+            }).then(() => frm.reload_doc());
+        }, __("Actions"));
+
+        frm.add_custom_button(__("Mark Absent"), function() {
+            frappe.prompt([
+                {
+                    fieldname: "employee",
+                    fieldtype: "Link",
+                    options: "Employee",
+                    label: __("Employee"),
+                    reqd: 1,
+                },
+                {
+                    fieldname: "date",
+                    fieldtype: "Date",
+                    label: __("Date"),
+                    default: frappe.datetime.get_today(),
+                    reqd: 1,
+                },
+            ], function(values) {
+                frm.call({
+                    doc: frm.doc,
+                    method: "reassign_absence",
+                    args: values,
+                    freeze: true,
+                    freeze_message: __("Re-solving roster..."),
+                }).then(() => frm.reload_doc());
+            }, __("Mark Absent"), __("Re-solve"));
+        }, __("Actions"));
+    }
+});
@@ -0,0 +1,53 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+
+from daycare.daycare.doctype.room_activity import calendar_cache
+
+
+class StaffRoster(Document):
+	def validate(self):
+		self.week_start = calendar_cache.get_week_start(self.week_start)
+
+	@frappe.whitelist()
+	def solve(self):
+		"""Replace the assignments with a freshly solved roster for the week"""
+		from daycare.daycare.planning.rostering import RosterSolver
+
+		solver = RosterSolver(self.week_start)
+		self.set_solution(solver, solver.solve())
+		self.save()
+
+	@frappe.whitelist()
+	def reassign_absence(self, employee, date):
+		"""Take `employee` off the roster on `date` and cover their gaps, keeping everyone else in place"""
+		from daycare.daycare.planning.rostering import OPEN_DAYS, RosterSolver
+
+		solver = RosterSolver(self.week_start)
+		assignment = solver.load(self.assignments)
+		day = solver.mark_absent(employee, date)
+		if not 0 <= day < OPEN_DAYS:
+			frappe.throw(_("{0} is not an open day of this roster's week").format(date))
+
+		self.set_solution(solver, solver.solve(assignment, days=[day]))
+		self.add_comment("Info", _("Re-solved for the absence of {0} on {1}").format(employee, date))
+		self.save()
+
+	def set_solution(self, solver, result):
+		self.update(solver.get_stats(result))
+		self.set("assignments", [])
+		for row in solver.get_rows(result):
+			self.append("assignments", row)
+
+
+@frappe.whitelist()
+def make_staff_roster(week_start):
+	"""Create and solve a draft roster for the week containing week_start"""
+	doc = frappe.new_doc("Staff Roster")
+	doc.week_start = week_start
+	doc.insert()
+	doc.solve()
+	return doc.name
@@ -0,0 +1,2 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
@@ -0,0 +1,90 @@
+// Copyright (c) 2025, Daycare and contributors
+// For license information, please see license.txt
+
+frappe.pages["room-status-board"].on_page_load = function(wrapper) {
+    const page = frappe.ui.make_app_page({
+        parent: wrapper,
+        title: __("Room Status Board"),
+        single_column: true,
+    });
+
+    wrapper.board = new RoomStatusBoard(page);
+};
+
+frappe.pages["room-status-board"].on_page_show = function(wrapper) {
+    wrapper.board && wrapper.board.load();
+};
+
+class RoomStatusBoard {
+    constructor(page) {
+        this.page = page;
+        this.rooms = {};
+        this.$body = $('<div class="room-status-board row"></div>').appendTo(page.main);
+        this.page.set_secondary_action(__("Reload"), () => this.load(), "refresh");
+
+        // Deltas only touch the card of their room
+        frappe.realtime.on(daycare.room_status.EVENT, (data) => {
+            const status = this.rooms[data.room];
+            if (!status) {
+                return;
+            }
+
+            daycare.room_status.apply(status, data);
+            this.render_room(status);
+        });
+
+        // The activity in progress moves on with the clock, not with a delta
+        setInterval(() => Object.values(this.rooms).forEach((status) => this.render_room(status)), 60000);
+    }
+
+    load() {
+        return daycare.room_status.load().then((rooms) => {
+            // Deltas are published to the subscribers of each Room
+            Object.keys(this.rooms).forEach((name) => frappe.realtime.doc_unsubscribe("Room", name));
+            this.rooms = {};
+            this.$body.empty();
+            if (!rooms.length) {
+                this.$body.html(`<div class="col-12 text-muted">${__("No active rooms")}</div>`);
+                return;
+            }
+
+            rooms.forEach((status) => {
+                this.rooms[status.name] = status;
+                frappe.realtime.doc_subscribe("Room", status.name);
+                status.$card = $('<div class="col-sm-6 col-lg-4 mb-4"></div>').appendTo(this.$body);
+                this.render_room(status);
+            });
+        });
+    }
+
+    render_room(status) {
+        const activity = daycare.room_status.get_current_activity(status);
+        const full = status.capacity && status.current_occupancy >= status.capacity;
+        const staff = (status.staff || [])
+            .map((row) => frappe.utils.escape_html(row.employee_name || row.employee))
+            .join(", ");
+
+        status.$card.html(`
+            <div class="frappe-card p-3 h-100">
+                <div class="d-flex justify-content-between align-items-center mb-2">
+                    <a class="h5 mb-0" href="/app/room/${encodeURIComponent(status.name)}">
+                        ${frappe.utils.escape_html(status.room_name || status.name)}
+                    </a>
+                    <span class="indicator-pill ${full ? "red" : "green"}">
+                        ${status.current_occupancy || 0} / ${status.capacity || 0}
+                    </span>
+                </div>
+                <div class="mb-1">${__("Checked in")}: <b>${status.headcount || 0}</b></div>
+                <div class="mb-1">
+                    ${__("Now")}:
+                    ${activity
+                        ? `<span class="indicator-pill" style="background-color: ${activity.color || "var(--bg-gray)"}; color: #fff">
+                            ${frappe.utils.escape_html(activity.title || activity.activity_type)}
+                        </span>`
+                        : `<span class="text-muted">${__("No activity in progress")}</span>`}
+                </div>
+                <div class="text-muted small">${__("Staff")}: ${staff || __("None assigned")}</div>
+            </div>
+        `);
+    }
+}
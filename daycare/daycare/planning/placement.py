@@ -0,0 +1,239 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Placement of children into age-banded Groups and Rooms.
+
+The eligible groups of every age in months are precomputed into a lookup table
+that is cached in Redis and rebuilt after a Group or Room is saved, so finding
+the candidates for an age is a list index. Remaining capacity changes with every
+enrolment and is read live, with one indexed count over the candidate groups.
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import cint, getdate, today
+
+from daycare.daycare.doctype.guardian.pickup import invalidate_pickup_map
+from daycare.daycare.doctype.room.room import OCCUPYING_STATUS, adjust_occupancy
+from daycare.daycare.report.report_cache import invalidate_report_cache
+
+PLACEMENT_INDEX_KEY = "daycare:placement_index"
+
+
+def get_placement_index():
+	"""{"groups": [group info], "by_age": [[group position, ...] for each age in months]}"""
+	return frappe.cache.get_value(PLACEMENT_INDEX_KEY, generator=build_placement_index)
+
+
+def invalidate_placement_index():
+	"""Drop the cached index once the current transaction is committed"""
+	frappe.db.after_commit.add(lambda: frappe.cache.delete_value(PLACEMENT_INDEX_KEY))
+
+
+def build_placement_index():
+	"""Active groups whose own and room's age ranges ([min, max) months) hold each age"""
+	groups = frappe.db.sql(
+		"""
+		SELECT g.name, g.group_name, g.room, g.max_children,
+			g.age_range_min_months as min_age, g.age_range_max_months as max_age,
+			r.capacity as room_capacity,
+			r.age_range_min_months as room_min_age, r.age_range_max_months as room_max_age
+		FROM `tabGroup` g
+		LEFT JOIN `tabRoom` r ON r.name = g.room
+		WHERE g.status = 'Active' AND (g.room IS NULL OR g.room = '' OR r.status = 'Active')
+		ORDER BY g.age_range_min_months, g.name
+		""",
+		as_dict=True,
+	)
+
+	by_age = [[] for _age in range(max((g.max_age for g in groups), default=0))]
+	for i, group in enumerate(groups):
+		min_age, max_age = group.min_age, group.max_age
+		if group.room:
+			min_age, max_age = max(min_age, group.room_min_age), min(max_age, group.room_max_age)
+		for age in range(max(0, min_age), max_age):
+			by_age[age].append(i)
+
+	return {"groups": groups, "by_age": by_age}
+
+
+def get_age_months(date_of_birth, on_date=None):
+	"""Whole months between date_of_birth and on_date (default: today)"""
+	dob, on_date = getdate(date_of_birth), getdate(on_date or today())
+	months = (on_date.year - dob.year) * 12 + (on_date.month - dob.month)
+	if on_date.day < dob.day:
+		months -= 1
+	return max(0, months)
+
+
+@frappe.whitelist()
+def suggest_groups(date_of_birth=None, age_months=None, on_date=None, limit=5):
+	"""Eligible groups with remaining capacity for a child of the given age or date of birth"""
+	frappe.has_permission("Group", "read", throw=True)
+	if date_of_birth:
+		age_months = get_age_months(date_of_birth, on_date)
+	elif age_months is None:
+		frappe.throw(_("Date of Birth or Age is required"))
+
+	index = get_placement_index()
+	candidates = get_candidates(index, cint(age_months))
+	capacity = Capacity(index, candidates)
+	return [
+		{**index["groups"][i], "remaining_capacity": capacity.get_places(i)}
+		for i in sorted(candidates, key=lambda i: -capacity.get_places(i))
+		if capacity.get_places(i) > 0
+	][: cint(limit)]
+
+
+@frappe.whitelist()
+def suggest_groups_for(doctype, name, limit=5):
+	"""suggest_groups for a Child, or for a Child Intake Request at its preferred start date"""
+	if doctype == "Child":
+		date_of_birth, on_date = frappe.db.get_value("Child", name, "date_of_birth"), None
+	elif doctype == "Child Intake Request":
+		date_of_birth, on_date = frappe.db.get_value(
+			doctype, name, ["child_date_of_birth", "preferred_start_date"]
+		)
+	else:
+		frappe.throw(_("Placement suggestions are only available for Child and Child Intake Request"))
+
+	frappe.has_permission(doctype, "read", name, throw=True)
+	if not date_of_birth:
+		frappe.throw(_("{0} {1} has no date of birth").format(_(doctype), name))
+
+	return suggest_groups(date_of_birth=date_of_birth, on_date=on_date, limit=limit)
+
+
+def get_candidates(index, age_months):
+	by_age = index["by_age"]
+	return by_age[age_months] if 0 <= age_months < len(by_age) else []
+
+
+class Capacity:
+	"""Places left in the candidate groups and their rooms, read with two queries.
+
+	Groups sharing a room share its places, so taking a place updates both.
+	"""
+
+	def __init__(self, index, candidates):
+		self.groups = index["groups"]
+		self.group_places = {}
+		self.room_places = {}
+		if not candidates:
+			return
+
+		names = [self.groups[i].name for i in candidates]
+		rooms = list({self.groups[i].room for i in candidates if self.groups[i].room})
+		enrolled = dict(
+			frappe.db.sql(
+				"""
+				SELECT `group`, COUNT(*) FROM `tabChild`
+				WHERE `group` IN %(groups)s AND enrollment_status = %(status)s
+				GROUP BY `group`
+				""",
+				{"groups": names, "status": OCCUPYING_STATUS},
+			)
+		)
+		for i in candidates:
+			self.group_places[i] = self.groups[i].max_children - enrolled.get(self.groups[i].name, 0)
+
+		if rooms:
+			for room, capacity, occupancy in frappe.get_all(
+				"Room",
+				filters={"name": ("in", rooms)},
+				fields=["name", "capacity", "current_occupancy"],
+				as_list=True,
+			):
+				self.room_places[room] = capacity - occupancy
+
+	def get_places(self, i):
+		places = self.group_places.get(i, 0)
+		room = self.groups[i].room
+		if room:
+			places = min(places, self.room_places.get(room, 0))
+		return max(0, places)
+
+	def take(self, i):
+		self.group_places[i] -= 1
+		if self.groups[i].room:
+			self.room_places[self.groups[i].room] -= 1
+
+
+@frappe.whitelist()
+def place_children(children, on_date=None, apply=True):
+	"""Place a list of children into the eligible group with the most places left.
+
+	Children are placed in the given order and every placement uses up a place, so a
+	whole intake can be placed in one call: one query for the children, two for the
+	capacity of all candidate groups and one update per group. Meant for children
+	not placed yet; returns {child: group or None}.
+	"""
+	frappe.has_permission("Child", "write", throw=True)
+	children = frappe.parse_json(children) if isinstance(children, str) else children
+	if not children:
+		return {}
+
+	index = get_placement_index()
+	rows = frappe.get_all(
+		"Child",
+		filters={"name": ("in", children)},
+		fields=["name", "date_of_birth", "enrollment_status", "room"],
+	)
+	ages = {row.name: get_age_months(row.date_of_birth, on_date) for row in rows if row.date_of_birth}
+	candidates = {i for age in set(ages.values()) for i in get_candidates(index, age)}
+	capacity = Capacity(index, list(candidates))
+
+	placements = {}
+	for child in children:
+		if child not in ages:
+			placements[child] = None
+			continue
+
+		eligible = [i for i in get_candidates(index, ages[child]) if capacity.get_places(i) > 0]
+		if not eligible:
+			placements[child] = None
+			continue
+
+		best = max(eligible, key=capacity.get_places)
+		capacity.take(best)
+		placements[child] = best
+
+	if cint(apply):
+		apply_placements(index, rows, placements)
+
+	return {child: index["groups"][i].name if i is not None else None for child, i in placements.items()}
+
+
+def apply_placements(index, rows, placements):
+	"""Write group and room of the placed children and move their room occupancy"""
+	groups = index["groups"]
+	by_group = {}
+	for child, i in placements.items():
+		if i is not None:
+			by_group.setdefault(i, []).append(child)
+
+	for i, names in by_group.items():
+		frappe.db.sql(
+			"""
+			UPDATE `tabChild`
+			SET `group` = %(group)s, room = %(room)s, modified = NOW(), modified_by = %(user)s
+			WHERE name IN %(names)s
+			""",
+			{"group": groups[i].name, "room": groups[i].room, "user": frappe.session.user, "names": names},
+		)
+
+	delta = {}
+	for row in rows:
+		i = placements.get(row.name)
+		if i is None or row.enrollment_status != OCCUPYING_STATUS or row.room == groups[i].room:
+			continue
+		delta[row.room] = delta.get(row.room, 0) - 1
+		delta[groups[i].room] = delta.get(groups[i].room, 0) + 1
+
+	for room, change in delta.items():
+		adjust_occupancy(room, change)
+
+	if by_group:
+		invalidate_report_cache(["Child"])
+		invalidate_pickup_map()
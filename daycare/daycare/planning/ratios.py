@@ -0,0 +1,325 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Staff-to-child ratio compliance per room and 15-minute slot.
+
+A week is a (room x slot) grid over the opening hours. Staff presence combines
+Employee Availability, each employee's home room (Room.assigned_staff) and the
+activities they lead (Room Activity.assigned_staff, stored or recurring), which
+take them out of their home room for the activity's duration. The staff required
+in a room follows from its enrolled children's ages and the Staffing Ratios
+GNB Rules. Once the rows are loaded everything is numpy array arithmetic, so a
+full week across all rooms is a handful of (rooms x slots) array operations.
+
+bench --site <site> execute daycare.daycare.planning.ratios.get_ratio_violations
+"""
+
+from datetime import datetime, time, timedelta
+
+import frappe
+import numpy as np
+from frappe.utils import getdate, to_timedelta, today
+
+from daycare.daycare.doctype.employee.employee import WEEKDAYS, get_availability_rows
+from daycare.daycare.doctype.room.room import OCCUPYING_STATUS
+from daycare.daycare.doctype.room_activity import calendar_cache
+
+SLOT = timedelta(minutes=15)
+OPENING_TIME = timedelta(hours=7)
+CLOSING_TIME = timedelta(hours=18)
+OPEN_DAYS = 5  # Monday to Friday
+SLOTS_PER_DAY = (CLOSING_TIME - OPENING_TIME) // SLOT
+
+
+class RatioCheck:
+	"""Staff present and required in every room and slot of a week.
+
+	`staff` is a (rooms x slots) float array (an employee assigned to several rooms
+	counts for a share of each), `required`, `children` and `unrated_children` are
+	per room, and `compliant` is a (rooms x slots) boolean array.
+	"""
+
+	def __init__(self, week_start, rooms, staff, required, children, unrated_children):
+		self.week_start = week_start
+		self.rooms = rooms
+		self.staff = staff
+		self.required = required
+		self.children = children
+		self.unrated_children = unrated_children
+		self.compliant = staff + 1e-9 >= required[:, None]
+
+	def get_slot_start(self, slot):
+		day, slot_of_day = divmod(int(slot), SLOTS_PER_DAY)
+		return (
+			datetime.combine(self.week_start + timedelta(days=day), time())
+			+ OPENING_TIME
+			+ slot_of_day * SLOT
+		)
+
+	def get_violations(self):
+		"""Consecutive violating slots of each room and day, merged into intervals"""
+		violating = (~self.compliant).reshape(len(self.rooms), OPEN_DAYS, SLOTS_PER_DAY)
+		edges = np.diff(np.pad(violating.astype(np.int8), ((0, 0), (0, 0), (1, 1))), axis=2)
+		room_idx, day_idx, starts = np.nonzero(edges == 1)
+		ends = np.nonzero(edges == -1)[2]
+
+		violations = []
+		for room, day, start, end in zip(room_idx, day_idx, starts, ends, strict=True):
+			first = day * SLOTS_PER_DAY + start
+			last = day * SLOTS_PER_DAY + end
+			violations.append(
+				frappe._dict(
+					room=self.rooms[room],
+					start=self.get_slot_start(first),
+					end=self.get_slot_start(last - 1) + SLOT,
+					staff=round(float(self.staff[room, first:last].min()), 2),
+					required=int(self.required[room]),
+					children=int(self.children[room]),
+				)
+			)
+
+		return violations
+
+	def get_summary(self):
+		"""Per room: children, staff required and compliant/violating slot counts"""
+		compliant_slots = self.compliant.sum(axis=1)
+		return [
+			frappe._dict(
+				room=room,
+				children=int(self.children[i]),
+				unrated_children=int(self.unrated_children[i]),
+				required=int(self.required[i]),
+				compliant_slots=int(compliant_slots[i]),
+				violating_slots=int(self.compliant.shape[1] - compliant_slots[i]),
+			)
+			for i, room in enumerate(self.rooms)
+		]
+
+
+@frappe.whitelist()
+def get_ratio_violations(week_start=None, room=None):
+	"""Ratio violations of the week containing week_start (default: this week)"""
+	frappe.has_permission("Room", "read", throw=True)
+	return check_ratios(week_start, [room] if room else None).get_violations()
+
+
+def check_ratios(week_start=None, rooms=None):
+	"""Build the RatioCheck of the week containing week_start for all active rooms (or `rooms`)"""
+	week_start = calendar_cache.get_week_start(week_start or today())
+	room_index = get_room_index(rooms)
+
+	required, children, unrated_children = get_required_staff(week_start, room_index)
+	staff = get_staff_present(week_start, room_index)
+	return RatioCheck(week_start, list(room_index), staff, required, children, unrated_children)
+
+
+def get_room_index(rooms=None):
+	"""{room: row} of all active rooms (or `rooms`), in name order"""
+	filters = {"status": "Active"}
+	if rooms:
+		filters["name"] = ("in", rooms)
+
+	return {
+		room: i
+		for i, room in enumerate(frappe.get_all("Room", filters=filters, pluck="name", order_by="name"))
+	}
+
+
+def get_ratio_rules():
+	"""(min age, max age, children per staff) arrays of the structured ratio rules"""
+	rules = frappe.get_all(
+		"GNB Rule",
+		filters={
+			"category": "Staffing Ratios",
+			"max_children_per_staff": (">", 0),
+			"compliance_status": ("!=", "Not Applicable"),
+		},
+		fields=["min_age_months", "max_age_months", "max_children_per_staff"],
+		order_by="min_age_months",
+	)
+	return (
+		np.array([rule.min_age_months for rule in rules], dtype=np.int64),
+		np.array([rule.max_age_months for rule in rules], dtype=np.int64),
+		np.array([rule.max_children_per_staff for rule in rules], dtype=np.float64),
+	)
+
+
+def get_required_staff(week_start, room_index):
+	"""Staff required, children and children without a matching rule, per room.
+
+	Children are counted by room and age at the start of the week. Each age takes
+	the strictest matching ratio, and mixed-age rooms need the rounded-up sum of
+	each age band's share (e.g. 2 infants at 1:3 and 5 toddlers at 1:5 need 2).
+	"""
+	counts = [
+		row
+		for row in frappe.db.sql(
+			"""
+			SELECT room, GREATEST(0, TIMESTAMPDIFF(MONTH, date_of_birth, %(date)s)) as age,
+				COUNT(*) as children
+			FROM `tabChild`
+			WHERE enrollment_status = %(status)s AND room IS NOT NULL AND date_of_birth IS NOT NULL
+			GROUP BY room, age
+			""",
+			{"date": week_start, "status": OCCUPYING_STATUS},
+			as_dict=True,
+		)
+		if row.room in room_index
+	]
+
+	room_count = len(room_index)
+	room = np.array([room_index[row.room] for row in counts], dtype=np.int64)
+	age = np.array([row.age for row in counts], dtype=np.int64)
+	count = np.array([row.children for row in counts], dtype=np.float64)
+
+	min_age, max_age, ratio = get_ratio_rules()
+	matches = (age[:, None] >= min_age[None, :]) & (age[:, None] < max_age[None, :])
+	child_ratio = np.where(matches, ratio[None, :], np.inf).min(axis=1, initial=np.inf)
+	rated = np.isfinite(child_ratio)
+
+	load = np.zeros(room_count)
+	np.add.at(load, room[rated], count[rated] / child_ratio[rated])
+	unrated = np.zeros(room_count)
+	np.add.at(unrated, room[~rated], count[~rated])
+
+	required = np.ceil(load - 1e-9).astype(np.int64)
+	children = np.bincount(room, weights=count, minlength=room_count)
+	return required, children, unrated
+
+
+def get_staff_present(week_start, room_index):
+	"""(rooms x slots) staff present, from home rooms, activities and availability"""
+	room_count, slot_count = len(room_index), OPEN_DAYS * SLOTS_PER_DAY
+	staff = np.zeros((room_count, slot_count))
+
+	home = [
+		row
+		for row in frappe.db.sql(
+			"""
+			SELECT parent as room, employee FROM `tabRoom Staff`
+			WHERE parenttype = 'Room' AND employee IS NOT NULL
+			""",
+			as_dict=True,
+		)
+		if row.room in room_index
+	]
+	activities = [row for row in get_staff_activities(week_start) if row.room in room_index]
+
+	employees = sorted({row.employee for row in home} | {row.assigned_staff for row in activities})
+	if not employees:
+		return staff
+
+	employee_index = {employee: i for i, employee in enumerate(employees)}
+	present = get_presence(week_start, employee_index)
+
+	# Room each employee leads an activity in, per slot (-1: none)
+	activity_room = np.full((len(employees), slot_count), -1, dtype=np.int64)
+	if activities:
+		starts, ends = get_slot_ranges(
+			[(getdate(row.date) - week_start).days for row in activities],
+			[row.start_time for row in activities],
+			[row.end_time for row in activities],
+		)
+		lengths = ends - starts
+		slots = np.repeat(starts, lengths) + (
+			np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+		)
+		activity_employee = np.array([employee_index[row.assigned_staff] for row in activities])
+		activity_rooms = np.array([room_index[row.room] for row in activities])
+		activity_room[np.repeat(activity_employee, lengths), slots] = np.repeat(activity_rooms, lengths)
+
+	away = (activity_room >= 0) & present
+	employee_idx, slot_idx = np.nonzero(away)
+	np.add.at(staff, (activity_room[employee_idx, slot_idx], slot_idx), 1)
+
+	if home:
+		home_room = np.array([room_index[row.room] for row in home])
+		home_employee = np.array([employee_index[row.employee] for row in home])
+		share = 1 / np.bincount(home_employee, minlength=len(employees))[home_employee]
+		at_home = present & ~away
+		np.add.at(staff, home_room, at_home[home_employee] * share[:, None])
+
+	return staff
+
+
+def get_staff_activities(week_start):
+	"""Stored and recurring activities of the week that have a staff member assigned"""
+	from daycare.daycare.doctype.room_activity_schedule.room_activity_schedule import (
+		expand_schedules,
+	)
+
+	week_end = week_start + timedelta(days=OPEN_DAYS - 1)
+	activities = frappe.db.sql(
+		"""
+		SELECT room, assigned_staff, date, start_time, end_time
+		FROM `tabRoom Activity`
+		WHERE date BETWEEN %(start)s AND %(end)s
+			AND assigned_staff IS NOT NULL AND all_day = 0 AND status != 'Cancelled'
+			AND start_time IS NOT NULL AND end_time IS NOT NULL
+		""",
+		{"start": week_start, "end": week_end},
+		as_dict=True,
+	)
+	for date, occurrences in expand_schedules(week_start, week_end).items():
+		activities.extend(
+			frappe._dict(
+				room=occurrence.room,
+				assigned_staff=occurrence.assigned_staff,
+				date=date,
+				start_time=occurrence.start_time,
+				end_time=occurrence.end_time,
+			)
+			for occurrence in occurrences
+			if occurrence.assigned_staff
+		)
+
+	return activities
+
+
+def get_presence(week_start, employee_index):
+	"""(employees x slots) availability of the given employees over the open days"""
+	days, employees, start_times, end_times = [], [], [], []
+	for row in get_availability_rows(list(employee_index)):
+		day = WEEKDAYS.index(row.weekday)
+		if day >= OPEN_DAYS:
+			continue
+
+		date = week_start + timedelta(days=day)
+		if row.effective_from and not (
+			getdate(row.effective_from) <= date <= getdate(row.effective_to or date)
+		):
+			continue
+
+		days.append(day)
+		employees.append(employee_index[row.employee])
+		start_times.append(row.start_time)
+		end_times.append(row.end_time)
+
+	starts, ends = get_slot_ranges(days, start_times, end_times)
+	return paint_intervals(len(employee_index), np.array(employees, dtype=np.int64), starts, ends)
+
+
+def get_slot_ranges(days, start_times, end_times):
+	"""[first slot, end slot) of each (day, start, end), clipped to the opening hours.
+
+	Only whole slots count: a window from 08:10 covers slots from 08:15 on.
+	"""
+	slot_seconds = SLOT.total_seconds()
+	opening = OPENING_TIME.total_seconds()
+	start_seconds = np.array([to_timedelta(t).total_seconds() for t in start_times], dtype=np.float64)
+	end_seconds = np.array([to_timedelta(t).total_seconds() for t in end_times], dtype=np.float64)
+
+	first = np.clip(np.ceil((start_seconds - opening) / slot_seconds), 0, SLOTS_PER_DAY)
+	last = np.clip(np.floor((end_seconds - opening) / slot_seconds), 0, SLOTS_PER_DAY)
+	offset = np.array(days, dtype=np.int64) * SLOTS_PER_DAY
+	first = offset + first.astype(np.int64)
+	return first, np.maximum(first, offset + last.astype(np.int64))
+
+
+def paint_intervals(row_count, rows, starts, ends):
+	"""(rows x slots) boolean array, True inside each row's [start, end) intervals"""
+	diff = np.zeros((row_count, OPEN_DAYS * SLOTS_PER_DAY + 1), dtype=np.int32)
+	np.add.at(diff, (rows, starts), 1)
+	np.add.at(diff, (rows, ends), -1)
+	return np.cumsum(diff, axis=1)[:, :-1] > 0
@@ -0,0 +1,263 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Weekly staff rostering over the ratio engine's (room x 15-minute slot) grid.
+
+The solver walks the slots of each day in order. An employee stays in the room
+they were in during the previous slot while that room still needs them, rooms
+that are short are filled from their own assigned staff first and then from
+staff who were not working, at least one first aid certified employee is kept on
+site, and everyone else stays where they were or goes to their home room. Slots
+whose availability is unchanged reuse the previous slot's solution, so a week is
+solved in a few hundred cheap steps.
+
+Re-solving after an absence keeps every other assignment and only fills the gaps
+the absent employee leaves on that day.
+"""
+
+from collections import deque
+from datetime import timedelta
+
+import frappe
+import numpy as np
+from frappe.utils import getdate
+
+from daycare.daycare.doctype.room_activity import calendar_cache
+from daycare.daycare.planning.ratios import (
+	OPEN_DAYS,
+	OPENING_TIME,
+	SLOT,
+	SLOTS_PER_DAY,
+	get_presence,
+	get_required_staff,
+	get_room_index,
+	get_slot_ranges,
+)
+
+# Roles that count towards staff-to-child ratios
+CARE_ROLES = ("Director", "Supervisor", "Lead Educator", "Educator", "Assistant")
+
+# Qualifications of which at least one holder must be on site at all times
+ON_SITE_QUALIFICATIONS = ("First Aid & CPR",)
+
+UNASSIGNED = -1
+
+
+class RosterSolver:
+	"""Staff, rooms and constraints of one week; `solve` returns an (employees x slots)
+	array holding the room index each employee is assigned to, or UNASSIGNED.
+	"""
+
+	def __init__(self, week_start, rooms=None):
+		self.week_start = calendar_cache.get_week_start(week_start)
+		self.room_index = get_room_index(rooms)
+		self.rooms = list(self.room_index)
+		self.required = get_required_staff(self.week_start, self.room_index)[0]
+
+		self.employees = frappe.get_all(
+			"Employee",
+			filters={"status": "Active", "role": ("in", CARE_ROLES)},
+			pluck="name",
+			order_by="name",
+		)
+		self.employee_index = {employee: i for i, employee in enumerate(self.employees)}
+		if self.employees:
+			self.present = get_presence(self.week_start, self.employee_index)
+		else:
+			self.present = np.zeros((0, OPEN_DAYS * SLOTS_PER_DAY), dtype=bool)
+
+		self.qualified = self.get_qualified()
+		self.home_room = np.full(len(self.employees), UNASSIGNED, dtype=np.int64)
+		self.home_staff = {}
+		for row in frappe.get_all(
+			"Room Staff",
+			filters={"parenttype": "Room", "parent": ("in", self.rooms or [""])},
+			fields=["parent", "employee"],
+			order_by="idx",
+		):
+			employee = self.employee_index.get(row.employee)
+			if employee is None:
+				continue
+			room = self.room_index[row.parent]
+			self.home_staff.setdefault(room, []).append(employee)
+			if self.home_room[employee] == UNASSIGNED:
+				self.home_room[employee] = room
+
+	def get_qualified(self):
+		"""(employees x days) holders of a valid on-site qualification"""
+		dates = np.array(
+			[self.week_start + timedelta(days=day) for day in range(OPEN_DAYS)],
+			dtype="datetime64[D]",
+		)
+		valid_until = np.full(len(self.employees), np.datetime64("NaT"), dtype="datetime64[D]")
+		for row in frappe.db.sql(
+			"""
+			SELECT employee, MAX(IFNULL(expiry_date, '9999-12-31')) as valid_until
+			FROM `tabEmployee Qualification`
+			WHERE qualification_name IN %(qualifications)s AND status != 'Revoked'
+			GROUP BY employee
+			""",
+			{"qualifications": ON_SITE_QUALIFICATIONS},
+			as_dict=True,
+		):
+			if row.employee in self.employee_index:
+				valid_until[self.employee_index[row.employee]] = np.datetime64(getdate(row.valid_until), "D")
+
+		return valid_until[:, None] >= dates[None, :]
+
+	def solve(self, assignment=None, days=None):
+		"""Roster `days` (default: the whole week).
+
+		With an existing `assignment`, each slot keeps that slot's assignment where
+		possible instead of the previous slot's, so only the gaps are re-filled.
+		"""
+		result = (
+			np.full(self.present.shape, UNASSIGNED, dtype=np.int64)
+			if assignment is None
+			else assignment.copy()
+		)
+
+		for day in range(OPEN_DAYS) if days is None else days:
+			first = day * SLOTS_PER_DAY
+			for slot in range(first, first + SLOTS_PER_DAY):
+				if assignment is not None:
+					keep = assignment[:, slot]
+				elif slot == first:
+					keep = None
+				elif np.array_equal(self.present[:, slot], self.present[:, slot - 1]):
+					result[:, slot] = result[:, slot - 1]
+					continue
+				else:
+					keep = result[:, slot - 1]
+
+				result[:, slot] = self.solve_slot(slot, day, keep)
+
+		return result
+
+	def solve_slot(self, slot, day, keep):
+		available = self.present[:, slot]
+		rooms = np.full(len(self.employees), UNASSIGNED, dtype=np.int64)
+		staffed = np.zeros(len(self.rooms), dtype=np.int64)
+
+		# Stay put while the room still needs you
+		if keep is not None:
+			for employee in np.nonzero((keep >= 0) & available)[0]:
+				room = keep[employee]
+				if staffed[room] < self.required[room]:
+					rooms[employee] = room
+					staffed[room] += 1
+
+		free = set(np.nonzero(available & (rooms == UNASSIGNED))[0].tolist())
+		# Staff who were not working in the previous slot move first, then released staff
+		pool = deque(sorted(free, key=lambda e: keep is not None and keep[e] != UNASSIGNED))
+
+		def assign(employee, room):
+			rooms[employee] = room
+			staffed[room] += 1
+			free.discard(employee)
+
+		# Fill the biggest shortages first: own staff, then the pool
+		short = np.nonzero(staffed < self.required)[0]
+		for room in short[np.argsort(staffed[short] - self.required[short], kind="stable")]:
+			for employee in self.home_staff.get(room, ()):
+				if staffed[room] >= self.required[room]:
+					break
+				if employee in free:
+					assign(employee, room)
+
+			while staffed[room] < self.required[room] and pool:
+				employee = pool.popleft()
+				if employee in free:
+					assign(employee, room)
+
+		# Keep a qualified employee on site
+		if not self.qualified[rooms >= 0, day].any():
+			qualified = [e for e in free if self.qualified[e, day]]
+			if qualified:
+				employee = min(qualified)
+				room = self.home_room[employee]
+				if room == UNASSIGNED:
+					room = int(np.argmax(self.required - staffed)) if len(self.rooms) else UNASSIGNED
+				if room != UNASSIGNED:
+					assign(employee, room)
+
+		# Everyone else stays where they were, or supports their home room
+		for employee in list(free):
+			room = (
+				keep[employee]
+				if keep is not None and keep[employee] != UNASSIGNED
+				else self.home_room[employee]
+			)
+			if room != UNASSIGNED:
+				assign(employee, room)
+
+		return rooms
+
+	def get_stats(self, result):
+		"""Room moves, understaffed room slots and slots without a qualified employee on site"""
+		by_day = result.reshape(len(self.employees), OPEN_DAYS, SLOTS_PER_DAY)
+		moves = int(
+			((by_day[..., 1:] != by_day[..., :-1]) & (by_day[..., 1:] >= 0) & (by_day[..., :-1] >= 0)).sum()
+		)
+
+		staffed = np.zeros((len(self.rooms), result.shape[1]), dtype=np.int64)
+		employee_idx, slot_idx = np.nonzero(result >= 0)
+		np.add.at(staffed, (result[employee_idx, slot_idx], slot_idx), 1)
+		unfilled = int(np.maximum(self.required[:, None] - staffed, 0).astype(bool).sum())
+
+		qualified = np.repeat(self.qualified, SLOTS_PER_DAY, axis=1)
+		first_aid_gaps = int((~((result >= 0) & qualified).any(axis=0)).sum())
+
+		return frappe._dict(total_moves=moves, unfilled_slots=unfilled, first_aid_gaps=first_aid_gaps)
+
+	def get_rows(self, result):
+		"""Assignment rows: one per employee, room and uninterrupted stretch of a day"""
+		by_day = result.reshape(len(self.employees), OPEN_DAYS, SLOTS_PER_DAY)
+		starts = np.ones(by_day.shape, dtype=bool)
+		starts[..., 1:] = by_day[..., 1:] != by_day[..., :-1]
+		employee_idx, day_idx, start_idx = np.nonzero(starts)
+
+		same_day = (employee_idx[1:] == employee_idx[:-1]) & (day_idx[1:] == day_idx[:-1])
+		end_idx = np.where(np.append(same_day, False), np.append(start_idx[1:], 0), SLOTS_PER_DAY)
+		room_idx = by_day[employee_idx, day_idx, start_idx]
+
+		return [
+			frappe._dict(
+				employee=self.employees[employee],
+				room=self.rooms[room],
+				date=self.week_start + timedelta(days=int(day)),
+				start_time=OPENING_TIME + int(start) * SLOT,
+				end_time=OPENING_TIME + int(end) * SLOT,
+			)
+			for employee, day, start, end, room in zip(
+				employee_idx, day_idx, start_idx, end_idx, room_idx, strict=True
+			)
+			if room != UNASSIGNED
+		]
+
+	def load(self, rows):
+		"""(employees x slots) array of existing assignment rows"""
+		result = np.full(self.present.shape, UNASSIGNED, dtype=np.int64)
+		rows = [row for row in rows if row.employee in self.employee_index and row.room in self.room_index]
+		if not rows:
+			return result
+
+		starts, ends = get_slot_ranges(
+			[(getdate(row.date) - self.week_start).days for row in rows],
+			[row.start_time for row in rows],
+			[row.end_time for row in rows],
+		)
+		for row, start, end in zip(rows, starts, ends, strict=True):
+			result[self.employee_index[row.employee], start:end] = self.room_index[row.room]
+
+		return result
+
+	def mark_absent(self, employee, date):
+		"""Make `employee` unavailable for the whole of `date`; returns the day index"""
+		day = (getdate(date) - self.week_start).days
+		if employee in self.employee_index and 0 <= day < OPEN_DAYS:
+			self.present[self.employee_index[employee], day * SLOTS_PER_DAY : (day + 1) * SLOTS_PER_DAY] = (
+				False
+			)
+		return day
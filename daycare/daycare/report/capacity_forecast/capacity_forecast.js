@@ -0,0 +1,42 @@
+// Copyright (c) 2025, Daycare Admin and contributors
+// For license information, please see license.txt
+
+frappe.query_reports["Capacity Forecast"] = {
+	"filters": [
+		{
+			"fieldname": "from_date",
+			"label": __("From"),
+			"fieldtype": "Date",
+			"default": frappe.datetime.month_start(),
+			"reqd": 1
+		},
+		{
+			"fieldname": "months",
+			"label": __("Months"),
+			"fieldtype": "Int",
+			"default": 24,
+			"reqd": 1
+		},
+		{
+			"fieldname": "room",
+			"label": __("Room"),
+			"fieldtype": "Link",
+			"options": "Room"
+		},
+		{
+			"fieldname": "include_waitlisted",
+			"label": __("Include Waitlisted"),
+			"fieldtype": "Check",
+			"default": 1
+		}
+	],
+
+	formatter: function(value, row, column, data, default_formatter) {
+		value = default_formatter(value, row, column, data);
+		if (data && column.fieldname.startsWith("m_") && data.capacity
+			&& data[column.fieldname] > data.capacity) {
+			value = `<span style="color: var(--red-600); font-weight: bold">${value}</span>`;
+		}
+		return value;
+	}
+};
@@ -0,0 +1,259 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+import frappe
+import numpy as np
+from frappe import _
+from frappe.utils import add_months, cint, get_first_day, today
+
+from daycare.daycare.doctype.room.room import OCCUPYING_STATUS
+
+WAITLISTED_STATUS = "Waitlisted"
+DEFAULT_MONTHS = 24
+MAX_MONTHS = 60
+
+
+def execute(filters=None):
+	filters = frappe._dict(filters or {})
+	months = get_months(filters)
+	bands = get_bands(filters)
+	demand, aged_out = project_demand(get_children(filters, bands, months), bands, months)
+
+	columns = get_columns(months)
+	data = get_data(bands, months, demand, aged_out)
+	chart = get_chart(bands, months, demand)
+	return columns, data, None, chart
+
+
+def get_months(filters):
+	start = get_first_day(filters.get("from_date") or today())
+	count = min(max(cint(filters.get("months")) or DEFAULT_MONTHS, 1), MAX_MONTHS)
+	return [add_months(start, i) for i in range(count)]
+
+
+def get_columns(months):
+	columns = [
+		{
+			"fieldname": "band",
+			"label": _("Age Band"),
+			"fieldtype": "Data",
+			"width": 200,
+		},
+		{
+			"fieldname": "groups",
+			"label": _("Groups"),
+			"fieldtype": "Int",
+			"width": 80,
+		},
+		{
+			"fieldname": "capacity",
+			"label": _("Capacity"),
+			"fieldtype": "Int",
+			"width": 90,
+		},
+	]
+
+	for i, month in enumerate(months):
+		columns.append(
+			{
+				"fieldname": f"m_{i}",
+				"label": month.strftime("%b %Y"),
+				"fieldtype": "Int",
+				"width": 90,
+			}
+		)
+
+	columns += [
+		{
+			"fieldname": "peak",
+			"label": _("Peak"),
+			"fieldtype": "Int",
+			"width": 80,
+		},
+		{
+			"fieldname": "first_shortfall",
+			"label": _("First Shortfall"),
+			"fieldtype": "Data",
+			"width": 120,
+		},
+	]
+	return columns
+
+
+def get_bands(filters):
+	"""Age bands of the active groups, with the places of their groups and rooms.
+
+	A band's capacity is the lower of its groups' max_children and the capacity of
+	the rooms they use.
+	"""
+	conditions = ""
+	if filters.get("room"):
+		conditions = "AND g.room = %(room)s"
+
+	groups = frappe.db.sql(
+		f"""
+        SELECT g.group_name, g.room, g.max_children, r.capacity as room_capacity,
+            g.age_range_min_months as min_age, g.age_range_max_months as max_age
+        FROM `tabGroup` g
+        LEFT JOIN `tabRoom` r ON r.name = g.room
+        WHERE g.status = 'Active' {conditions}
+        ORDER BY g.age_range_min_months, g.age_range_max_months
+        """,
+		{"room": filters.get("room")},
+		as_dict=True,
+	)
+
+	bands = {}
+	for group in groups:
+		band = bands.setdefault(
+			(group.min_age, group.max_age),
+			frappe._dict(
+				min_age=group.min_age,
+				max_age=group.max_age,
+				group_names=[],
+				group_capacity=0,
+				rooms={},
+			),
+		)
+		band.group_names.append(group.group_name)
+		band.group_capacity += group.max_children or 0
+		if group.room:
+			band.rooms[group.room] = group.room_capacity or 0
+
+	for band in bands.values():
+		band.capacity = band.group_capacity
+		if band.rooms:
+			band.capacity = min(band.capacity, sum(band.rooms.values()))
+		band.label = _("{0}-{1} months").format(band.min_age, band.max_age)
+		if len(band.group_names) == 1:
+			band.label = f"{band.group_names[0]} ({band.label})"
+
+	return list(bands.values())
+
+
+def get_children(filters, bands, months):
+	"""(date_of_birth, enrollment_status, enrollment_date) of the children to project.
+
+	With a room filter, the room's children and the unplaced waitlisted children
+	(who have no room yet) whose age falls in the room's bands during the forecast.
+	"""
+	statuses = [OCCUPYING_STATUS]
+	if cint(filters.get("include_waitlisted")):
+		statuses.append(WAITLISTED_STATUS)
+
+	conditions = ""
+	values = {"statuses": statuses}
+	if filters.get("room"):
+		if not bands:
+			return []
+
+		conditions = """AND (room = %(room)s OR (
+            room IS NULL AND enrollment_status = %(waitlisted)s
+            AND date_of_birth > %(born_after)s AND date_of_birth <= %(born_before)s
+        ))"""
+		values.update(
+			room=filters.get("room"),
+			waitlisted=WAITLISTED_STATUS,
+			born_after=add_months(months[0], -max(band.max_age for band in bands)),
+			born_before=add_months(months[-1], -min(band.min_age for band in bands)),
+		)
+
+	return frappe.db.sql(
+		f"""
+        SELECT date_of_birth, enrollment_status, enrollment_date
+        FROM `tabChild`
+        WHERE enrollment_status IN %(statuses)s AND date_of_birth IS NOT NULL {conditions}
+        """,
+		values,
+	)
+
+
+def project_demand(children, bands, months):
+	"""(bands x months) children in each band, and children past every band, per month.
+
+	Ages are whole months at the first of each month, computed for every child and
+	month at once. Waitlisted children count from the month of their enrollment date.
+	Where band age ranges overlap, a child counts in the first band (by age range)
+	only, so the bands add up to the children in any band.
+	"""
+	month_starts = np.array(months, dtype="datetime64[M]")
+	dob = np.array([row[0] for row in children], dtype="datetime64[D]")
+	birth_month = dob.astype("datetime64[M]")
+	born_after_first = dob > birth_month.astype("datetime64[D]")
+	ages = (month_starts[None, :] - birth_month[:, None]).astype(np.int64) - born_after_first[:, None]
+
+	joins = np.array(
+		[
+			enrollment_date if status == WAITLISTED_STATUS and enrollment_date else months[0]
+			for _dob, status, enrollment_date in children
+		],
+		dtype="datetime64[M]",
+	)
+	present = month_starts[None, :] >= joins[:, None]
+
+	counted = np.zeros(ages.shape, dtype=bool)
+	demand = np.zeros((len(bands), len(months)), dtype=np.int64)
+	for i, band in enumerate(bands):
+		in_band = (ages >= band.min_age) & (ages < band.max_age) & present & ~counted
+		demand[i] = in_band.sum(axis=0)
+		counted |= in_band
+	oldest = max((band.max_age for band in bands), default=0)
+	aged_out = ((ages >= oldest) & present).sum(axis=0)
+	return demand, aged_out
+
+
+def get_data(bands, months, demand, aged_out):
+	data = []
+	for band, projected in zip(bands, demand, strict=True):
+		row = {
+			"band": band.label,
+			"groups": len(band.group_names),
+			"capacity": band.capacity,
+			"peak": int(projected.max(initial=0)),
+			"first_shortfall": get_first_shortfall(months, projected, band.capacity),
+		}
+		row.update({f"m_{i}": int(count) for i, count in enumerate(projected)})
+		data.append(row)
+
+	total_capacity = sum(band.capacity for band in bands)
+	total = demand.sum(axis=0)
+	data.append(
+		{
+			"band": _("Total"),
+			"groups": sum(len(band.group_names) for band in bands),
+			"capacity": total_capacity,
+			"peak": int(total.max(initial=0)),
+			"first_shortfall": get_first_shortfall(months, total, total_capacity),
+			**{f"m_{i}": int(count) for i, count in enumerate(total)},
+		}
+	)
+	data.append(
+		{
+			"band": _("Aged Out"),
+			"peak": int(aged_out.max(initial=0)),
+			**{f"m_{i}": int(count) for i, count in enumerate(aged_out)},
+		}
+	)
+	return data
+
+
+def get_first_shortfall(months, projected, capacity):
+	over = np.nonzero(projected > capacity)[0]
+	if len(over):
+		return months[over[0]].strftime("%b %Y")
+
+
+def get_chart(bands, months, demand):
+	return {
+		"data": {
+			"labels": [month.strftime("%b %Y") for month in months],
+			"datasets": [
+				{"name": _("Projected Children"), "values": demand.sum(axis=0).tolist()},
+				{
+					"name": _("Capacity"),
+					"values": [sum(band.capacity for band in bands)] * len(months),
+				},
+			],
+		},
+		"type": "line",
+	}
@@ -8,19 +8,85 @@ frappe.query_reports["Child Roster"] = {
 			"label": __("Enrollment Status"),
 			"fieldtype": "Select",
 			"options": "\nActive\nWaitlisted\nGraduated\nWithdrawn\nSuspended",
-			"default": "Active"
+			"default": "Active",
+			"on_change": () => reset_page_cursor()
 		},
 		{
 			"fieldname": "group",
 			"label": __("Group"),
 			"fieldtype": "Link",
-			"options": "Group"
+			"options": "Group",
+			"on_change": () => reset_page_cursor()
 		},
 		{
 			"fieldname": "room",
 			"label": __("Room"),
 			"fieldtype": "Link",
-			"options": "Room"
+			"options": "Room",
+			"on_change": () => reset_page_cursor()
+		},
+		{
+			"fieldname": "page_length",
+			"label": __("Page Size"),
+			"fieldtype": "Int",
+			"default": 500,
+			"on_change": () => reset_page_cursor()
+		},
+		{
+			"fieldname": "after_full_name",
+			"label": __("After Name"),
+			"fieldtype": "Data",
+			"hidden": 1
+		},
+		{
+			"fieldname": "after_name",
+			"label": __("After ID"),
+			"fieldtype": "Data",
+			"hidden": 1
 		}
-	]
+	],
+
+	onload: function(report) {
+		report.page.add_inner_button(__("Next Page"), function() {
+			const data = report.data || [];
+			const page_length = report.get_filter_value("page_length");
+			if (!page_length || data.length < page_length) {
+				frappe.show_alert(__("This is the last page"));
+				return;
+			}
+
+			const last = data[data.length - 1];
+			report.set_filter_value({
+				after_full_name: last.full_name,
+				after_name: last.name
+			});
+		}, __("Pages"));
+
+		report.page.add_inner_button(__("First Page"), function() {
+			reset_page_cursor();
+		}, __("Pages"));
+
+		["CSV", "Excel"].forEach(function(file_format) {
+			report.page.add_inner_button(__(file_format), function() {
+				const filters = Object.assign({}, report.get_values());
+				delete filters.after_full_name;
+				delete filters.after_name;
+
+				const args = $.param({
+					filters: JSON.stringify(filters),
+					file_format: file_format
+				});
+				window.open(
+					"/api/method/daycare.daycare.report.child_roster.child_roster.export_child_roster?" + args
+				);
+			}, __("Export All"));
+		});
+	}
 };
+
+function reset_page_cursor() {
+	frappe.query_report.set_filter_value({
+		after_full_name: "",
+		after_name: ""
+	});
+}
@@ -1,11 +1,28 @@
 # Copyright (c) 2025, Daycare Admin and contributors
 # For license information, please see license.txt
 
+import csv
+import io
+import tempfile
+
 import frappe
 from frappe import _
+from frappe.utils import cint
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+from daycare.daycare.report.report_cache import get_cached_result
+
+# Rows fetched per keyset page while streaming an export
+EXPORT_BATCH_SIZE = 2000
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
 
 def execute(filters=None):
+    return get_cached_result("Child Roster", filters)
+
+
+def get_result(filters=None):
     columns = get_columns()
     data = get_data(filters)
     return columns, data
@@ -78,6 +95,23 @@ def get_columns():
 
 
 def get_data(filters):
+    filters = frappe._dict(filters or {})
+    query, values = get_query(
+        filters,
+        after=(filters.get("after_full_name"), filters.get("after_name")),
+        page_length=cint(filters.get("page_length")),
+    )
+    return frappe.db.sql(query, values, as_dict=True)
+
+
+def get_query(filters, after=None, page_length=0):
+    """Build the roster query.
+
+    The primary guardian is resolved with a single join on `tabChild Guardian`
+    (validate_guardians guarantees one primary row per child). When `page_length`
+    is set, rows are paged by keyset on (full_name, name), starting after the
+    `after` cursor.
+    """
     conditions = []
     values = {}
 
@@ -87,17 +121,29 @@ def get_data(filters):
             values["enrollment_status"] = filters.get("enrollment_status")
 
         if filters.get("group"):
-            conditions.append("c.group = %(group)s")
+            conditions.append("c.`group` = %(group)s")
             values["group"] = filters.get("group")
 
         if filters.get("room"):
             conditions.append("g.room = %(room)s")
             values["room"] = filters.get("room")
 
+    if after and after[1]:
+        conditions.append(
+            "(c.full_name > %(after_full_name)s"
+            " OR (c.full_name = %(after_full_name)s AND c.name > %(after_name)s))"
+        )
+        values["after_full_name"] = after[0] or ""
+        values["after_name"] = after[1]
+
     where_clause = " AND ".join(conditions) if conditions else "1=1"
 
-    data = frappe.db.sql(
-        f"""
+    limit_clause = ""
+    if page_length:
+        limit_clause = "LIMIT %(page_length)s"
+        values["page_length"] = page_length
+
+    query = f"""
         SELECT
             c.name,
             c.full_name,
@@ -106,19 +152,87 @@ def get_data(filters):
             c.enrollment_date,
             g.group_name,
             r.room_name,
-            (SELECT cg.guardian_name FROM `tabChild Guardian` cg
-             WHERE cg.parent = c.name AND cg.is_primary = 1 LIMIT 1) as primary_guardian,
-            (SELECT cg.phone FROM `tabChild Guardian` cg
-             WHERE cg.parent = c.name AND cg.is_primary = 1 LIMIT 1) as guardian_phone,
+            cg.guardian_name as primary_guardian,
+            cg.phone as guardian_phone,
             CASE WHEN c.allergies IS NOT NULL AND c.allergies != '' THEN 'Yes' ELSE 'No' END as has_allergies
         FROM `tabChild` c
-        LEFT JOIN `tabGroup` g ON c.group = g.name
+        LEFT JOIN `tabGroup` g ON c.`group` = g.name
         LEFT JOIN `tabRoom` r ON g.room = r.name
+        LEFT JOIN `tabChild Guardian` cg
+            ON cg.parent = c.name
+            AND cg.parenttype = 'Child'
+            AND cg.parentfield = 'child_guardians'
+            AND cg.is_primary = 1
         WHERE {where_clause}
-        ORDER BY c.full_name
-        """,
-        values,
-        as_dict=True,
+        ORDER BY c.full_name, c.name
+        {limit_clause}
+        """
+
+    return query, values
+
+
+def iter_rows(filters, batch_size=EXPORT_BATCH_SIZE):
+    """Yield roster rows batch by batch, following the keyset cursor."""
+    after = None
+    while True:
+        query, values = get_query(filters, after=after, page_length=batch_size)
+        rows = frappe.db.sql(query, values, as_dict=True)
+        yield from rows
+
+        if len(rows) < batch_size:
+            break
+
+        after = (rows[-1].full_name, rows[-1].name)
+
+
+@frappe.whitelist()
+def export_child_roster(filters=None, file_format="CSV"):
+    """Stream the full roster as CSV or Excel without holding it in memory."""
+    report = frappe.get_doc("Report", "Child Roster")
+    if not report.is_permitted():
+        frappe.throw(_("You don't have access to Report: {0}").format(_(report.name)), frappe.PermissionError)
+
+    filters = frappe._dict(frappe.parse_json(filters) or {})
+    filters.pop("page_length", None)
+    columns = get_columns()
+    rows = (
+        [row.get(col["fieldname"]) for col in columns]
+        for row in iter_rows(filters)
+    )
+
+    if file_format == "Excel":
+        file, mimetype, extension = _write_xlsx(columns, rows), XLSX_MIMETYPE, "xlsx"
+    else:
+        file, mimetype, extension = _write_csv(columns, rows), "text/csv", "csv"
+
+    file.seek(0)
+    return Response(
+        wrap_file(frappe.local.request.environ, file),
+        mimetype=mimetype,
+        direct_passthrough=True,
+        headers={"Content-Disposition": f'attachment; filename="child_roster.{extension}"'},
     )
 
-    return data
+
+def _write_csv(columns, rows):
+    file = tempfile.TemporaryFile(mode="w+b")
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="", write_through=True)
+    writer = csv.writer(text)
+    writer.writerow([col["label"] for col in columns])
+    writer.writerows(rows)
+    text.detach()
+    return file
+
+
+def _write_xlsx(columns, rows):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(_("Child Roster"))
+    sheet.append([col["label"] for col in columns])
+    for row in rows:
+        sheet.append(row)
+
+    file = tempfile.TemporaryFile(mode="w+b")
+    workbook.save(file)
+    return file
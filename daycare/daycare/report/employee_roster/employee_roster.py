@@ -4,8 +4,14 @@
 import frappe
 from frappe import _
 
+from daycare.daycare.report.report_cache import get_cached_result
+
 
 def execute(filters=None):
+    return get_cached_result("Employee Roster", filters)
+
+
+def get_result(filters=None):
     columns = get_columns()
     data = get_data(filters)
     return columns, data
@@ -68,10 +74,27 @@ def get_columns():
             "fieldtype": "Int",
             "width": 100,
         },
+        {
+            "fieldname": "expired_qualifications",
+            "label": _("Expired"),
+            "fieldtype": "Int",
+            "width": 80,
+        },
+        {
+            "fieldname": "next_expiry_date",
+            "label": _("Next Expiry"),
+            "fieldtype": "Date",
+            "width": 100,
+        },
     ]
 
 
 def get_data(filters):
+    query, values = get_query(filters)
+    return frappe.db.sql(query, values, as_dict=True)
+
+
+def get_query(filters):
     conditions = []
     values = {}
 
@@ -86,8 +109,7 @@ def get_data(filters):
 
     where_clause = " AND ".join(conditions) if conditions else "1=1"
 
-    data = frappe.db.sql(
-        f"""
+    query = f"""
         SELECT
             e.name,
             e.full_name,
@@ -96,18 +118,14 @@ def get_data(filters):
             e.email,
             e.phone,
             e.hire_date,
-            (SELECT COUNT(*) FROM `tabEmployee Qualification` eq WHERE eq.employee = e.name) as qualification_count,
-            (SELECT COUNT(*) FROM `tabEmployee Qualification` eq
-             WHERE eq.employee = e.name
-             AND eq.expiry_date IS NOT NULL
-             AND eq.expiry_date <= DATE_ADD(CURDATE(), INTERVAL 30 DAY)
-             AND eq.expiry_date >= CURDATE()) as expiring_qualifications
+            IFNULL(qs.total_qualifications, 0) as qualification_count,
+            IFNULL(qs.expiring_qualifications, 0) as expiring_qualifications,
+            IFNULL(qs.expired_qualifications, 0) as expired_qualifications,
+            qs.next_expiry_date
         FROM `tabEmployee` e
+        LEFT JOIN `tabEmployee Qualification Summary` qs ON qs.name = e.name
         WHERE {where_clause}
         ORDER BY e.full_name
-        """,
-        values,
-        as_dict=True,
-    )
+        """
 
-    return data
+    return query, values
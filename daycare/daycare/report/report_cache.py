@@ -0,0 +1,110 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Result cache for the roster reports.
+
+Results are cached in Redis by report, filters and language, under a version
+token per report. Saving or deleting a document of a doctype the report reads
+replaces the token once the transaction is committed, so cached results are
+never served stale and simply expire. The bulk paths that write with SQL
+(age recomputation, placements, qualification refreshes) invalidate explicitly.
+
+After every invalidation the report's PREPARED_FILTERS (the workspace views and
+the unpaged full rosters) are recomputed by a background job, so opening them
+is a cache hit.
+"""
+
+import hashlib
+import json
+
+import frappe
+
+RESULT_TTL = 24 * 60 * 60
+
+REPORTS = {
+	"Child Roster": {
+		"method": "daycare.daycare.report.child_roster.child_roster.get_result",
+		# Child Guardian rows are only written through Child, whose events cover them
+		"depends_on": ("Child", "Child Guardian", "Group", "Room"),
+		"prepared_filters": (
+			{"enrollment_status": "Active", "page_length": 500},
+			{"enrollment_status": "Active"},
+			{"enrollment_status": "Waitlisted", "page_length": 500},
+		),
+	},
+	"Employee Roster": {
+		"method": "daycare.daycare.report.employee_roster.employee_roster.get_result",
+		"depends_on": ("Employee", "Employee Qualification", "Employee Qualification Summary"),
+		"prepared_filters": (
+			{"status": "Active"},
+			{},
+		),
+	},
+}
+
+
+def get_cached_result(report, filters):
+	"""The report's (columns, data) for `filters`, computed on a miss"""
+	filters = normalize_filters(filters)
+	key = get_result_key(report, get_version(report), filters)
+	result = frappe.cache.get_value(key)
+	if result is None:
+		result = frappe.get_attr(REPORTS[report]["method"])(frappe._dict(filters))
+		frappe.cache.set_value(key, result, expires_in_sec=RESULT_TTL)
+
+	return result
+
+
+def invalidate_report_cache(doctypes):
+	"""Drop the results of the reports reading any of `doctypes` once committed"""
+	reports = get_dependent_reports(doctypes)
+	if reports:
+		frappe.db.after_commit.add(lambda: bump_versions(reports))
+
+
+def on_change(doc, method=None):
+	"""doc_events handler for the doctypes the reports read"""
+	invalidate_report_cache([doc.doctype])
+
+
+def bump_versions(reports):
+	"""Replace the version token of `reports` and queue their prepared results"""
+	for report in reports:
+		frappe.cache.set_value(get_version_key(report), frappe.generate_hash(length=12))
+		frappe.enqueue(
+			prepare_report,
+			queue="long",
+			job_id=f"daycare:prepare_report:{report}",
+			deduplicate=True,
+			report=report,
+		)
+
+
+def prepare_report(report):
+	"""Compute the prepared filter combinations of a report into the cache"""
+	for filters in REPORTS[report]["prepared_filters"]:
+		get_cached_result(report, filters)
+
+
+def get_dependent_reports(doctypes):
+	doctypes = set(doctypes)
+	return [report for report, config in REPORTS.items() if doctypes & set(config["depends_on"])]
+
+
+def normalize_filters(filters):
+	"""Filters without empty values, so "" and a missing filter share a result"""
+	return {key: value for key, value in (filters or {}).items() if value not in (None, "", [])}
+
+
+def get_version(report):
+	return frappe.cache.get_value(get_version_key(report)) or "0"
+
+
+def get_version_key(report):
+	return f"daycare:report_version:{report}"
+
+
+def get_result_key(report, version, filters):
+	filter_hash = hashlib.md5(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+	return f"daycare:report_result:{report}:{version}:{frappe.local.lang}:{filter_hash}"
@@ -0,0 +1,386 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Microbenchmarks for the Daycare hot paths.
+
+Each benchmark is timed on a synthetic dataset at several sizes (number of
+children; rooms and staff scale with it) and reports the median time and the SQL
+query count of one run. Results are compared against a baseline file so a slower
+path or an extra query per call shows up in review:
+
+bench --site <site> execute daycare.daycare.setup.benchmark.run \\
+	--kwargs "{'sizes': [1000, 10000, 60000]}"
+
+Pass save_baseline=True to record the current results as the new baseline. Data is
+generated with the bulk loader and kept, so use a throwaway developer-mode site.
+"""
+
+import json
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from unittest.mock import patch
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, getdate, today
+
+from daycare.daycare.doctype.room_activity import calendar_cache
+from daycare.daycare.setup.synthetic import AGE_BANDS, generate_dataset
+
+DEFAULT_SIZES = (1000, 10000)
+DEFAULT_REPEAT = 5
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+
+# A median this much slower than the baseline is reported as a regression
+TIME_TOLERANCE = 0.25
+
+# Children per room and per employee of the generated dataset
+CHILDREN_PER_ROOM = 30
+CHILDREN_PER_EMPLOYEE = 12
+
+# Redis key prefix of the attendance benchmark, kept apart from the real day's keys
+BENCH_ATTENDANCE_KEY_PREFIX = "daycare:benchmark:attendance"
+
+
+def run(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT, only=None, save_baseline=False):
+	"""Run every benchmark (or those named in `only`) at each size.
+
+	Returns {size: {benchmark: {"ms": median, "min_ms": fastest, "queries": count}}}
+	and prints a table with the baseline comparison.
+	"""
+	if not frappe.conf.developer_mode:
+		frappe.throw(_("Benchmarks can only be run in developer mode"))
+
+	results = {}
+	for size in sorted(int(size) for size in sizes):
+		ensure_dataset(size)
+		results[str(size)] = {
+			name: measure(*as_benchmark(setup(size)), repeat=repeat)
+			for name, setup in BENCHMARKS.items()
+			if not only or name in only
+		}
+
+	baseline = load_baseline()
+	print_report(results, baseline)
+
+	if save_baseline:
+		with open(BASELINE_PATH, "w") as f:
+			json.dump(results, f, indent=1, sort_keys=True)
+			f.write("\n")
+
+	return results
+
+
+def ensure_dataset(size):
+	"""Top the site up to `size` children, with rooms and staff in proportion"""
+	children = size - frappe.db.count("Child")
+	if children <= 0:
+		return
+
+	rooms = max(len(AGE_BANDS), size // CHILDREN_PER_ROOM - frappe.db.count("Room"))
+	employees = max(2, size // CHILDREN_PER_EMPLOYEE - frappe.db.count("Employee"))
+	generate_dataset(
+		centres=max(1, rooms // 40),
+		rooms=rooms,
+		children=children,
+		employees=employees,
+		seed=size,
+	)
+
+
+def as_benchmark(result):
+	"""(fn, cleanup) of what a benchmark setup returned: fn alone or (fn, cleanup)"""
+	return result if isinstance(result, tuple) else (result, None)
+
+
+def measure(fn, cleanup=None, repeat=DEFAULT_REPEAT):
+	"""Median and fastest wall time of `repeat` runs after one warm-up run, and the most queries of a run"""
+	try:
+		fn()
+		timings = []
+		query_counts = []
+		for _i in range(repeat):
+			with count_queries() as queries:
+				start = time.perf_counter()
+				fn()
+				timings.append((time.perf_counter() - start) * 1000)
+			query_counts.append(queries["count"])
+	finally:
+		if cleanup:
+			cleanup()
+
+	return {
+		"ms": round(statistics.median(timings), 3),
+		"min_ms": round(min(timings), 3),
+		"queries": max(query_counts),
+	}
+
+
+@contextmanager
+def count_queries():
+	"""Count the frappe.db.sql calls made inside the block"""
+	counter = {"count": 0}
+	sql = frappe.db.sql
+
+	def counting_sql(*args, **kwargs):
+		counter["count"] += 1
+		return sql(*args, **kwargs)
+
+	frappe.db.sql = counting_sql
+	try:
+		yield counter
+	finally:
+		del frappe.db.sql
+
+
+def load_baseline():
+	if not os.path.exists(BASELINE_PATH):
+		return {}
+
+	with open(BASELINE_PATH) as f:
+		return json.load(f)
+
+
+def print_report(results, baseline):
+	print(f"{'size':>7}  {'benchmark':<36} {'ms':>10} {'queries':>8}  baseline")
+	for size, benchmarks in results.items():
+		for name, result in benchmarks.items():
+			print(
+				f"{size:>7}  {name:<36} {result['ms']:>10.3f} {result['queries']:>8}  "
+				+ compare(result, baseline.get(size, {}).get(name))
+			)
+
+
+def compare(result, baseline):
+	if not baseline:
+		return "-"
+
+	regressions = []
+	if result["ms"] > baseline["ms"] * (1 + TIME_TOLERANCE):
+		regressions.append(f"time {baseline['ms']:.3f} -> {result['ms']:.3f} ms")
+	if result["queries"] > baseline["queries"]:
+		regressions.append(f"queries {baseline['queries']} -> {result['queries']}")
+
+	return "REGRESSION: " + ", ".join(regressions) if regressions else "ok"
+
+
+# Benchmarks: each takes the dataset size and returns the function to time
+
+
+def bench_child_validate(size):
+	"""Validate and prepare a new Child; its rows link an existing Guardian, so no master is created"""
+	guardian = frappe.db.get_value("Guardian", {}, "name")
+	doc = frappe.get_doc(
+		{
+			"doctype": "Child",
+			"first_name": "Bench",
+			"last_name": "Child",
+			"date_of_birth": add_days(today(), -500),
+			"enrollment_status": "Active",
+			"child_guardians": [
+				{
+					"guardian": guardian,
+					"guardian_name": "Bench Parent",
+					"relationship": "Mother",
+					"is_primary": 1,
+				},
+				{
+					"guardian": guardian,
+					"guardian_name": "Bench Parent",
+					"relationship": "Father",
+					"is_primary": 0,
+				},
+			],
+		}
+	)
+
+	def fn():
+		doc.validate()
+		doc.before_save()
+
+	return fn
+
+
+def bench_employee_validate_availability(size):
+	"""One non-overlapping dated window per weekday and week: every pair is compared"""
+	rows = max(50, size // 20)
+	monday = calendar_cache.get_week_start(today())
+	weekdays = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+	doc = frappe.get_doc(
+		{
+			"doctype": "Employee",
+			"first_name": "Bench",
+			"last_name": "Employee",
+			"status": "Active",
+			"employee_availability": [
+				{
+					"weekday": weekdays[i % 5],
+					"start_time": "08:00:00",
+					"end_time": "16:00:00",
+					"effective_from": monday + timedelta(weeks=i // 5),
+					"effective_to": monday + timedelta(weeks=i // 5, days=6),
+				}
+				for i in range(rows)
+			],
+		}
+	)
+	return doc.validate_availability
+
+
+def bench_child_roster(size):
+	from daycare.daycare.report.child_roster.child_roster import get_result
+
+	return lambda: get_result({"enrollment_status": "Active"})
+
+
+def bench_child_roster_page(size):
+	from daycare.daycare.report.child_roster.child_roster import get_result
+
+	return lambda: get_result({"enrollment_status": "Active", "page_length": 500})
+
+
+def bench_child_roster_cached(size):
+	from daycare.daycare.report.child_roster.child_roster import execute
+
+	return lambda: execute({"enrollment_status": "Active", "page_length": 500})
+
+
+def bench_employee_roster(size):
+	from daycare.daycare.report.employee_roster.employee_roster import get_result
+
+	return lambda: get_result({"status": "Active"})
+
+
+def bench_get_events(days, cached):
+	from daycare.daycare.doctype.room_activity.room_activity import get_events
+
+	def setup(size):
+		start = calendar_cache.get_week_start(today())
+		end = add_days(start, days - 1)
+
+		def fn():
+			if not cached:
+				calendar_cache.invalidate_schedules(calendar_cache.ALL_ROOMS)
+			get_events(str(start), str(end))
+
+		return fn
+
+	return setup
+
+
+def bench_intake_conversion(size):
+	"""Enrol an approved intake request as a Child, rolled back after every run"""
+	from daycare.daycare.doctype.child_intake_request.enrolment import enrol_intake_requests
+
+	intake = {
+		"doctype": "Child Intake Request",
+		"child_first_name": "Bench",
+		"child_last_name": "Intake",
+		"child_date_of_birth": add_days(today(), -400),
+		"guardian_name": "Bench Guardian",
+		"guardian_relationship": "Mother",
+		"guardian_email": "bench.guardian@example.com",
+		"guardian_phone": "506-555-0100",
+		"preferred_start_date": today(),
+		"status": "Approved",
+	}
+
+	def fn():
+		frappe.db.savepoint("intake_benchmark")
+		try:
+			name = frappe.get_doc(intake).insert(ignore_permissions=True).name
+			enrol_intake_requests([name], commit=False)
+		finally:
+			frappe.db.rollback(save_point="intake_benchmark")
+
+	return fn
+
+
+def bench_attendance(size):
+	"""Check an enrolled child in and out again.
+
+	Presence, headcount and buffered rows go to throwaway keys (never flushed to
+	Attendance Log) that are deleted afterwards, and no room status is published.
+	"""
+	from daycare.daycare.doctype.attendance_log import attendance_log
+
+	child, guardian = frappe.db.sql(
+		"""
+		SELECT c.name, g.name
+		FROM `tabChild` c
+		INNER JOIN `tabChild Guardian` g ON g.parent = c.name AND g.parenttype = 'Child'
+		WHERE c.enrollment_status = 'Active' AND g.can_pickup = 1
+		LIMIT 1
+		"""
+	)[0]
+
+	today = getdate()
+	days = (today, getdate(add_days(today, -1)))
+	with patch.object(attendance_log, "KEY_PREFIX", BENCH_ATTENDANCE_KEY_PREFIX):
+		headcount_keys = [attendance_log.get_headcount_key(day) for day in days]
+		keys = [
+			attendance_log.get_buffer_key(),
+			*headcount_keys,
+			*(attendance_log.get_present_key(day) for day in days),
+		]
+
+	# Start from empty days, so they are not rebuilt (and the buffer not flushed) on the first check-in
+	pipeline = frappe.cache.pipeline()
+	for key in headcount_keys:
+		pipeline.hset(key, mapping={"": 0})
+	pipeline.execute()
+
+	def fn():
+		with (
+			patch.object(attendance_log, "KEY_PREFIX", BENCH_ATTENDANCE_KEY_PREFIX),
+			patch.object(attendance_log, "publish_room_status"),
+		):
+			attendance_log.check_in(child, guardian)
+			attendance_log.check_out(child, guardian)
+
+	def cleanup():
+		pipeline = frappe.cache.pipeline()
+		pipeline.delete(*keys)
+		pipeline.execute()
+
+	return fn, cleanup
+
+
+def bench_pickup_authorization(size):
+	"""Look up by phone what a guardian may collect; the map entry is cached after the first run"""
+	from daycare.daycare.doctype.guardian.pickup import get_pickup_authorization
+
+	phone = frappe.db.get_value("Guardian", {"phone": ("is", "set")}, "phone")
+	return lambda: get_pickup_authorization(phone=phone)
+
+
+def bench_search(txt):
+	from daycare.daycare.doctype.search_entry.search_entry import search
+
+	def setup(size):
+		return lambda: search(txt)
+
+	return setup
+
+
+BENCHMARKS = {
+	"child.validate+before_save": bench_child_validate,
+	"employee.validate_availability": bench_employee_validate_availability,
+	"child_roster.execute": bench_child_roster,
+	"child_roster.execute (page)": bench_child_roster_page,
+	"child_roster.execute (cached)": bench_child_roster_cached,
+	"employee_roster.execute": bench_employee_roster,
+	"room_activity.get_events (1 week)": bench_get_events(7, cached=False),
+	"room_activity.get_events (3 months)": bench_get_events(91, cached=False),
+	"room_activity.get_events (cached)": bench_get_events(7, cached=True),
+	"intake conversion": bench_intake_conversion,
+	"attendance check_in+check_out": bench_attendance,
+	"pickup authorization (phone)": bench_pickup_authorization,
+	"search (prefix)": bench_search("emm"),
+	"search (phone)": bench_search("555-01"),
+	"search (trigram)": bench_search("olivr"),
+}
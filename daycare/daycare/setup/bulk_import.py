@@ -0,0 +1,200 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Bulk loading of Daycare records (migrated centres, load-test sites).
+
+Existing keys are prefetched once, naming series numbers are reserved per batch
+and rows are written with frappe.db.bulk_insert. The controller methods that only
+derive or check values (full names, ages, statuses) still run in memory; the save
+pipeline (permissions, link validation, versions, doc events) does not, so the
+derived tables are refreshed once at the end instead.
+"""
+
+import csv
+import json
+
+import frappe
+from frappe.utils import create_batch, now
+
+# doctype -> controller methods run in memory on every record before it is written
+PREPARE_METHODS = {
+	"Child": ("compute_full_name", "compute_age_months", "validate_guardians"),
+	"Employee": ("compute_full_name", "validate_availability", "validate_termination_date"),
+	"Employee Qualification": ("validate_expiry_required", "update_status"),
+	"Group": ("validate_age_range", "validate_max_children"),
+	"Guardian": ("normalize_contact",),
+	"Room": ("validate_age_range", "validate_capacity"),
+	"Room Activity": ("validate_times", "set_title_if_empty", "set_color_by_activity", "set_schedule_date"),
+	"Room Activity Schedule": (
+		"validate_times",
+		"validate_dates",
+		"validate_weekdays",
+		"set_title_if_empty",
+		"set_color_by_activity",
+	),
+}
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def bulk_import(doctype, records, key_field=None, chunk_size=DEFAULT_CHUNK_SIZE, commit=True):
+	"""Insert `records` (dicts; child tables as lists of dicts) in batches.
+
+	Records whose `key_field` value already exists, in the database or earlier in
+	`records`, are skipped. Returns the names of the inserted documents.
+	"""
+	existing = get_existing_keys(doctype, key_field) if key_field else set()
+	inserted = []
+
+	for batch in create_batch(records, chunk_size):
+		docs = []
+		for record in batch:
+			if key_field:
+				if record.get(key_field) in existing:
+					continue
+				existing.add(record.get(key_field))
+			docs.append(make_doc(doctype, record))
+
+		if not docs:
+			continue
+
+		set_names(docs)
+		write_docs(docs)
+		inserted.extend(doc.name for doc in docs)
+		if commit:
+			frappe.db.commit()
+
+	refresh_derived_data({doctype}, commit=commit)
+	return inserted
+
+
+def import_file(doctype, file_path, key_field=None, chunk_size=DEFAULT_CHUNK_SIZE):
+	"""Bulk import a JSON (list of records) or CSV file:
+
+	bench --site <site> execute daycare.daycare.setup.bulk_import.import_file \\
+		--kwargs "{'doctype': 'Child', 'file_path': '/path/children.json'}"
+	"""
+	with open(file_path, encoding="utf-8") as f:
+		if file_path.endswith(".csv"):
+			records = [{k: v for k, v in row.items() if v != ""} for row in csv.DictReader(f)]
+		else:
+			records = json.load(f)
+
+	return bulk_import(doctype, records, key_field=key_field, chunk_size=chunk_size)
+
+
+def get_existing_keys(doctype, key_field):
+	return set(frappe.get_all(doctype, pluck=key_field, order_by=None))
+
+
+def make_doc(doctype, record):
+	"""In-memory document with defaults and derived values, never saved"""
+	doc = frappe.get_doc({**record, "doctype": doctype})
+	doc._set_defaults()
+	for method in PREPARE_METHODS.get(doctype, ()):
+		getattr(doc, method)()
+	return doc
+
+
+def set_names(docs):
+	"""Name documents, reserving naming series numbers once per series and batch"""
+	by_series = {}
+	for doc in docs:
+		if doc.name:
+			continue
+		series = get_naming_series(doc)
+		if series:
+			by_series.setdefault(series, []).append(doc)
+		else:
+			doc.set_new_name()
+
+	for (prefix, digits), series_docs in by_series.items():
+		first = reserve_series(prefix, len(series_docs))
+		for i, doc in enumerate(series_docs):
+			doc.name = f"{prefix}{first + i:0{digits}d}"
+
+
+def get_naming_series(doc):
+	"""(prefix, digits) of a `naming_series:` document, e.g. ("CHILD-", 4)"""
+	if doc.meta.autoname != "naming_series:":
+		return
+
+	series = doc.naming_series or (doc.meta.get_field("naming_series").options or "").split("\n")[0]
+	prefix, _sep, hashes = series.rpartition(".")
+	if not hashes or set(hashes) != {"#"}:
+		return
+
+	return prefix, len(hashes)
+
+
+def reserve_series(prefix, count):
+	"""Reserve `count` consecutive numbers of a series and return the first one"""
+	frappe.db.sql("INSERT IGNORE INTO `tabSeries` (name, current) VALUES (%s, 0)", prefix)
+	current = frappe.db.sql("SELECT current FROM `tabSeries` WHERE name = %s FOR UPDATE", prefix)[0][0]
+	frappe.db.sql("UPDATE `tabSeries` SET current = current + %s WHERE name = %s", (count, prefix))
+	return current + 1
+
+
+def write_docs(docs):
+	"""Write documents and their child rows with one bulk insert per table"""
+	timestamp = now()
+	user = frappe.session.user
+	rows_by_doctype = {}
+
+	for doc in docs:
+		doc.update({"creation": timestamp, "modified": timestamp, "owner": user, "modified_by": user})
+		rows_by_doctype.setdefault(doc.doctype, []).append(doc.get_valid_dict(convert_dates_to_str=True))
+
+		for child in doc.get_all_children():
+			child.update(
+				{
+					"name": child.name or frappe.generate_hash(length=10),
+					"parent": doc.name,
+					"parenttype": doc.doctype,
+					"creation": timestamp,
+					"modified": timestamp,
+					"owner": user,
+					"modified_by": user,
+				}
+			)
+			rows_by_doctype.setdefault(child.doctype, []).append(
+				child.get_valid_dict(convert_dates_to_str=True)
+			)
+
+	for doctype, rows in rows_by_doctype.items():
+		fields = list(rows[0])
+		frappe.db.bulk_insert(doctype, fields, [tuple(row.get(f) for f in fields) for row in rows])
+
+
+def refresh_derived_data(doctypes, commit=True):
+	"""Rebuild what the skipped doc events would have maintained.
+
+	With commit=False everything stays in the caller's transaction.
+	"""
+	from daycare.daycare.doctype.employee_qualification_summary.employee_qualification_summary import (
+		rebuild_summary,
+	)
+	from daycare.daycare.doctype.guardian.guardian import link_guardian_rows
+	from daycare.daycare.doctype.guardian.pickup import invalidate_pickup_map
+	from daycare.daycare.doctype.room.room import reconcile_occupancy
+	from daycare.daycare.doctype.room_activity import calendar_cache
+	from daycare.daycare.doctype.search_entry.search_entry import rebuild_search_index
+	from daycare.daycare.report.report_cache import invalidate_report_cache
+
+	invalidate_report_cache(doctypes)
+
+	if "Child" in doctypes:
+		reconcile_occupancy(commit=commit)
+		link_guardian_rows(commit=commit)
+		invalidate_pickup_map()
+
+	if doctypes & {"Employee", "Employee Qualification"}:
+		rebuild_summary(commit=commit)
+
+	if doctypes & {"Child", "Employee"}:
+		rebuild_search_index(commit=commit)
+
+	if doctypes & {"Room Activity", "Room Activity Schedule"}:
+		for room in frappe.get_all("Room", pluck="name", order_by=None):
+			calendar_cache.invalidate_schedules(room)
@@ -0,0 +1,194 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Composite indexes for the Daycare access paths, and an EXPLAIN-based check that
+the hot queries use them.
+"""
+
+from unittest.mock import patch
+
+import frappe
+from frappe import _
+
+# doctype -> [(index name, columns)]. Only composite indexes go here; a single
+# column is indexed with search_index in its doctype. When this changes, list
+# daycare.patches.v0_0.add_daycare_indexes again in patches.txt under a new
+# comment, so migrate runs it once more.
+DAYCARE_INDEXES = {
+	"Attendance Log": [
+		("child_timestamp_index", ["child", "timestamp"]),
+		("timestamp_child_index", ["timestamp", "child"]),
+	],
+	"Child": [
+		("enrollment_status_full_name_index", ["enrollment_status", "full_name"]),
+		("group_enrollment_status_index", ["`group`", "enrollment_status"]),
+		("room_enrollment_status_index", ["room", "enrollment_status"]),
+	],
+	"Child Intake Request": [
+		("guardian_email_child_date_of_birth_index", ["guardian_email", "child_date_of_birth"]),
+	],
+	"Child Guardian": [
+		("parent_is_primary_index", ["parent", "is_primary"]),
+	],
+	"Employee": [
+		("status_full_name_index", ["status", "full_name"]),
+	],
+	"Employee Availability": [
+		("weekday_start_time_end_time_index", ["weekday", "start_time", "end_time"]),
+	],
+	"Employee Qualification": [
+		("employee_expiry_date_index", ["employee", "expiry_date"]),
+	],
+	"Qualification Expiry Notice": [
+		("qualification_recipient_index", ["qualification", "recipient"]),
+	],
+	"Room Activity": [
+		("date_room_index", ["date", "room"]),
+		("room_date_index", ["room", "date"]),
+		("schedule_schedule_date_index", ["schedule", "schedule_date"]),
+	],
+	"Search Entry": [
+		("result_doctype_result_name_index", ["result_doctype", "result_name"]),
+	],
+	"Search Entry Token": [
+		("token_parent_index", ["token", "parent"]),
+	],
+	"Search Entry Trigram": [
+		("trigram_parent_index", ["trigram", "parent"]),
+	],
+}
+
+# EXPLAIN access types that read the whole table or the whole index
+FULL_SCAN_TYPES = ("ALL", "index")
+
+
+def ensure_indexes():
+	"""Create any missing Daycare index (idempotent)"""
+	for doctype, indexes in DAYCARE_INDEXES.items():
+		for index_name, columns in indexes:
+			frappe.db.add_index(doctype, columns, index_name=index_name)
+
+
+def check_query_plans(raise_exception=True):
+	"""EXPLAIN the hot Daycare queries and report any full table or index scan.
+
+	Meaningful only on a site holding realistic volumes (on a near-empty table the
+	optimizer may legitimately prefer a scan). tests/test_query_plans.py seeds
+	such a dataset; on a live site:
+	bench --site <site> execute daycare.daycare.setup.indexes.check_query_plans
+	"""
+	failures = []
+	for label, query, values in get_hot_queries():
+		for row in get_full_scans(query, values):
+			failures.append(_("{0}: full scan ({1}) on {2}").format(label, row.get("type"), row.get("table")))
+
+	if failures and raise_exception:
+		frappe.throw("<br>".join(failures), title=_("Query plan regression"))
+
+	return failures
+
+
+def get_full_scans(query, values):
+	"""EXPLAIN rows of `query` that read a whole table or index.
+
+	A derived table is read whole by design; the rows it is built from are
+	checked on their own EXPLAIN row.
+	"""
+	return [
+		row
+		for row in frappe.db.sql(f"EXPLAIN {query}", values, as_dict=True)
+		if row.get("type") in FULL_SCAN_TYPES and not (row.get("table") or "").startswith("<derived")
+	]
+
+
+def get_hot_queries():
+	"""(label, query, values) for every query checked by check_query_plans.
+
+	Each query is built by the code that runs it, or captured while it runs, so
+	a change to the real query is checked too.
+	"""
+	from daycare.daycare.doctype.attendance_log.attendance_log import get_presence_query
+	from daycare.daycare.doctype.employee.employee import get_available_employees_query
+	from daycare.daycare.doctype.guardian.pickup import get_authorization_query
+	from daycare.daycare.doctype.qualification_expiry_notice.qualification_expiry_notice import (
+		get_expiring_query,
+	)
+	from daycare.daycare.doctype.room.room import get_occupancy
+	from daycare.daycare.doctype.room_activity.room_activity import get_events_query
+	from daycare.daycare.doctype.search_entry.search_entry import (
+		CANDIDATE_LIMIT,
+		SEARCH_DOCTYPES,
+		get_prefix_query,
+	)
+	from daycare.daycare.report.child_roster import child_roster
+	from daycare.daycare.report.employee_roster import employee_roster
+
+	group = frappe.db.get_value("Group", {}, "name") or ""
+	room = frappe.db.get_value("Room", {}, "name") or ""
+	today = frappe.utils.today()
+
+	queries = [
+		("Child Roster (status)", *child_roster.get_query({"enrollment_status": "Active"}, page_length=500)),
+		("Child Roster (group)", *child_roster.get_query({"group": group}, page_length=500)),
+		(
+			"Child Roster (next page)",
+			*child_roster.get_query(
+				{"enrollment_status": "Active"}, after=("M", "CHILD-0001"), page_length=500
+			),
+		),
+		("Employee Roster", *employee_roster.get_query({"status": "Active"})),
+		("Room Activity Calendar", *get_events_query(today, frappe.utils.add_days(today, 7))),
+		(
+			"Room Activity Calendar (room)",
+			*get_events_query(
+				today,
+				frappe.utils.add_days(today, 7),
+				"AND `tabRoom Activity`.`room` = {}".format(frappe.db.escape(room)),
+			),
+		),
+	]
+
+	queries.append(("Available Employees", *get_available_employees_query(today, "09:00:00", "10:00:00")))
+
+	intake_request = frappe.new_doc(
+		"Child Intake Request",
+		name="INTAKE-CHECK",
+		creation=frappe.utils.now_datetime(),
+		guardian_email="guardian@example.com",
+		child_date_of_birth=today,
+		child_first_name="Check",
+		child_last_name="Check",
+	)
+	queries.append(("Intake Duplicate Check", *intake_request.get_duplicate_query()))
+
+	queries.append(("Attendance Of The Day", *get_presence_query(today)))
+
+	queries.append(("Search Prefix", *get_prefix_query(["smi"], list(SEARCH_DOCTYPES), CANDIDATE_LIMIT)))
+
+	guardian = frappe.db.get_value("Guardian", {}, "name") or ""
+	queries.append(("Pickup Authorization", *get_authorization_query([guardian])))
+
+	queries.append(("Qualification Expiry Digest", *get_expiring_query()))
+
+	queries.extend(
+		("Room Occupancy", query, values) for query, values in capture_queries(get_occupancy, room)
+	)
+
+	return queries
+
+
+def capture_queries(fn, *args, **kwargs):
+	"""(query, values) of the SELECTs run by `fn(*args, **kwargs)`, for queries built with frappe.qb"""
+	captured = []
+	sql = frappe.db.sql
+
+	def record(query, values=(), *sql_args, **sql_kwargs):
+		if str(query).lstrip().upper().startswith("SELECT"):
+			captured.append((str(query), values))
+		return sql(query, values, *sql_args, **sql_kwargs)
+
+	with patch.object(frappe.db, "sql", record):
+		fn(*args, **kwargs)
+
+	return captured
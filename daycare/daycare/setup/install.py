@@ -10,9 +10,13 @@ import frappe
 from frappe.utils import today, add_months, add_days, getdate
 from datetime import date
 
+from daycare.daycare.setup.indexes import ensure_indexes
+
 
 def after_install():
     """Run after app installation to create seed data."""
+    ensure_indexes()
+
     if frappe.flags.in_install or frappe.flags.in_setup_wizard:
         return
 
@@ -22,7 +26,7 @@ def after_install():
     create_sample_employees()
     create_sample_gnb_rules()
     create_sample_internal_rules()
-    create_sample_room_activities()
+    create_sample_room_activity_schedules()
     frappe.db.commit()
     print("Daycare seed data created successfully!")
 
@@ -310,6 +314,9 @@ def create_sample_gnb_rules():
             "rule_title": "Staff-to-Child Ratio - Infants",
             "rule_description": "For infants (0-2 years), the staff-to-child ratio must be 1:3.",
             "category": "Staffing Ratios",
+            "min_age_months": 0,
+            "max_age_months": 24,
+            "max_children_per_staff": 3,
             "compliance_status": "Compliant",
             "last_audit_date": add_months(today(), -3),
             "next_audit_date": add_months(today(), 9),
@@ -319,6 +326,9 @@ def create_sample_gnb_rules():
             "rule_title": "Staff-to-Child Ratio - Toddlers",
             "rule_description": "For toddlers (2-3 years), the staff-to-child ratio must be 1:5.",
             "category": "Staffing Ratios",
+            "min_age_months": 24,
+            "max_age_months": 36,
+            "max_children_per_staff": 5,
             "compliance_status": "Compliant",
             "last_audit_date": add_months(today(), -3),
             "next_audit_date": add_months(today(), 9),
@@ -328,6 +338,9 @@ def create_sample_gnb_rules():
             "rule_title": "Staff-to-Child Ratio - Preschool",
             "rule_description": "For preschool children (3-5 years), the staff-to-child ratio must be 1:7.",
             "category": "Staffing Ratios",
+            "min_age_months": 36,
+            "max_age_months": 60,
+            "max_children_per_staff": 7,
             "compliance_status": "Compliant",
             "last_audit_date": add_months(today(), -3),
             "next_audit_date": add_months(today(), 9),
@@ -472,8 +485,12 @@ EpiPens stored in designated locations with staff trained in administration.""",
             print(f"Created Internal Rule: {rule_data['rule_name']}")
 
 
-def create_sample_room_activities():
-    """Create sample room activities for calendar display."""
+def create_sample_room_activity_schedules():
+    """Create the recurring daily schedule of the sample rooms.
+
+    Each time slot is one Room Activity Schedule repeating Monday to Friday; the
+    calendar expands occurrences on the fly, so no per-day rows are stored.
+    """
     # Get rooms
     rooms = frappe.get_all("Room", pluck="name")
     if not rooms:
@@ -492,41 +509,39 @@ def create_sample_room_activities():
         {"activity_type": "Free Play", "start_time": "16:00:00", "end_time": "17:00:00", "title": "Free Play"},
     ]
 
-    # Create activities for this week and next week
+    # Schedules start on Monday of the current week
     current_date = getdate(today())
-    # Find Monday of current week
-    days_since_monday = current_date.weekday()
-    monday = add_days(current_date, -days_since_monday)
-
-    activities_created = 0
+    monday = add_days(current_date, -current_date.weekday())
+
+    existing = {
+        (row.room, row.activity_type, str(row.start_time))
+        for row in frappe.get_all(
+            "Room Activity Schedule",
+            filters={"room": ("in", rooms)},
+            fields=["room", "activity_type", "start_time"],
+        )
+    }
+
+    schedules_created = 0
     for room in rooms[:2]:  # Just first 2 rooms to avoid too much data
-        for week_offset in [0, 7]:  # This week and next week
-            for day_offset in range(5):  # Monday to Friday
-                activity_date = add_days(monday, week_offset + day_offset)
-
-                for schedule_item in daily_schedule:
-                    # Check if activity already exists
-                    if frappe.db.exists("Room Activity", {
-                        "room": room,
-                        "date": activity_date,
-                        "activity_type": schedule_item["activity_type"],
-                        "start_time": schedule_item["start_time"]
-                    }):
-                        continue
-
-                    doc = frappe.get_doc({
-                        "doctype": "Room Activity",
-                        "room": room,
-                        "date": activity_date,
-                        "activity_type": schedule_item["activity_type"],
-                        "start_time": schedule_item["start_time"],
-                        "end_time": schedule_item["end_time"],
-                        "title": schedule_item["title"],
-                        "status": "Scheduled",
-                        "all_day": 0,
-                    })
-                    doc.insert(ignore_permissions=True)
-                    activities_created += 1
-
-    if activities_created > 0:
-        print(f"Created {activities_created} Room Activities")
+        for schedule_item in daily_schedule:
+            # get_all returns times as timedelta, which print without a leading zero
+            start_time = str(frappe.utils.to_timedelta(schedule_item["start_time"]))
+            if (room, schedule_item["activity_type"], start_time) in existing:
+                continue
+
+            doc = frappe.get_doc({
+                "doctype": "Room Activity Schedule",
+                "room": room,
+                "activity_type": schedule_item["activity_type"],
+                "start_time": schedule_item["start_time"],
+                "end_time": schedule_item["end_time"],
+                "title": schedule_item["title"],
+                "valid_from": monday,
+                "status": "Active",
+            })
+            doc.insert(ignore_permissions=True)
+            schedules_created += 1
+
+    if schedules_created > 0:
+        print(f"Created {schedules_created} Room Activity Schedules")
@@ -0,0 +1,331 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Synthetic Daycare dataset for load testing and benchmarks.
+
+Builds on the install seed (the same age bands, daily schedule and roles) but
+generates realistic volumes through the bulk import path:
+
+bench --site <site> execute daycare.daycare.setup.synthetic.generate_dataset \\
+	--kwargs "{'centres': 50, 'rooms': 2000, 'children': 60000, 'employees': 5000}"
+"""
+
+import random
+from datetime import timedelta
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, add_months, getdate, today
+
+from daycare.daycare.setup.bulk_import import bulk_import
+
+# (label, min months, max months, group size) - the bands of create_sample_groups
+AGE_BANDS = (
+	("Little Stars", 0, 12, 8),
+	("Busy Bees", 12, 24, 10),
+	("Creative Cubs", 24, 36, 12),
+	("Discovery Dragons", 36, 48, 14),
+	("Ready Rockets", 48, 60, 16),
+)
+
+# (activity type, start, end, title) - the slots of create_sample_room_activity_schedules
+DAILY_SCHEDULE = (
+	("Circle Time", "08:30:00", "09:00:00", "Morning Circle"),
+	("Learning Activity", "09:00:00", "10:00:00", "Learning Time"),
+	("Meal - Snack", "10:00:00", "10:30:00", "Morning Snack"),
+	("Outdoor Play", "10:30:00", "11:30:00", "Outdoor Play"),
+	("Meal - Lunch", "11:30:00", "12:30:00", "Lunch"),
+	("Nap Time", "12:30:00", "14:30:00", "Nap Time"),
+	("Meal - Snack", "14:30:00", "15:00:00", "Afternoon Snack"),
+	("Art & Crafts", "15:00:00", "16:00:00", "Art & Crafts"),
+	("Free Play", "16:00:00", "17:00:00", "Free Play"),
+)
+
+SHIFTS = (("07:00:00", "15:00:00"), ("08:00:00", "16:00:00"), ("09:30:00", "17:30:00"))
+
+ROLES = (
+	("Director", 1),
+	("Supervisor", 3),
+	("Lead Educator", 10),
+	("Educator", 40),
+	("Assistant", 30),
+	("Cook", 6),
+	("Cleaner", 5),
+	("Administrator", 5),
+)
+
+ENROLLMENT_STATUSES = (("Active", 85), ("Waitlisted", 10), ("Graduated", 3), ("Withdrawn", 2))
+
+FIRST_NAMES = (
+	"Olivia",
+	"Liam",
+	"Emma",
+	"Noah",
+	"Ava",
+	"Elijah",
+	"Sophia",
+	"Lucas",
+	"Amelia",
+	"Mason",
+	"Isabella",
+	"Ethan",
+	"Mia",
+	"Logan",
+	"Charlotte",
+	"Jacob",
+	"Harper",
+	"Leo",
+	"Chloe",
+	"Owen",
+	"Zoe",
+	"Aarav",
+	"Maya",
+	"Félix",
+	"Léa",
+	"Kai",
+	"Nora",
+	"Samir",
+	"Aisha",
+	"Hugo",
+)
+LAST_NAMES = (
+	"Smith",
+	"Johnson",
+	"Brown",
+	"Tremblay",
+	"Martin",
+	"Roy",
+	"Gagnon",
+	"Lee",
+	"Wilson",
+	"Leblanc",
+	"Thompson",
+	"White",
+	"Cormier",
+	"Chen",
+	"Singh",
+	"Patel",
+	"Nguyen",
+	"Robichaud",
+	"Kim",
+	"Campbell",
+)
+GUARDIAN_RELATIONSHIPS = ("Mother", "Father", "Grandmother", "Grandfather", "Legal Guardian")
+
+
+def generate_dataset(
+	centres=50, rooms=2000, children=60000, employees=5000, term_weeks=13, seed=42, commit=True
+):
+	"""Generate a synthetic multi-centre dataset (developer mode only).
+
+	Centres are not a doctype; they only prefix room and group names. Pass
+	commit=False to keep everything in the current transaction (benchmarks roll
+	it back afterwards).
+	"""
+	if not frappe.conf.developer_mode:
+		frappe.throw(_("Synthetic data can only be generated in developer mode"))
+
+	rng = random.Random(seed)
+	run = frappe.generate_hash(length=4).upper()
+	options = {"commit": commit}
+
+	employee_names = bulk_import("Employee", make_employees(rng, employees, run), **options)
+	bulk_import("Employee Qualification", make_qualifications(rng, employee_names), **options)
+
+	room_records = make_rooms(rng, centres, rooms, employee_names, run)
+	room_names = bulk_import("Room", room_records, **options)
+	group_records = make_groups(room_records, room_names, employee_names, rng)
+	group_names = bulk_import("Group", group_records, **options)
+
+	groups_by_band = {}
+	for record, name in zip(group_records, group_names, strict=True):
+		groups_by_band.setdefault(record["band"], []).append((name, record["room"]))
+
+	bulk_import("Child", make_children(rng, children, groups_by_band), **options)
+	bulk_import("Room Activity Schedule", make_schedules(room_names, employee_names, rng), **options)
+	bulk_import("Room Activity", make_special_events(rng, room_names, term_weeks), **options)
+
+	if commit:
+		frappe.db.commit()
+
+
+def make_employees(rng, count, run):
+	roles = [role for role, _weight in ROLES]
+	weights = [weight for _role, weight in ROLES]
+	monday = _monday()
+
+	for i in range(count):
+		first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+		start_time, end_time = rng.choice(SHIFTS)
+		yield {
+			"first_name": first_name,
+			"last_name": last_name,
+			"email": f"{first_name}.{last_name}.{run}{i}@daycare.localhost".lower(),
+			"phone": f"506-{rng.randint(200, 999)}-{rng.randint(0, 9999):04d}",
+			"role": rng.choices(roles, weights)[0],
+			"status": "Active" if rng.random() < 0.95 else "On Leave",
+			"hire_date": add_days(today(), -rng.randint(30, 3650)),
+			"employee_availability": [
+				{
+					"weekday": weekday,
+					"start_time": start_time,
+					"end_time": end_time,
+					"effective_from": monday,
+				}
+				for weekday in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+				if rng.random() < 0.9
+			],
+		}
+
+
+def make_qualifications(rng, employee_names):
+	for employee in employee_names:
+		yield {
+			"employee": employee,
+			"qualification_type": "Certification",
+			"qualification_name": "First Aid & CPR",
+			"issuing_authority": "Red Cross",
+			"expiry_date": add_days(today(), rng.randint(-60, 730)),
+		}
+		if rng.random() < 0.7:
+			yield {
+				"employee": employee,
+				"qualification_type": "Certification",
+				"qualification_name": rng.choice(("ECE Level I", "ECE Level II")),
+				"issuing_authority": "NB Early Learning",
+				"expiry_date": "2099-12-31",
+			}
+		if rng.random() < 0.8:
+			yield {
+				"employee": employee,
+				"qualification_type": "Certification",
+				"qualification_name": "Criminal Record Check",
+				"issuing_authority": "RCMP",
+				"expiry_date": add_days(today(), rng.randint(-30, 1095)),
+			}
+
+
+def make_rooms(rng, centres, count, employee_names, run):
+	rooms_per_centre = max(1, count // centres)
+	records = []
+	for i in range(count):
+		label, min_months, max_months, size = AGE_BANDS[i % len(AGE_BANDS)]
+		records.append(
+			{
+				"room_name": f"Centre {i // rooms_per_centre + 1:02d} {label} Room {i + 1} ({run})",
+				"capacity": size + rng.randint(0, 4),
+				"age_range_min_months": min_months,
+				"age_range_max_months": max_months,
+				"status": "Active",
+				"band": label,
+				"assigned_staff": [
+					{"employee": employee}
+					for employee in rng.sample(employee_names, min(2, len(employee_names)))
+				],
+			}
+		)
+	return records
+
+
+def make_groups(room_records, room_names, employee_names, rng):
+	bands = {label: band for label, *band in AGE_BANDS}
+	records = []
+	for room_record, room in zip(room_records, room_names, strict=True):
+		min_months, max_months, size = bands[room_record["band"]]
+		records.append(
+			{
+				"group_name": room_record["room_name"].replace(" Room ", " Group "),
+				"room": room,
+				"primary_caregiver": rng.choice(employee_names) if employee_names else None,
+				"max_children": size,
+				"age_range_min_months": min_months,
+				"age_range_max_months": max_months,
+				"status": "Active",
+				"band": room_record["band"],
+			}
+		)
+	return records
+
+
+def make_children(rng, count, groups_by_band):
+	statuses = [status for status, _weight in ENROLLMENT_STATUSES]
+	weights = [weight for _status, weight in ENROLLMENT_STATUSES]
+	family = None
+
+	for _i in range(count):
+		label, min_months, max_months, _size = rng.choice(AGE_BANDS)
+		age_days = rng.randint(min_months * 30 + 1, max_months * 30 - 1)
+		status = rng.choices(statuses, weights)[0]
+		group, room = rng.choice(groups_by_band[label]) if status != "Waitlisted" else (None, None)
+
+		# One child in four is a sibling of the previous one and shares its guardians
+		if family is None or rng.random() >= 0.25:
+			family = make_family(rng)
+
+		yield {
+			"first_name": rng.choice(FIRST_NAMES),
+			"last_name": family["last_name"],
+			"date_of_birth": add_days(today(), -age_days),
+			"enrollment_status": status,
+			"enrollment_date": add_months(today(), -rng.randint(0, 24)),
+			"group": group,
+			"room": room,
+			"allergies": "Peanuts" if rng.random() < 0.05 else None,
+			"child_guardians": [dict(guardian) for guardian in family["guardians"]],
+		}
+
+
+def make_family(rng):
+	last_name = rng.choice(LAST_NAMES)
+	guardians = []
+	for i in range(rng.choice((1, 2, 2, 2))):
+		first_name = rng.choice(FIRST_NAMES)
+		guardians.append(
+			{
+				"guardian_name": f"{first_name} {last_name}",
+				"relationship": GUARDIAN_RELATIONSHIPS[i] if i < 2 else rng.choice(GUARDIAN_RELATIONSHIPS),
+				"phone": f"506-{rng.randint(200, 999)}-{rng.randint(0, 9999):04d}",
+				"email": f"{first_name}.{last_name}.{rng.randint(1, 10**6)}@example.com".lower(),
+				"is_primary": int(i == 0),
+				"can_pickup": 1,
+			}
+		)
+	return {"last_name": last_name, "guardians": guardians}
+
+
+def make_schedules(room_names, employee_names, rng):
+	monday = _monday()
+	for room in room_names:
+		for activity_type, start_time, end_time, title in DAILY_SCHEDULE:
+			yield {
+				"room": room,
+				"activity_type": activity_type,
+				"title": title,
+				"start_time": start_time,
+				"end_time": end_time,
+				"valid_from": monday,
+				"status": "Active",
+				"assigned_staff": rng.choice(employee_names) if employee_names else None,
+			}
+
+
+def make_special_events(rng, room_names, term_weeks):
+	"""One stored one-off event per room every four weeks of the term"""
+	monday = _monday()
+	for room in room_names:
+		for week in range(0, term_weeks, 4):
+			yield {
+				"room": room,
+				"activity_type": rng.choice(("Special Event", "Field Trip", "Parent Visit")),
+				"date": monday + timedelta(days=week * 7 + rng.randint(0, 4)),
+				"start_time": "13:00:00",
+				"end_time": "14:00:00",
+				"status": "Scheduled",
+				"all_day": 0,
+			}
+
+
+def _monday():
+	current_date = getdate(today())
+	return current_date - timedelta(days=current_date.weekday())
@@ -0,0 +1,154 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Placement on a small fixture of rooms and groups. The fixture's age ranges are
+far above any real group's, so only its own groups are candidates.
+"""
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_months, today
+
+from daycare.daycare.doctype.room.room import get_occupancy
+from daycare.daycare.planning.placement import (
+	PLACEMENT_INDEX_KEY,
+	build_placement_index,
+	get_age_months,
+	get_candidates,
+	place_children,
+	suggest_groups,
+)
+
+
+class IntegrationTestPlacement(IntegrationTestCase):
+	def setUp(self):
+		self.suffix = frappe.generate_hash(length=8)
+		# The index is cached across transactions: never keep one with rolled back groups
+		self.addCleanup(frappe.cache.delete_value, PLACEMENT_INDEX_KEY)
+
+		# The small room has fewer places than its group, the large room more than its two groups
+		self.small_room = self.make_room("Small", capacity=2, ages=(240, 264))
+		self.large_room = self.make_room("Large", capacity=10, ages=(240, 300))
+		self.limited_by_room = self.make_group("Limited by Room", self.small_room, 5, (240, 252))
+		self.limited_by_group = self.make_group("Limited by Group", self.large_room, 2, (240, 260))
+		self.older = self.make_group("Older", self.large_room, 3, (252, 270))
+		# Outside the small room's ages: no age is eligible for both
+		self.out_of_room = self.make_group("Out of Room", self.small_room, 5, (264, 280))
+		frappe.cache.delete_value(PLACEMENT_INDEX_KEY)
+
+	def make_room(self, name, capacity, ages):
+		return (
+			frappe.get_doc(
+				{
+					"doctype": "Room",
+					"room_name": f"Placement {name} {self.suffix}",
+					"status": "Active",
+					"capacity": capacity,
+					"age_range_min_months": ages[0],
+					"age_range_max_months": ages[1],
+				}
+			)
+			.insert()
+			.name
+		)
+
+	def make_group(self, name, room, max_children, ages):
+		return (
+			frappe.get_doc(
+				{
+					"doctype": "Group",
+					"group_name": f"Placement {name} {self.suffix}",
+					"status": "Active",
+					"room": room,
+					"max_children": max_children,
+					"age_range_min_months": ages[0],
+					"age_range_max_months": ages[1],
+				}
+			)
+			.insert()
+			.name
+		)
+
+	def make_child(self, age_months, enrollment_status="Active"):
+		return (
+			frappe.get_doc(
+				{
+					"doctype": "Child",
+					"first_name": f"Age {age_months}",
+					"last_name": f"Placement Test {self.suffix}",
+					"date_of_birth": add_months(today(), -age_months),
+					"enrollment_status": enrollment_status,
+					"child_guardians": [
+						{
+							"guardian_name": f"Grace Placement {self.suffix}",
+							"relationship": "Mother",
+							"phone": "506-555-0100",
+							"is_primary": 1,
+							"can_pickup": 1,
+						}
+					],
+				}
+			)
+			.insert()
+			.name
+		)
+
+	def get_group_names(self, index, age_months):
+		return {index["groups"][i].name for i in get_candidates(index, age_months)}
+
+	def test_candidates_are_within_group_and_room_ages(self):
+		index = build_placement_index()
+
+		self.assertEqual(self.get_group_names(index, 245), {self.limited_by_room, self.limited_by_group})
+		self.assertEqual(self.get_group_names(index, 255), {self.older, self.limited_by_group})
+		self.assertEqual(self.get_group_names(index, 262), {self.older})
+		self.assertEqual(self.get_group_names(index, 266), {self.older})
+		self.assertEqual(self.get_group_names(index, 275), set())
+
+	def test_age_in_whole_months(self):
+		self.assertEqual(get_age_months("2024-03-15", "2026-10-14"), 30)
+		self.assertEqual(get_age_months("2024-03-15", "2026-10-15"), 31)
+		self.assertEqual(get_age_months("2026-11-01", "2026-10-15"), 0)
+
+	def test_places_respect_group_and_room_capacity(self):
+		children = [self.make_child(245) for _i in range(5)]
+		placements = place_children(children, on_date=today())
+
+		placed = [group for group in placements.values() if group]
+		self.assertEqual(len(placed), 4)
+		self.assertEqual(placed.count(self.limited_by_room), 2)
+		self.assertEqual(placed.count(self.limited_by_group), 2)
+		# Placed in the order given: the last child finds no place
+		self.assertIsNone(placements[children[-1]])
+
+		for child, group in placements.items():
+			values = frappe.db.get_value("Child", child, ["group", "room"], as_dict=True)
+			self.assertEqual(values.group, group)
+			self.assertEqual(values.room, group and frappe.db.get_value("Group", group, "room"))
+
+		for room in (self.small_room, self.large_room):
+			self.assertEqual(frappe.db.get_value("Room", room, "current_occupancy"), get_occupancy(room))
+
+	def test_every_child_with_an_eligible_group_is_placed(self):
+		children = {age: self.make_child(age) for age in (245, 255, 262, 275)}
+		waitlisted = self.make_child(266, enrollment_status="Waitlisted")
+		placements = place_children([*children.values(), waitlisted], on_date=today(), apply=False)
+
+		self.assertIn(placements[children[245]], {self.limited_by_room, self.limited_by_group})
+		self.assertIn(placements[children[255]], {self.older, self.limited_by_group})
+		self.assertEqual(placements[children[262]], self.older)
+		self.assertEqual(placements[waitlisted], self.older)
+		self.assertIsNone(placements[children[275]])
+		# Not applied
+		self.assertFalse(frappe.db.get_value("Child", children[262], "group"))
+
+	def test_suggestions_skip_full_groups(self):
+		# Two go to the group limited by its room, which is then full
+		place_children([self.make_child(245) for _i in range(3)], on_date=today())
+		suggestions = suggest_groups(age_months=245)
+
+		self.assertEqual(
+			[(row["name"], row["remaining_capacity"]) for row in suggestions],
+			[(self.limited_by_group, 1)],
+		)
@@ -0,0 +1,123 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Query plan regression tests: every hot query must be served by an index.
+
+The site is topped up with a synthetic dataset large enough for the optimizer
+to prefer the indexes. Nothing is committed: the dataset is rolled back once the
+tests have run.
+"""
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, add_to_date, now_datetime, today
+
+from daycare.daycare.doctype.attendance_log.attendance_log import CHECK_IN, write_rows
+from daycare.daycare.setup.indexes import ensure_indexes, get_full_scans, get_hot_queries
+from daycare.daycare.setup.synthetic import generate_dataset
+
+TEST_CHILDREN = 3000
+TEST_INTAKE_REQUESTS = 500
+TEST_ATTENDANCE_DAYS = 20
+
+
+class TestQueryPlans(IntegrationTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		# DDL commits implicitly, so the indexes are created before anything is seeded
+		ensure_indexes()
+		seed_dataset()
+
+	@classmethod
+	def tearDownClass(cls):
+		frappe.db.rollback()
+		super().tearDownClass()
+
+	def test_hot_queries_use_indexes(self):
+		for label, query, values in get_hot_queries():
+			with self.subTest(query=label):
+				scans = [f"{row.get('table')} ({row.get('type')})" for row in get_full_scans(query, values)]
+				self.assertEqual(scans, [], f"{label} reads whole tables or indexes")
+
+
+def seed_dataset():
+	"""Top the site up to TEST_CHILDREN children, with intake requests and attendance"""
+	children = TEST_CHILDREN - frappe.db.count("Child")
+	if children > 0:
+		with patch.dict(frappe.conf, {"developer_mode": 1}):
+			generate_dataset(
+				centres=3, rooms=100, children=children, employees=250, seed=TEST_CHILDREN, commit=False
+			)
+
+	if frappe.db.count("Child Intake Request") < TEST_INTAKE_REQUESTS:
+		seed_intake_requests()
+
+	if not frappe.db.count("Attendance Log"):
+		seed_attendance()
+
+
+def seed_intake_requests():
+	timestamp = now_datetime()
+	fields = [
+		"name",
+		"child_first_name",
+		"child_last_name",
+		"child_date_of_birth",
+		"guardian_name",
+		"guardian_relationship",
+		"guardian_email",
+		"guardian_phone",
+		"status",
+		"owner",
+		"modified_by",
+		"creation",
+		"modified",
+		"docstatus",
+	]
+	frappe.db.bulk_insert(
+		"Child Intake Request",
+		fields,
+		[
+			(
+				frappe.generate_hash(length=10),
+				"Test",
+				f"Child {i}",
+				add_days(today(), -365 - i),
+				f"Guardian {i}",
+				"Mother",
+				f"guardian{i}@daycare.localhost",
+				f"506-555-{i:04d}",
+				"Pending Review",
+				"Administrator",
+				"Administrator",
+				timestamp,
+				timestamp,
+				0,
+			)
+			for i in range(TEST_INTAKE_REQUESTS)
+		],
+	)
+
+
+def seed_attendance():
+	"""One check-in per active child on each of the last TEST_ATTENDANCE_DAYS days"""
+	children = frappe.get_all("Child", filters={"enrollment_status": "Active"}, fields=["name", "room"])
+	for day in range(1, TEST_ATTENDANCE_DAYS + 1):
+		timestamp = add_to_date(now_datetime(), days=-day)
+		write_rows(
+			[
+				{
+					"name": frappe.generate_hash(length=10),
+					"child": child.name,
+					"log_type": CHECK_IN,
+					"timestamp": str(timestamp),
+					"room": child.room,
+					"recorded_by": "Administrator",
+				}
+				for child in children
+			]
+		)
@@ -0,0 +1,252 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+The ratio engine against a per-row, per-slot reference implementation, on a
+fixed fixture and on random weeks. No database rows are read: the loaders are
+patched with the fixture.
+"""
+
+import math
+import random
+from datetime import date, datetime, time, timedelta
+from unittest.mock import patch
+
+import frappe
+import numpy as np
+from frappe.tests import UnitTestCase
+from frappe.utils import to_timedelta
+
+from daycare.daycare.doctype.employee.employee import WEEKDAYS
+from daycare.daycare.planning import ratios
+from daycare.daycare.planning.ratios import CLOSING_TIME, OPEN_DAYS, OPENING_TIME, SLOT, SLOTS_PER_DAY
+
+MONDAY = date(2026, 10, 12)
+# (min age, max age, children per staff) in months
+RULES = [(0, 18, 3), (18, 36, 5), (36, 72, 7)]
+
+
+def availability(employee, weekday, start, end, effective_from=None, effective_to=None):
+	return frappe._dict(
+		employee=employee,
+		weekday=weekday,
+		start_time=start,
+		end_time=end,
+		effective_from=effective_from,
+		effective_to=effective_to,
+	)
+
+
+def activity(employee, room, day, start, end):
+	return frappe._dict(
+		room=room, assigned_staff=employee, date=MONDAY + timedelta(days=day), start_time=start, end_time=end
+	)
+
+
+class Week:
+	"""Rows of one week, as the ratio engine's loaders return them"""
+
+	def __init__(self, rooms, counts, home, availability, activities):
+		self.rooms = rooms
+		self.counts = [frappe._dict(room=room, age=age, children=children) for room, age, children in counts]
+		self.home = [frappe._dict(room=room, employee=employee) for room, employee in home]
+		self.availability = availability
+		self.activities = activities
+
+	def check_ratios(self):
+		def sql(query, *args, **kwargs):
+			return self.counts if "tabChild" in query else self.home
+
+		rules = (
+			np.array([low for low, _high, _ratio in RULES], dtype=np.int64),
+			np.array([high for _low, high, _ratio in RULES], dtype=np.int64),
+			np.array([ratio for _low, _high, ratio in RULES], dtype=np.float64),
+		)
+		with (
+			patch.object(
+				ratios, "get_room_index", return_value={room: i for i, room in enumerate(self.rooms)}
+			),
+			patch.object(ratios, "get_ratio_rules", return_value=rules),
+			patch.object(ratios, "get_staff_activities", return_value=self.activities),
+			patch.object(ratios, "get_availability_rows", side_effect=self.get_availability_rows),
+			patch.object(frappe.db, "sql", side_effect=sql),
+		):
+			return ratios.check_ratios(MONDAY)
+
+	def get_availability_rows(self, employees=None):
+		return [row for row in self.availability if not employees or row.employee in employees]
+
+	def get_reference(self):
+		"""required, children, unrated children, staff and violations, computed row by row"""
+		required, children, unrated = {}, {}, {}
+		for room in self.rooms:
+			load = 0
+			children[room] = unrated[room] = 0
+			for row in self.counts:
+				if row.room != room:
+					continue
+				children[room] += row.children
+				ratios_of_age = [ratio for low, high, ratio in RULES if low <= row.age < high]
+				if ratios_of_age:
+					load += row.children / min(ratios_of_age)
+				else:
+					unrated[room] += row.children
+			required[room] = math.ceil(load - 1e-9)
+
+		employees = {row.employee for row in self.home} | {row.assigned_staff for row in self.activities}
+		staff = {(room, slot): 0.0 for room in self.rooms for slot in range(OPEN_DAYS * SLOTS_PER_DAY)}
+		for slot in range(OPEN_DAYS * SLOTS_PER_DAY):
+			day, start, end = self.get_slot(slot)
+			for employee in employees:
+				if not self.is_present(employee, day, start, end):
+					continue
+				led = [
+					row.room
+					for row in self.activities
+					if row.assigned_staff == employee
+					and row.date == MONDAY + timedelta(days=day)
+					and to_timedelta(row.start_time) <= start
+					and to_timedelta(row.end_time) >= end
+				]
+				if led:
+					staff[led[0], slot] += 1
+					continue
+				homes = [row.room for row in self.home if row.employee == employee]
+				for room in homes:
+					staff[room, slot] += 1 / len(homes)
+
+		violations = []
+		for room in self.rooms:
+			for day in range(OPEN_DAYS):
+				run = []
+				for slot in range(day * SLOTS_PER_DAY, (day + 1) * SLOTS_PER_DAY + 1):
+					if slot < (day + 1) * SLOTS_PER_DAY and staff[room, slot] + 1e-9 < required[room]:
+						run.append(slot)
+						continue
+					if run:
+						violations.append(
+							(
+								room,
+								self.get_datetime(run[0]),
+								self.get_datetime(run[-1]) + SLOT,
+								round(min(staff[room, s] for s in run), 2),
+							)
+						)
+						run = []
+
+		return required, children, unrated, staff, violations
+
+	def get_slot(self, slot):
+		day, slot_of_day = divmod(slot, SLOTS_PER_DAY)
+		start = OPENING_TIME + slot_of_day * SLOT
+		return day, start, start + SLOT
+
+	def get_datetime(self, slot):
+		day, start, _end = self.get_slot(slot)
+		return datetime.combine(MONDAY + timedelta(days=day), time()) + start
+
+	def is_present(self, employee, day, start, end):
+		on_date = MONDAY + timedelta(days=day)
+		return any(
+			row.employee == employee
+			and row.weekday == WEEKDAYS[day]
+			and (not row.effective_from or row.effective_from <= on_date <= (row.effective_to or on_date))
+			and to_timedelta(row.start_time) <= start
+			and to_timedelta(row.end_time) >= end
+			for row in self.availability
+		)
+
+
+def make_random_week(rng):
+	rooms = [f"ROOM-{i}" for i in range(4)]
+	employees = [f"EMP-{i}" for i in range(8)]
+	counts = [(rng.choice(rooms), rng.randrange(0, 90), rng.randrange(1, 6)) for _i in range(12)]
+	home = [(rng.choice(rooms), employee) for employee in employees[:6]]
+	home += [(rng.choice(rooms), employee) for employee in rng.sample(employees[:6], 2)]
+
+	def clock(minutes):
+		return str(timedelta(minutes=minutes))
+
+	rows, activities = [], []
+	for employee in employees:
+		for day in range(OPEN_DAYS):
+			if rng.random() < 0.8:
+				start = rng.randrange(6 * 60, 12 * 60, 5)
+				rows.append(
+					availability(
+						employee,
+						WEEKDAYS[day],
+						clock(start),
+						clock(rng.randrange(start + 60, 19 * 60, 5)),
+						MONDAY if rng.random() < 0.3 else None,
+						MONDAY + timedelta(days=rng.randrange(OPEN_DAYS)) if rng.random() < 0.2 else None,
+					)
+				)
+			if rng.random() < 0.4:
+				start = rng.randrange(7 * 60, 17 * 60, 5)
+				activities.append(
+					activity(
+						employee,
+						rng.choice(rooms),
+						day,
+						clock(start),
+						clock(start + rng.randrange(15, 120, 5)),
+					)
+				)
+
+	return Week(rooms, counts, home, rows, activities)
+
+
+class UnitTestRatios(UnitTestCase):
+	def assert_matches_reference(self, week):
+		check = week.check_ratios()
+		required, children, unrated, staff, violations = week.get_reference()
+
+		self.assertEqual(check.rooms, week.rooms)
+		for i, room in enumerate(week.rooms):
+			self.assertEqual(int(check.required[i]), required[room], room)
+			self.assertEqual(int(check.children[i]), children[room], room)
+			self.assertEqual(int(check.unrated_children[i]), unrated[room], room)
+			np.testing.assert_allclose(
+				check.staff[i], [staff[room, slot] for slot in range(check.staff.shape[1])], err_msg=room
+			)
+
+		self.assertEqual(
+			sorted((v.room, v.start, v.end, v.staff) for v in check.get_violations()),
+			sorted(violations),
+		)
+
+	def test_fixture(self):
+		week = Week(
+			rooms=["ROOM-A", "ROOM-B"],
+			# ROOM-A: 2 infants at 1:3 and 5 toddlers at 1:5 need 2; ROOM-B: 8 at 1:7 need 2, 1 unrated
+			counts=[("ROOM-A", 10, 2), ("ROOM-A", 24, 5), ("ROOM-B", 40, 8), ("ROOM-B", 100, 1)],
+			home=[("ROOM-A", "EMP-1"), ("ROOM-A", "EMP-2"), ("ROOM-B", "EMP-2"), ("ROOM-B", "EMP-3")],
+			availability=[
+				*(availability("EMP-1", weekday, "07:00:00", "18:00:00") for weekday in WEEKDAYS[:5]),
+				# Only whole slots count: from 08:10 means from 08:15
+				availability("EMP-2", "Monday", "08:10:00", "12:00:00"),
+				*(availability("EMP-3", weekday, "06:30:00", "15:00:00") for weekday in WEEKDAYS[:5]),
+			],
+			# EMP-3 leaves ROOM-B for an hour on Monday
+			activities=[activity("EMP-3", "ROOM-A", 0, "10:00:00", "11:00:00")],
+		)
+		self.assert_matches_reference(week)
+
+		check = week.check_ratios()
+		self.assertEqual(check.required.tolist(), [2, 2])
+		self.assertEqual(check.unrated_children.tolist(), [0, 1])
+
+		ten = (10 * 60 * 60 - OPENING_TIME.total_seconds()) // SLOT.total_seconds()
+		self.assertEqual(check.staff[:, int(ten)].tolist(), [2.5, 0.5])
+		# Nobody is in ROOM-B after 15:00, so every day ends in a violation
+		self.assertEqual(
+			[v.end.time() for v in check.get_violations() if v.room == "ROOM-B"][-1],
+			(datetime.min + CLOSING_TIME).time(),
+		)
+
+	def test_random_weeks(self):
+		rng = random.Random(12)
+		for i in range(20):
+			with self.subTest(week=i):
+				self.assert_matches_reference(make_random_week(rng))
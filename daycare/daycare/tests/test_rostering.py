@@ -0,0 +1,141 @@
+# Copyright (c) 2025, Daycare Admin and contributors
+# For license information, please see license.txt
+
+"""
+Roster assignment on small fixtures. The solver is built from the fixture
+arrays directly, without reading the database.
+"""
+
+from datetime import date, timedelta
+
+import frappe
+import numpy as np
+from frappe.tests import UnitTestCase
+
+from daycare.daycare.planning.ratios import OPEN_DAYS, SLOTS_PER_DAY
+from daycare.daycare.planning.rostering import UNASSIGNED, RosterSolver
+
+MONDAY = date(2026, 10, 12)
+SLOTS = OPEN_DAYS * SLOTS_PER_DAY
+
+
+def make_solver(rooms, required, employees, home, present=None, qualified=()):
+	"""RosterSolver of `employees` with `home` rooms ({employee: room}), present all week by default"""
+	solver = RosterSolver.__new__(RosterSolver)
+	solver.week_start = MONDAY
+	solver.rooms = rooms
+	solver.room_index = {room: i for i, room in enumerate(rooms)}
+	solver.required = np.array(required, dtype=np.int64)
+	solver.employees = employees
+	solver.employee_index = {employee: i for i, employee in enumerate(employees)}
+	solver.present = np.ones((len(employees), SLOTS), dtype=bool) if present is None else present
+	solver.qualified = np.array([[employee in qualified] * OPEN_DAYS for employee in employees], dtype=bool)
+	solver.home_room = np.array(
+		[solver.room_index[home[e]] if e in home else UNASSIGNED for e in employees], dtype=np.int64
+	)
+	solver.home_staff = {}
+	for employee in employees:
+		if employee in home:
+			solver.home_staff.setdefault(solver.room_index[home[employee]], []).append(
+				solver.employee_index[employee]
+			)
+	return solver
+
+
+def get_staffed(solver, result):
+	staffed = np.zeros((len(solver.rooms), SLOTS), dtype=np.int64)
+	for employee in range(len(solver.employees)):
+		for slot in np.nonzero(result[employee] >= 0)[0]:
+			staffed[result[employee, slot], slot] += 1
+	return staffed
+
+
+class UnitTestRostering(UnitTestCase):
+	def test_home_rooms_are_kept(self):
+		solver = make_solver(
+			["ROOM-A", "ROOM-B"],
+			[2, 1],
+			["EMP-1", "EMP-2", "EMP-3"],
+			{"EMP-1": "ROOM-A", "EMP-2": "ROOM-A", "EMP-3": "ROOM-B"},
+			qualified={"EMP-1"},
+		)
+		result = solver.solve()
+
+		self.assertEqual(result[:, 0].tolist(), [0, 0, 1])
+		self.assertTrue((result == result[:, :1]).all())
+		self.assertEqual(
+			solver.get_stats(result), {"total_moves": 0, "unfilled_slots": 0, "first_aid_gaps": 0}
+		)
+
+	def test_shortage_is_filled_from_spare_staff(self):
+		present = np.ones((3, SLOTS), dtype=bool)
+		# EMP-2 leaves ROOM-A at the 10th slot of Monday
+		present[1, 10:SLOTS_PER_DAY] = False
+		solver = make_solver(
+			["ROOM-A", "ROOM-B"],
+			[2, 0],
+			["EMP-1", "EMP-2", "EMP-3"],
+			{"EMP-1": "ROOM-A", "EMP-2": "ROOM-A", "EMP-3": "ROOM-B"},
+			present=present,
+		)
+		result = solver.solve()
+
+		self.assertEqual(result[2, 9], 1)
+		self.assertEqual(result[:, 10].tolist(), [0, UNASSIGNED, 0])
+		self.assertTrue((get_staffed(solver, result)[0] >= 2).all())
+		# Staff are never rostered while away
+		self.assertTrue((result[~present] == UNASSIGNED).all())
+
+	def test_rooms_are_staffed_whenever_enough_staff_are_present(self):
+		rng = np.random.default_rng(13)
+		employees = [f"EMP-{i}" for i in range(8)]
+		present = np.ones((len(employees), SLOTS), dtype=bool)
+		for employee in range(len(employees)):
+			for day in range(OPEN_DAYS):
+				start, end = sorted(rng.integers(0, SLOTS_PER_DAY, 2))
+				present[employee, day * SLOTS_PER_DAY + start : day * SLOTS_PER_DAY + end] = False
+		solver = make_solver(
+			["ROOM-A", "ROOM-B", "ROOM-C"],
+			[2, 1, 2],
+			employees,
+			{employee: ["ROOM-A", "ROOM-B", "ROOM-C"][i % 3] for i, employee in enumerate(employees)},
+			present=present,
+			qualified={"EMP-0", "EMP-5"},
+		)
+		result = solver.solve()
+		staffed = get_staffed(solver, result)
+
+		self.assertTrue((result[~present] == UNASSIGNED).all())
+		self.assertTrue((result[present] != UNASSIGNED).all())
+		enough = present.sum(axis=0) >= solver.required.sum()
+		self.assertTrue((staffed[:, enough] >= solver.required[:, None]).all())
+		qualified_present = present[[0, 5]].any(axis=0)
+		on_site = ((result >= 0) & solver.qualified.repeat(SLOTS_PER_DAY, axis=1)).any(axis=0)
+		self.assertTrue(on_site[qualified_present].all())
+
+	def test_absence_only_changes_its_day(self):
+		solver = make_solver(
+			["ROOM-A", "ROOM-B"],
+			[1, 1],
+			["EMP-1", "EMP-2", "EMP-3"],
+			{"EMP-1": "ROOM-A", "EMP-2": "ROOM-B", "EMP-3": "ROOM-B"},
+		)
+		before = solver.solve()
+
+		day = solver.mark_absent("EMP-1", MONDAY + timedelta(days=2))
+		after = solver.solve(before, days=[day])
+		today = slice(day * SLOTS_PER_DAY, (day + 1) * SLOTS_PER_DAY)
+
+		self.assertTrue((np.delete(after, today, axis=1) == np.delete(before, today, axis=1)).all())
+		self.assertTrue((after[0, today] == UNASSIGNED).all())
+		self.assertTrue((after[:, today] == 0).any(axis=0).all())
+
+	def test_rows_round_trip(self):
+		present = np.ones((2, SLOTS), dtype=bool)
+		present[0, 5:9] = False
+		solver = make_solver(["ROOM-A"], [1], ["EMP-1", "EMP-2"], {"EMP-1": "ROOM-A"}, present=present)
+		result = solver.solve()
+		rows = solver.get_rows(result)
+
+		self.assertTrue(all(isinstance(row, frappe._dict) for row in rows))
+		self.assertTrue((solver.load(rows) == result).all())
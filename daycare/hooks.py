@@ -36,6 +36,7 @@ add_to_apps_screen = [
 # include js, css files in header of desk.html
 # app_include_css = "/assets/daycare/css/daycare.css"
 # app_include_js = "/assets/daycare/js/daycare.js"
+app_include_js = "/assets/daycare/js/room_status.js"
 
 # include js, css files in header of web template
 # web_include_css = "/assets/daycare/css/daycare.css"
@@ -148,27 +149,100 @@ after_install = "daycare.daycare.setup.install.after_install"
 # 		"on_trash": "method"
 # 	}
 # }
+doc_events = {
+	"Child": {
+		"on_update": [
+			"daycare.daycare.report.report_cache.on_change",
+			"daycare.daycare.doctype.search_entry.search_entry.on_update",
+			"daycare.daycare.doctype.guardian.pickup.on_child_change",
+		],
+		"on_trash": [
+			"daycare.daycare.report.report_cache.on_change",
+			"daycare.daycare.doctype.search_entry.search_entry.on_trash",
+			"daycare.daycare.doctype.guardian.pickup.on_child_change",
+		],
+	},
+	"Group": {
+		"on_update": [
+			"daycare.daycare.report.report_cache.on_change",
+		],
+		"on_trash": [
+			"daycare.daycare.report.report_cache.on_change",
+		],
+	},
+	"Room": {
+		"on_update": [
+			"daycare.daycare.report.report_cache.on_change",
+		],
+		"on_trash": [
+			"daycare.daycare.report.report_cache.on_change",
+		],
+	},
+	"Employee": {
+		"on_update": [
+			"daycare.daycare.report.report_cache.on_change",
+			"daycare.daycare.doctype.search_entry.search_entry.on_update",
+		],
+		"on_trash": [
+			"daycare.daycare.report.report_cache.on_change",
+			"daycare.daycare.doctype.search_entry.search_entry.on_trash",
+		],
+	},
+	"Employee Qualification": {
+		"on_update": [
+			"daycare.daycare.report.report_cache.on_change",
+		],
+		"on_trash": [
+			"daycare.daycare.report.report_cache.on_change",
+		],
+	},
+	"GNB Rule": {
+		"on_update": [
+			"daycare.daycare.doctype.gnb_rule.compliance_scorecard.on_change",
+		],
+		"on_trash": [
+			"daycare.daycare.doctype.gnb_rule.compliance_scorecard.on_change",
+		],
+	},
+	"Internal Rule": {
+		"on_update": [
+			"daycare.daycare.doctype.gnb_rule.compliance_scorecard.on_change",
+		],
+		"on_trash": [
+			"daycare.daycare.doctype.gnb_rule.compliance_scorecard.on_change",
+		],
+	},
+}
+
+standard_queries = {
+	"Child": "daycare.daycare.doctype.search_entry.search_entry.link_query",
+	"Employee": "daycare.daycare.doctype.search_entry.search_entry.link_query",
+}
 
 # Scheduled Tasks
 # ---------------
 
-# scheduler_events = {
-# 	"all": [
-# 		"daycare.tasks.all"
-# 	],
-# 	"daily": [
-# 		"daycare.tasks.daily"
-# 	],
-# 	"hourly": [
-# 		"daycare.tasks.hourly"
-# 	],
-# 	"weekly": [
-# 		"daycare.tasks.weekly"
-# 	],
-# 	"monthly": [
-# 		"daycare.tasks.monthly"
-# 	],
-# }
+scheduler_events = {
+	"cron": {
+		"* * * * *": [
+			"daycare.daycare.doctype.attendance_log.attendance_log.flush_attendance_buffer",
+		],
+		# Ahead of the afternoon pickup window
+		"0 15 * * *": [
+			"daycare.daycare.doctype.guardian.pickup.build_pickup_map",
+		],
+	},
+	"hourly": [
+		"daycare.daycare.doctype.room.room.reconcile_occupancy",
+	],
+	"daily": [
+		"daycare.daycare.doctype.child.child.update_age_months",
+		"daycare.daycare.doctype.employee_qualification.employee_qualification.refresh_qualification_status",
+		"daycare.daycare.doctype.employee_qualification_summary.employee_qualification_summary.rebuild_summary",
+		"daycare.daycare.doctype.qualification_expiry_notice.qualification_expiry_notice.send_expiry_digests",
+		"daycare.daycare.doctype.gnb_rule.compliance_scorecard.refresh_scorecard",
+	],
+}
 
 # Testing
 # -------
@@ -189,6 +263,9 @@ after_install = "daycare.daycare.setup.install.after_install"
 # override_whitelisted_methods = {
 # 	"frappe.desk.doctype.event.event.get_events": "daycare.event.get_events"
 # }
+override_whitelisted_methods = {
+	"frappe.website.doctype.web_form.web_form.accept": "daycare.daycare.doctype.child_intake_request.child_intake_request.accept_web_form"
+}
 #
 # each overriding function accepts a `data` argument;
 # generated from the base implementation of the doctype dashboard,
@@ -204,7 +281,7 @@ after_install = "daycare.daycare.setup.install.after_install"
 # Ignore links to specified DocTypes when deleting documents
 # -----------------------------------------------------------
 
-# ignore_links_on_delete = ["Communication", "ToDo"]
+ignore_links_on_delete = ["Employee Qualification Summary", "Qualification Expiry Notice"]
 
 # Request Events
 # ----------------
@@ -0,0 +1,5 @@
+from daycare.daycare.setup.indexes import ensure_indexes
+
+
+def execute():
+	ensure_indexes()
@@ -0,0 +1,7 @@
+from daycare.daycare.doctype.employee_qualification_summary.employee_qualification_summary import (
+	rebuild_summary,
+)
+
+
+def execute():
+	rebuild_summary()
@@ -0,0 +1,7 @@
+from daycare.daycare.doctype.search_entry.search_entry import rebuild_search_index
+from daycare.daycare.setup.indexes import ensure_indexes
+
+
+def execute():
+	ensure_indexes()
+	rebuild_search_index()
@@ -0,0 +1,7 @@
+from daycare.daycare.doctype.guardian.guardian import link_guardian_rows
+from daycare.daycare.setup.indexes import ensure_indexes
+
+
+def execute():
+	ensure_indexes()
+	link_guardian_rows()
@@ -0,0 +1,5 @@
+from daycare.daycare.doctype.room.room import reconcile_occupancy
+
+
+def execute():
+	reconcile_occupancy()
@@ -0,0 +1,22 @@
+import frappe
+
+# Structured form of the ratios seeded as prose by create_sample_gnb_rules
+SEEDED_RATIOS = {
+	"Reg 83-85, s.12(1)": (0, 24, 3),
+	"Reg 83-85, s.12(2)": (24, 36, 5),
+	"Reg 83-85, s.12(3)": (36, 60, 7),
+}
+
+
+def execute():
+	for regulation_reference, (min_age, max_age, children_per_staff) in SEEDED_RATIOS.items():
+		frappe.db.set_value(
+			"GNB Rule",
+			{"regulation_reference": regulation_reference, "max_children_per_staff": 0},
+			{
+				"min_age_months": min_age,
+				"max_age_months": max_age,
+				"max_children_per_staff": children_per_staff,
+			},
+			update_modified=False,
+		)
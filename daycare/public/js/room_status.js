@@ -0,0 +1,48 @@
+// Copyright (c) 2025, Daycare and contributors
+// For license information, please see license.txt
+
+// Room status kept current from the "room_status" realtime deltas
+// (see daycare/daycare/doctype/room/room_status.py)
+frappe.provide("daycare.room_status");
+
+daycare.room_status.EVENT = "room_status";
+
+daycare.room_status.load = function(rooms) {
+    return frappe.xcall("daycare.daycare.doctype.room.room_status.get_room_status", {
+        rooms: rooms || null,
+    });
+};
+
+// Apply one delta to a room status loaded with `load`
+daycare.room_status.apply = function(status, data) {
+    if (data.occupancy_delta !== undefined) {
+        status.current_occupancy = Math.max(0, (status.current_occupancy || 0) + data.occupancy_delta);
+    }
+    if (data.occupancy !== undefined) {
+        status.current_occupancy = data.occupancy;
+    }
+    if (data.headcount !== undefined) {
+        status.headcount = data.headcount;
+    }
+    if (data.staff !== undefined) {
+        status.staff = data.staff;
+    }
+
+    const removed = [data.removed_activity, data.activity && data.activity.name, data.activity && data.activity.replaces];
+    if (data.removed_activity || data.activity) {
+        status.activities = (status.activities || []).filter((activity) => !removed.includes(activity.name));
+    }
+    if (data.activity) {
+        status.activities.push(data.activity);
+        status.activities.sort((a, b) => (a.start_time || "").localeCompare(b.start_time || ""));
+    }
+};
+
+// The activity in progress, or else the one happening now by its times
+daycare.room_status.get_current_activity = function(status) {
+    const activities = (status.activities || []).filter((activity) => activity.status !== "Cancelled");
+    const now = frappe.datetime.now_time();
+    return activities.find((activity) => activity.status === "In Progress")
+        || activities.find((activity) => activity.all_day
+            || (activity.start_time <= now && now < activity.end_time && activity.status !== "Completed"));
+};